@@ -1,39 +1,35 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.exceptions import RequestValidationError
-from starlette.exceptions import HTTPException
+from fastapi.responses import ORJSONResponse
 from contextlib import asynccontextmanager
 import logging
 import sys
 from pathlib import Path
 sys.path.append(str(Path(__file__).resolve().parent))	
 from src.infrastructure.config.settings import get_settings
+from src.infrastructure.config.container import CONTAINER
 from src.infrastructure.adapters.persistence.mongodb.connection import get_mongodb
-from src.infrastructure.api.middleware.errorHandler import (
-    domain_exception_handler,
-    validation_exception_handler,
-    http_exception_handler,
-    generic_exception_handler
-)
+from src.infrastructure.api.middleware.errorHandler import register_exception_handlers
+from src.infrastructure.api.middleware.uploadSizeLimit import UploadSizeLimitMiddleware
 from src.infrastructure.api.routers import agents, documents
-from src.domain.exceptions.domainExceptions import DomainException
 
-# Configurar logging
+settings = get_settings()
+
+# Configurar logging (los mensajes por debajo del nivel configurado no se formatean)
 logging.basicConfig(
-    level=logging.INFO,
+    level=settings.log_level.upper(),
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
+logging.getLogger("uvicorn.access").setLevel(settings.access_log_level.upper())
 logger = logging.getLogger(__name__)
 
-settings = get_settings()
-
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
     Maneja el ciclo de vida de la aplicación
     """
     # Startup
-    logger.info(f"Starting {settings.app_name} v{settings.app_version}")
+    logger.info("Starting %s v%s", settings.app_name, settings.app_version)
     
     # Inicializar MongoDB y crear índices
     try:
@@ -41,9 +37,25 @@ async def lifespan(app: FastAPI):
         await mongodb.create_indexes()
         logger.info("Database indexes created successfully")
     except Exception as e:
-        logger.error(f"Failed to initialize database: {e}")
+        logger.error("Failed to initialize database: %s", e)
         # No raise para permitir que la app inicie sin MongoDB en desarrollo
     
+    # Construir repositorios y handlers una sola vez antes de atender requests
+    try:
+        await CONTAINER.initialize()
+        logger.info("Dependency container initialized")
+    except Exception as e:
+        logger.error("Failed to initialize dependency container: %s", e)
+        # Se reintenta en la primera request que lo necesite
+    
+    # Verificar el bucket de S3 en el executor (head_bucket es una llamada bloqueante)
+    try:
+        await CONTAINER.ensure_storage_bucket()
+        logger.info("S3 bucket verified")
+    except Exception as e:
+        logger.error("Failed to verify S3 bucket: %s", e)
+        # Las rutas que solo usan MongoDB siguen disponibles
+    
     yield
     
     # Shutdown
@@ -52,7 +64,7 @@ async def lifespan(app: FastAPI):
         from src.infrastructure.adapters.persistence.mongodb.connection import close_mongodb
         await close_mongodb()
     except Exception as e:
-        logger.error(f"Error during shutdown: {e}")
+        logger.error("Error during shutdown: %s", e)
 
 # Crear aplicación FastAPI
 app = FastAPI(
@@ -60,10 +72,18 @@ app = FastAPI(
     version=settings.app_version,
     description="AI Agents Manager - Gestión de agentes de IA y su base de conocimiento",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     docs_url=f"{settings.api_prefix}/docs",
     redoc_url=f"{settings.api_prefix}/redoc",
     openapi_url=f"{settings.api_prefix}/openapi.json"
 )
+# Rechazar subidas grandes por su Content-Length, antes de recibir el cuerpo
+# (se registra antes que CORS para que el 413 también lleve sus headers)
+app.add_middleware(
+    UploadSizeLimitMiddleware,
+    upload_path=f"{settings.api_prefix}/documents/upload",
+    max_size_bytes=settings.max_file_size_bytes
+)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -78,11 +98,8 @@ from src.infrastructure.api.middleware.databaseErrorHandler import DatabaseError
 # Agregar middleware de base de datos
 app.add_middleware(DatabaseErrorMiddleware)
 
-# Registrar exception handlers (orden importante: más específico a más genérico)
-app.add_exception_handler(DomainException, domain_exception_handler)
-app.add_exception_handler(RequestValidationError, validation_exception_handler)
-app.add_exception_handler(HTTPException, http_exception_handler)
-app.add_exception_handler(Exception, generic_exception_handler)
+# Registrar exception handlers
+register_exception_handlers(app)
 
 # Registrar routers
 app.include_router(agents.router, prefix=settings.api_prefix)
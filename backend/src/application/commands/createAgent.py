@@ -35,7 +35,7 @@ class CreateAgentCommand:
         # Verificar que no exista un agente con el mismo nombre
         existing_agent = await self.agent_repository.get_agent_by_name(create_agent_dto.name)
         if existing_agent:
-            logger.warning(f"Agent with name '{create_agent_dto.name}' already exists")
+            logger.warning("Agent with name '%s' already exists", create_agent_dto.name)
             raise DuplicateAgentNameException(create_agent_dto.name)
         
         #Crear la entidad del dominio
@@ -58,15 +58,15 @@ class CreateAgentCommand:
         try:
             folder_created = await self.file_storage.create_folder(agent_folder_key)
             if folder_created:
-                logger.info(f"✅ Created S3 folder for agent: {agent_folder_key}")
+                logger.info("✅ Created S3 folder for agent: %s", agent_folder_key)
             else:
-                logger.warning(f"⚠️ Could not create S3 folder for agent: {agent_folder_key}")
+                logger.warning("⚠️ Could not create S3 folder for agent: %s", agent_folder_key)
         except Exception as e:
-            logger.warning(f"⚠️ Failed to create S3 folder for agent {saved_agent.id}: {e}")
+            logger.warning("⚠️ Failed to create S3 folder for agent %s: %s", saved_agent.id, e)
             # La carpeta se creará automáticamente cuando se suba el primer documento
 
         #Retornar el DTO de respuesta
-        logger.info(f"Agent created successfully with ID: {saved_agent.id}")
+        logger.info("Agent created successfully with ID: %s", saved_agent.id)
 
         return AgentResponseDTO(
             id=str(saved_agent.id),
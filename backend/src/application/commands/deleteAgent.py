@@ -1,3 +1,4 @@
+import asyncio
 from src.domain.value_objects.agentId import AgentId
 from src.domain.ports.repositories.agentRepository import AgentRepository
 from src.domain.ports.repositories.documentRepository import DocumentRepository
@@ -12,9 +13,8 @@ class DeleteAgentCommand:
     Caso de uso #3: Eliminar un agente y todos sus recursos asociados
     
     Este comando implementa la eliminación en cascada:
-    1. Elimina todos los archivos de S3
-    2. Elimina todos los documentos de la BD
-    3. Elimina el agente
+    1. Elimina en paralelo los archivos de S3 y los documentos de la BD
+    2. Elimina el agente
     """
     
     def __init__(
@@ -34,7 +34,7 @@ class DeleteAgentCommand:
         Returns:
             True si se eliminó correctamente
         """
-        logger.info(f"Deleting agent with ID: {agent_id}")
+        logger.info("Deleting agent with ID: %s", agent_id)
         
         agent_id_vo = AgentId(agent_id)
         
@@ -43,40 +43,34 @@ class DeleteAgentCommand:
         if not agent:
             raise AgentNotFoundException(agent_id)
         
-        # Obtener todos los documentos del agente
-        documents = await self.document_repository.find_by_agent_id(agent_id_vo)
-        
-        # Eliminar archivos de S3
-        if documents:
-            logger.info(f"Deleting {len(documents)} files from storage")
-            try:
-                # Eliminar carpeta completa del agente
-                folder_key = f"agents/{agent_id}/"
-                deleted_count = await self.file_storage.delete_folder(folder_key)
-                logger.info(f"Deleted {deleted_count} files from storage")
-            except Exception as e:
-                logger.error(f"Error deleting files from S3: {e}")
-                # Continuar con la eliminación de BD aunque S3 falle
-                # El admin puede limpiar S3 manualmente después
-        else:
-            # Si no hay documentos, intentar eliminar la carpeta vacía del agente
-            try:
-                folder_key = f"agents/{agent_id}/"
-                await self.file_storage.delete_folder(folder_key)
-                logger.info(f"Deleted empty agent folder: {folder_key}")
-            except Exception as e:
-                logger.warning(f"Could not delete empty agent folder {folder_key}: {e}")
-        
-        # Eliminar documentos de la BD
-        doc_count = await self.document_repository.delete_by_agent_id(agent_id_vo)
-        logger.info(f"Deleted {doc_count} documents from database")
+        # Los archivos de S3 y los documentos de la BD son independientes: se
+        # eliminan en paralelo, cada uno con una operación por lotes
+        deleted_files, doc_count = await asyncio.gather(
+            self._delete_files(agent_id),
+            self.document_repository.delete_by_agent_id(agent_id_vo)
+        )
+        logger.info("Deleted %s files from storage and %s documents from database", deleted_files, doc_count)
         
         # Eliminar el agente
         result = await self.agent_repository.delete_agent(agent_id_vo)
         
         if result:
-            logger.info(f"Agent {agent_id} deleted successfully")
+            logger.info("Agent %s deleted successfully", agent_id)
         else:
-            logger.error(f"Failed to delete agent {agent_id}")
+            logger.error("Failed to delete agent %s", agent_id)
         
-        return result
\ No newline at end of file
+        return result
+    
+    async def _delete_files(self, agent_id: str) -> int:
+        """
+        Elimina la carpeta del agente en S3 (delete_objects por lotes de 1000)
+        
+        Un fallo de S3 no detiene la eliminación: el admin puede limpiar S3
+        manualmente después
+        """
+        folder_key = f"agents/{agent_id}/"
+        try:
+            return await self.file_storage.delete_folder(folder_key)
+        except Exception as e:
+            logger.error("Error deleting files from S3 folder %s: %s", folder_key, e)
+            return 0
@@ -33,7 +33,7 @@ class DeleteDocumentCommand:
         3. Elimina el registro de BD
         4. Actualiza el contador del agente
         """
-        logger.info(f"Deleting document with ID: {document_id}")
+        logger.info("Deleting document with ID: %s", document_id)
         
         # Buscar el documento
         document = await self.document_repository.find_by_id(document_id)
@@ -48,9 +48,9 @@ class DeleteDocumentCommand:
         # Eliminar archivo de S3
         try:
             await self.file_storage.delete_file(document.s3_key)
-            logger.info(f"File {document.s3_key} deleted from storage")
+            logger.info("File %s deleted from storage", document.s3_key)
         except Exception as e:
-            logger.error(f"Error deleting file from storage: {e}")
+            logger.error("Error deleting file from storage: %s", e)
             # Continuar con la eliminación del registro
         
         # Eliminar registro de BD
@@ -60,6 +60,6 @@ class DeleteDocumentCommand:
             # Actualizar contador del agente
             agent.documents_count = max(0, agent.documents_count - 1)
             await self.agent_repository.save_agent(agent)
-            logger.info(f"Document {document_id} deleted successfully")
+            logger.info("Document %s deleted successfully", document_id)
         
         return result
\ No newline at end of file
@@ -46,7 +46,7 @@ class UpdateAgentCommand:
         # Persistir cambios
         updated_agent = await self.agent_repository.save_agent(existing_agent)
         # Retornar el DTO de respuesta
-        logger.info(f"Agent updated successfully with ID: {existing_agent.id}")
+        logger.info("Agent updated successfully with ID: %s", existing_agent.id)
 
         return AgentResponseDTO(
             id=str(existing_agent.id),
@@ -1,18 +1,36 @@
 import os
 import unicodedata
 import re
+from typing import Tuple
+from src.domain.entities.agent import Agent
 from src.domain.entities.document import Document
 from src.domain.value_objects.agentId import AgentId
 from src.domain.value_objects.documentType import DocumentType
 from src.domain.ports.repositories.agentRepository import AgentRepository
 from src.domain.ports.repositories.documentRepository import DocumentRepository
-from src.domain.ports.services.fileStorage import FileStorage
-from src.domain.exceptions.domainExceptions import AgentNotFoundException, FileSizeExceededException, InvalidFileTypeException
-from ..dto.documentDto import UploadDocumentDTO, DocumentResponseDTO
+from src.domain.ports.services.fileStorage import FileStorage, FileMetadata
+from src.domain.exceptions.domainExceptions import (
+    AgentNotFoundException,
+    FileNotFoundException,
+    FileSizeExceededException,
+    InvalidFileTypeException
+)
+from ..dto.documentDto import UploadDocumentDTO, RegisterDocumentDTO, PresignedUploadDTO, DocumentResponseDTO
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Sustituciones de caracteres sin descomposición NFD, aplicadas en una sola pasada
+_METADATA_REPLACEMENTS = str.maketrans({
+    'ñ': 'n', 'Ñ': 'N',
+    'ç': 'c', 'Ç': 'C',
+    'ß': 'ss',
+    'œ': 'oe', 'æ': 'ae'
+})
+
+# Caracteres no ASCII o problemáticos para metadatos, compilados una sola vez
+_UNSAFE_METADATA_CHARS = re.compile(r'[^\x00-\x7F]|[<>:"/\\|?*]')
+
 def sanitize_filename_for_s3_metadata(filename: str) -> str:
     """
     Sanitiza un nombre de archivo para que sea compatible con metadatos de S3.
@@ -27,26 +45,18 @@ def sanitize_filename_for_s3_metadata(filename: str) -> str:
     if not filename:
         return "unknown_file"
     
-    # Normalizar unicode y remover acentos
-    normalized = unicodedata.normalize('NFD', filename)
-    ascii_text = ''.join(c for c in normalized if unicodedata.category(c) != 'Mn')
-    
-    # Reemplazar caracteres especiales comunes
-    replacements = {
-        'ñ': 'n', 'Ñ': 'N',
-        'ç': 'c', 'Ç': 'C',
-        'ß': 'ss',
-        'œ': 'oe', 'æ': 'ae'
-    }
-    
-    for original, replacement in replacements.items():
-        ascii_text = ascii_text.replace(original, replacement)
-    
-    # Remover cualquier carácter no ASCII restante
-    ascii_text = re.sub(r'[^\x00-\x7F]', '_', ascii_text)
+    # Normalizar unicode y remover acentos (innecesario si ya es ASCII)
+    if filename.isascii():
+        ascii_text = filename
+    else:
+        normalized = unicodedata.normalize('NFD', filename)
+        ascii_text = ''.join(c for c in normalized if unicodedata.category(c) != 'Mn')
+        
+        # Reemplazar caracteres especiales comunes
+        ascii_text = ascii_text.translate(_METADATA_REPLACEMENTS)
     
-    # Limpiar caracteres problemáticos para metadatos
-    ascii_text = re.sub(r'[<>:"/\\|?*]', '_', ascii_text)
+    # Remover no ASCII restantes y caracteres problemáticos para metadatos
+    ascii_text = _UNSAFE_METADATA_CHARS.sub('_', ascii_text)
     
     # Asegurar que no esté vacío
     if not ascii_text.strip():
@@ -57,9 +67,13 @@ def sanitize_filename_for_s3_metadata(filename: str) -> str:
 class UploadDocumentCommand:
     """
     Caso de uso #4: Subir un documento para un agente
+    
+    Admite la subida a través de la API (execute) y la subida directa a S3
+    con POST presignado (create_upload_url + register)
     """
     
     MAX_FILE_SIZE = 20 * 1024 * 1024  # 20 MB
+    UPLOAD_URL_EXPIRATION = 900  # 15 minutos
     
     def __init__(
         self,
@@ -82,31 +96,18 @@ class UploadDocumentCommand:
         5. Guarda el registro en BD
         6. Actualiza el contador del agente
         """
-        logger.info(f"Uploading document '{dto.filename}' for agent {dto.agent_id}")
-        
-        # Validar que el agente existe
-        agent_id_vo = AgentId(dto.agent_id)
-        agent = await self.agent_repository.get_agent_by_id(agent_id_vo)
-        if not agent:
-            raise AgentNotFoundException(dto.agent_id)
-        
-        # Validar tipo de archivo
-        extension = os.path.splitext(dto.filename)[1]
-        if not DocumentType.is_valid_extension(extension):
-            raise InvalidFileTypeException(extension)
-        
-        doc_type = DocumentType.from_extension(extension)
+        logger.info("Uploading document '%s' for agent %s", dto.filename, dto.agent_id)
         
-        # Validar tamaño
-        if dto.file_size > self.MAX_FILE_SIZE:
-            raise FileSizeExceededException(dto.file_size, self.MAX_FILE_SIZE)
+        agent_id_vo, agent = await self._get_agent(dto.agent_id)
+        doc_type = self._get_document_type(dto.filename)
+        self._validate_size(dto.file_size)
         
         # Generar la clave S3 (path en el bucket)
-        s3_key = f"agents/{dto.agent_id}/{dto.filename}"
+        s3_key = self.build_s3_key(dto.agent_id, dto.filename)
         
         # Sanitizar el nombre del archivo para metadatos S3
         sanitized_filename = sanitize_filename_for_s3_metadata(dto.filename)
-        logger.info(f"Original filename: '{dto.filename}' -> Sanitized: '{sanitized_filename}'")
+        logger.info("Original filename: '%s' -> Sanitized: '%s'", dto.filename, sanitized_filename)
         
         # Subir archivo a S3
         file_metadata = await self.file_storage.upload_file(
@@ -119,14 +120,105 @@ class UploadDocumentCommand:
             }
         )
         
+        return await self._save_document(agent, agent_id_vo, dto.filename, doc_type, file_metadata, dto.file_size)
+    
+    async def create_upload_url(
+        self,
+        agent_id: str,
+        filename: str,
+        content_type: str,
+        max_size: int
+    ) -> PresignedUploadDTO:
+        """
+        Genera un POST presignado para que el cliente suba el archivo directo a S3
+        
+        Valida el agente y el tipo de archivo antes de autorizar la subida
+        """
+        await self._get_agent(agent_id)
+        self._get_document_type(filename)
+        
+        s3_key = self.build_s3_key(agent_id, filename)
+        presigned = await self.file_storage.generate_presigned_post(
+            key=s3_key,
+            content_type=content_type,
+            max_size=min(max_size, self.MAX_FILE_SIZE),
+            expiration=self.UPLOAD_URL_EXPIRATION
+        )
+        
+        logger.info("Generated upload URL for '%s' (agent %s)", filename, agent_id)
+        return PresignedUploadDTO(
+            url=presigned["url"],
+            fields=presigned["fields"],
+            s3_key=s3_key,
+            expires_in=self.UPLOAD_URL_EXPIRATION
+        )
+    
+    async def register(self, dto: RegisterDocumentDTO) -> DocumentResponseDTO:
+        """
+        Registra en BD un documento que el cliente ya subió directamente a S3
+        
+        El tamaño se toma del objeto almacenado, no de lo que informe el cliente
+        """
+        logger.info("Registering uploaded document '%s' for agent %s", dto.filename, dto.agent_id)
+        
+        agent_id_vo, agent = await self._get_agent(dto.agent_id)
+        doc_type = self._get_document_type(dto.filename)
+        
+        # Solo se registran claves generadas para este agente y archivo
+        if dto.s3_key != self.build_s3_key(dto.agent_id, dto.filename):
+            raise FileNotFoundException(dto.s3_key)
+        
+        file_metadata = await self.file_storage.get_file_metadata(dto.s3_key)
+        if not file_metadata:
+            raise FileNotFoundException(dto.s3_key)
+        
+        self._validate_size(file_metadata.size)
+        
+        return await self._save_document(agent, agent_id_vo, dto.filename, doc_type, file_metadata, file_metadata.size)
+    
+    @staticmethod
+    def build_s3_key(agent_id: str, filename: str) -> str:
+        """Clave S3 (path en el bucket) de un documento"""
+        return f"agents/{agent_id}/{filename}"
+    
+    async def _get_agent(self, agent_id: str) -> Tuple[AgentId, Agent]:
+        """Valida que el agente existe"""
+        agent_id_vo = AgentId(agent_id)
+        agent = await self.agent_repository.get_agent_by_id(agent_id_vo)
+        if not agent:
+            raise AgentNotFoundException(agent_id)
+        return agent_id_vo, agent
+    
+    def _get_document_type(self, filename: str) -> DocumentType:
+        """Valida el tipo de archivo a partir de su extensión"""
+        extension = os.path.splitext(filename)[1]
+        if not DocumentType.is_valid_extension(extension):
+            raise InvalidFileTypeException(extension)
+        return DocumentType.from_extension(extension)
+    
+    def _validate_size(self, file_size: int) -> None:
+        """Valida el tamaño del archivo"""
+        if file_size > self.MAX_FILE_SIZE:
+            raise FileSizeExceededException(file_size, self.MAX_FILE_SIZE)
+    
+    async def _save_document(
+        self,
+        agent: Agent,
+        agent_id_vo: AgentId,
+        filename: str,
+        doc_type: DocumentType,
+        file_metadata: FileMetadata,
+        file_size: int
+    ) -> DocumentResponseDTO:
+        """Guarda el documento en BD y actualiza el contador del agente"""
         # Crear entidad Document
         document = Document.create(
             agent_id=agent_id_vo,
-            filename=dto.filename,
+            filename=filename,
             document_type=doc_type,
             s3_url=file_metadata.url,
             s3_key=file_metadata.key,
-            file_size=dto.file_size
+            file_size=file_size
         )
         
         # Guardar en BD
@@ -141,7 +233,7 @@ class UploadDocumentCommand:
         agent.documents_count += 1
         await self.agent_repository.save_agent(agent)
 
-        logger.info(f"Document '{dto.filename}' uploaded successfully with ID: {saved_document.id}")
+        logger.info("Document '%s' uploaded successfully with ID: %s", filename, saved_document.id)
 
         return DocumentResponseDTO(
             id=saved_document.id,
@@ -153,4 +245,4 @@ class UploadDocumentCommand:
             file_size=saved_document.file_size,
             file_size_mb=saved_document.get_size(),
             created_at=saved_document.created_at
-        )
\ No newline at end of file
+        )
@@ -2,7 +2,7 @@ from dataclasses import dataclass
 from datetime import datetime
 from typing import Optional
 
-@dataclass
+@dataclass(slots=True)
 class CreateAgentDTO:
     """
     Data Transfer Object para la creación de un nuevo agente
@@ -10,7 +10,7 @@ class CreateAgentDTO:
     name: str
     prompt: str
 
-@dataclass
+@dataclass(slots=True)
 class UpdateAgentDTO:
     """
     Data Transfer Object para la actualización de un agente existente
@@ -2,7 +2,7 @@ from dataclasses import dataclass
 from datetime import datetime
 from typing import BinaryIO, Dict, Any, Optional
 
-@dataclass
+@dataclass(slots=True)
 class UploadDocumentDTO:
     """
     Data Transfer Object para la subida de un documento
@@ -14,6 +14,24 @@ class UploadDocumentDTO:
     file_size: int
     metadata: Optional[Dict[str, Any]] = None
 
+@dataclass(slots=True)
+class RegisterDocumentDTO:
+    """
+    Data Transfer Object para registrar un documento subido directamente a S3
+    """
+    agent_id: str
+    filename: str
+    s3_key: str
+    content_type: str
+
+@dataclass
+class PresignedUploadDTO:
+    """DTO de respuesta con los datos para subir un archivo directamente a S3"""
+    url: str
+    fields: Dict[str, Any]
+    s3_key: str
+    expires_in: int
+
 @dataclass
 class DocumentResponseDTO:
     """DTO de respuesta para un documento"""
@@ -31,7 +31,7 @@ class GetAgentDetailQuery:
         Returns:
             Dict con el agente y sus documentos
         """
-        logger.info(f"Getting agent detail for ID: {agent_id}")
+        logger.info("Getting agent detail for ID: %s", agent_id)
         
         agent_id_vo = AgentId(agent_id)
         
@@ -29,12 +29,12 @@ class GetDocumentQuery:
         Raises:
             DocumentNotFoundException: Si el documento no existe
         """
-        logger.info(f"Getting document detail for ID: {document_id}")
+        logger.info("Getting document detail for ID: %s", document_id)
         
         # Buscar el documento
         document = await self.document_repository.find_by_id(document_id)
         if not document:
-            logger.warning(f"Document not found: {document_id}")
+            logger.warning("Document not found: %s", document_id)
             raise DocumentNotFoundException(document_id)
         
         # Convertir a DTO
@@ -50,5 +50,5 @@ class GetDocumentQuery:
             created_at=document.created_at
         )
         
-        logger.info(f"Document found: {document_id}")
+        logger.info("Document found: %s", document_id)
         return document_dto
@@ -33,7 +33,7 @@ class ListAgentsQuery:
         Returns:
             Dict con los agentes y metadata de paginación
         """
-        logger.info(f"Listing agents: skip={skip}, limit={limit}, search={search}")
+        logger.info("Listing agents: skip=%s, limit=%s, search=%s", skip, limit, search)
         
         # Obtener agentes
         agents = await self.agent_repository.get_all(skip=skip, limit=limit)
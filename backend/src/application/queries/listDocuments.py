@@ -1,8 +1,12 @@
-from typing import List, Optional
+import asyncio
+import base64
+from datetime import datetime
+from typing import List, Optional, Tuple
 from src.domain.ports.repositories.documentRepository import DocumentRepository
 from src.domain.ports.repositories.agentRepository import AgentRepository
 from src.domain.value_objects.agentId import AgentId
 from src.domain.exceptions.domainExceptions import AgentNotFoundException
+from src.domain.entities.document import Document
 from src.application.dto.documentDto import DocumentResponseDTO
 import logging
 
@@ -28,7 +32,8 @@ class ListDocumentsQuery:
         agent_id: Optional[str] = None,
         skip: int = 0,
         limit: int = 20,
-        search: Optional[str] = None
+        search: Optional[str] = None,
+        after: Optional[str] = None
     ) -> dict:
         """
         Ejecuta la consulta para listar documentos
@@ -38,37 +43,41 @@ class ListDocumentsQuery:
             skip: Número de documentos a omitir (paginación)
             limit: Número máximo de documentos a retornar
             search: Término de búsqueda en filename (opcional)
+            after: Cursor next_cursor de la página anterior; si se indica, se ignora skip
             
         Returns:
             Dict con la lista de documentos y metadata de paginación
             
         Raises:
             AgentNotFoundException: Si se especifica un agent_id que no existe
+            ValueError: Si el cursor no es válido
         """
-        logger.info(f"Listing documents: agent_id={agent_id}, skip={skip}, limit={limit}, search={search}")
+        logger.info("Listing documents: agent_id=%s, skip=%s, limit=%s, search=%s, after=%s", agent_id, skip, limit, search, after)
         
         # Si se especifica agent_id, validar que el agente existe
         if agent_id:
             agent_id_vo = AgentId(agent_id)
             agent = await self.agent_repository.get_agent_by_id(agent_id_vo)
             if not agent:
-                logger.warning(f"Agent not found: {agent_id}")
+                logger.warning("Agent not found: %s", agent_id)
                 raise AgentNotFoundException(agent_id)
             
-            # Obtener documentos del agente específico
-            documents = await self.document_repository.find_by_agent_id(agent_id_vo)
-            
-            # Filtrar por término de búsqueda si se proporciona
-            if search:
-                search_lower = search.lower()
-                documents = [
-                    doc for doc in documents 
-                    if search_lower in doc.filename.lower()
-                ]
+            # Obtener la página directamente desde BD (un documento extra indica si hay más)
+            position = self.decode_cursor(after) if after else None
+            documents, total = await asyncio.gather(
+                self.document_repository.find_page_by_agent_id(
+                    agent_id_vo,
+                    limit=limit + 1,
+                    skip=skip,
+                    after=position,
+                    search=search
+                ),
+                self.document_repository.count_by_agent_id(agent_id_vo, search=search)
+            )
             
-            # Aplicar paginación manual
-            total = len(documents)
-            documents = documents[skip:skip + limit]
+            has_next = len(documents) > limit
+            documents = documents[:limit]
+            next_cursor = self.encode_cursor(documents[-1]) if has_next else None
             
         else:
             # Obtener todos los documentos (implementar en el futuro)
@@ -76,6 +85,8 @@ class ListDocumentsQuery:
             # TODO: Implementar find_all en DocumentRepository
             documents = []
             total = 0
+            has_next = False
+            next_cursor = None
             logger.warning("Listing all documents not implemented yet. Use agent_id filter.")
         
         # Convertir a DTOs
@@ -97,8 +108,7 @@ class ListDocumentsQuery:
         # Calcular metadata de paginación
         page = (skip // limit) + 1 if limit > 0 else 1
         total_pages = (total + limit - 1) // limit if limit > 0 else 1
-        has_next = skip + limit < total
-        has_previous = skip > 0
+        has_previous = skip > 0 or after is not None
         
         result = {
             "documents": documents_dto,
@@ -108,9 +118,25 @@ class ListDocumentsQuery:
                 "per_page": limit,
                 "total_pages": total_pages,
                 "has_next": has_next,
-                "has_previous": has_previous
+                "has_previous": has_previous,
+                "next_cursor": next_cursor
             }
         }
         
-        logger.info(f"Found {len(documents_dto)} documents (total: {total})")
+        logger.info("Found %s documents (total: %s)", len(documents_dto), total)
         return result
+    
+    @staticmethod
+    def encode_cursor(document: Document) -> str:
+        """Codifica la posición (created_at, id) de un documento como cursor opaco"""
+        raw = f"{document.created_at.isoformat()}|{document.id}"
+        return base64.urlsafe_b64encode(raw.encode()).decode()
+    
+    @staticmethod
+    def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+        """Decodifica un cursor generado por encode_cursor"""
+        try:
+            created_at, document_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|", 1)
+            return datetime.fromisoformat(created_at), document_id
+        except (ValueError, UnicodeDecodeError) as e:
+            raise ValueError("Cursor de paginación inválido") from e
@@ -52,7 +52,7 @@ class DocumentValidationService:
             DocumentSizeExceededException: Si el archivo es demasiado grande
             UnsupportedFileTypeException: Si el tipo de archivo no está soportado
         """
-        logger.info(f"Validating document upload for agent {agent_id}: {filename}")
+        logger.info("Validating document upload for agent %s: %s", agent_id, filename)
         
         # 1. Validar límite de documentos por agente
         await self._validate_documents_limit(agent_id)
@@ -66,7 +66,7 @@ class DocumentValidationService:
         # 4. Validar tipo de archivo
         self._validate_file_type(filename, file_type)
         
-        logger.info(f"Document validation passed for {filename}")
+        logger.info("Document validation passed for %s", filename)
     
     async def _validate_documents_limit(self, agent_id: AgentId) -> None:
         """Valida que el agente no exceda el límite de documentos"""
@@ -74,8 +74,8 @@ class DocumentValidationService:
         
         if current_count >= self.MAX_DOCUMENTS_PER_AGENT:
             logger.warning(
-                f"Agent {agent_id} has reached documents limit: "
-                f"{current_count}/{self.MAX_DOCUMENTS_PER_AGENT}"
+                "Agent %s has reached documents limit: %s/%s",
+                agent_id, current_count, self.MAX_DOCUMENTS_PER_AGENT
             )
             raise MaxDocumentsPerAgentExceededException(
                 str(agent_id), current_count, self.MAX_DOCUMENTS_PER_AGENT
@@ -87,7 +87,7 @@ class DocumentValidationService:
         
         for doc in existing_documents:
             if doc.filename.lower() == filename.lower():
-                logger.warning(f"Duplicate document found: {filename} for agent {agent_id}")
+                logger.warning("Duplicate document found: %s for agent %s", filename, agent_id)
                 raise DuplicateDocumentException(str(agent_id), filename)
     
     def _validate_file_size(self, filename: str, file_size: int) -> None:
@@ -95,7 +95,7 @@ class DocumentValidationService:
         size_mb = file_size / (1024 * 1024)
         
         if size_mb > self.MAX_FILE_SIZE_MB:
-            logger.warning(f"File too large: {filename} ({size_mb:.2f}MB)")
+            logger.warning("File too large: %s (%.2fMB)", filename, size_mb)
             raise DocumentSizeExceededException(filename, size_mb, self.MAX_FILE_SIZE_MB)
     
     def _validate_file_type(self, filename: str, file_type: str) -> None:
@@ -104,7 +104,7 @@ class DocumentValidationService:
         clean_type = file_type.lower().lstrip('.')
         
         if clean_type not in self.SUPPORTED_FILE_TYPES:
-            logger.warning(f"Unsupported file type: {file_type} for {filename}")
+            logger.warning("Unsupported file type: %s for %s", file_type, filename)
             raise UnsupportedFileTypeException(filename, file_type, self.SUPPORTED_FILE_TYPES)
     
     async def validate_agent_deletion(self, agent_id: AgentId) -> None:
@@ -120,7 +120,7 @@ class DocumentValidationService:
         documents_count = await self.document_repository.count_by_agent_id(agent_id)
         
         if documents_count > 0:
-            logger.warning(f"Cannot delete agent {agent_id}: has {documents_count} documents")
+            logger.warning("Cannot delete agent %s: has %s documents", agent_id, documents_count)
             raise AgentHasDocumentsException(str(agent_id), documents_count)
     
     def get_file_type_from_filename(self, filename: str) -> str:
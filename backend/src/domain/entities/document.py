@@ -5,7 +5,10 @@ import uuid
 from ..value_objects.agentId import AgentId
 from ..value_objects.documentType import DocumentType
 
-@dataclass
+MAX_FILENAME_LENGTH = 100
+MAX_FILE_SIZE = 20 * 1024 * 1024  # 20 MB
+
+@dataclass(slots=True)
 class Document:
     """
     Entidad Documento - Representa un documento asociado a un agente
@@ -28,13 +31,12 @@ class Document:
         """Valida que el nombre del archivo no esté vacío."""
         if not self.filename or not isinstance(self.filename, str):
             raise ValueError("File name cannot be empty and must be a string.")
-        if len(self.filename) > 100:
-            raise ValueError("File name must be at most 100 characters long.")
+        if len(self.filename) > MAX_FILENAME_LENGTH:
+            raise ValueError(f"File name must be at most {MAX_FILENAME_LENGTH} characters long.")
         self.filename = self.filename.strip()
 
     def _validate_file_size(self):
         """Valida que el tamaño del archivo sea positivo y <= 20MB."""
-        MAX_FILE_SIZE = 20 * 1024 * 1024  # 20 MB
         if not isinstance(self.file_size, int) or self.file_size <= 0:
             raise ValueError("File size must be a positive integer.")
         if self.file_size > MAX_FILE_SIZE:
@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from datetime import datetime
+from typing import List, Optional, Tuple
 from ...entities.document import Document
 from ...value_objects.agentId import AgentId
 
@@ -25,6 +26,23 @@ class DocumentRepository(ABC):
         """Obtiene todos los documentos de un agente."""
         pass
 
+    @abstractmethod
+    async def find_page_by_agent_id(
+        self,
+        agent_id: AgentId,
+        limit: int,
+        skip: int = 0,
+        after: Optional[Tuple[datetime, str]] = None,
+        search: Optional[str] = None
+    ) -> List[Document]:
+        """
+        Obtiene una página de documentos de un agente, del más reciente al más antiguo.
+
+        after es la posición (created_at, id) del último documento de la página
+        anterior; si se indica, se ignora skip.
+        """
+        pass
+
     @abstractmethod
     async def delete(self, document_id: str) -> bool:
         """Elimina un documento por su ID."""
@@ -36,8 +54,8 @@ class DocumentRepository(ABC):
         pass
 
     @abstractmethod
-    async def count_by_agent_id(self, agent_id: AgentId) -> int:
-        """Cuenta los documentos de un agente."""
+    async def count_by_agent_id(self, agent_id: AgentId, search: Optional[str] = None) -> int:
+        """Cuenta los documentos de un agente, opcionalmente filtrando por nombre."""
         pass
 
     @abstractmethod
@@ -125,6 +125,28 @@ class FileStorage(ABC):
         """
         pass
     
+    @abstractmethod
+    async def generate_presigned_post(
+        self,
+        key: str,
+        content_type: str,
+        max_size: int,
+        expiration: int = 900
+    ) -> Dict[str, Any]:
+        """
+        Genera los datos para que el cliente suba un archivo directamente
+        
+        Args:
+            key: Clave donde se almacenará el archivo
+            content_type: Tipo MIME que debe enviar el cliente
+            max_size: Tamaño máximo aceptado en bytes
+            expiration: Tiempo de expiración en segundos
+        
+        Returns:
+            Diccionario con la URL de destino y los campos del formulario
+        """
+        pass
+    
     @abstractmethod
     async def list_files(
         self,
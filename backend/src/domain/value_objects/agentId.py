@@ -1,7 +1,7 @@
 from dataclasses import dataclass
 from uuid import uuid4
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class AgentId:
     '''Representa un identificador único para un agente.'''
     value: str
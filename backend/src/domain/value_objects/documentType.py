@@ -1,4 +1,5 @@
 from enum import Enum
+from functools import lru_cache
 
 class DocumentType(Enum):
     """Representa los tipos de documentos permitidos."""
@@ -13,23 +14,26 @@ class DocumentType(Enum):
     def from_extension(cls, extension: str) -> "DocumentType":
         """Devuelve el tipo de documento correspondiente a una extensión dada."""
         extension = extension.lower().replace(".", "")
-        for doc_type in cls:
-            if doc_type.value == extension:
-                return doc_type
-        raise ValueError(f"Unsupported file extension: {extension}")
+        doc_type = cls._extension_map().get(extension)
+        if doc_type is None:
+            raise ValueError(f"Unsupported file extension: {extension}")
+        return doc_type
     
     @classmethod
     def is_valid_extension(cls, extension: str) -> bool:
         """Verifica si una extensión de archivo es un tipo de documento válido."""
-        if extension is None:
-            return False
-        try:
-            cls.from_extension(extension)
-            return True
-        except (ValueError, AttributeError):
+        if not isinstance(extension, str):
             return False
+        return extension.lower().replace(".", "") in cls._extension_map()
+    
+    @classmethod
+    @lru_cache(maxsize=1)
+    def get_all_extensions(cls) -> tuple[str, ...]:
+        """Devuelve todas las extensiones soportadas (tupla inmutable, se calcula una vez)."""
+        return tuple(doc_type.value for doc_type in cls)
     
     @classmethod
-    def get_all_extensions(cls) -> list[str]:
-        """Devuelve una lista de todas las extensiones soportadas."""
-        return [doc_type.value for doc_type in cls]
\ No newline at end of file
+    @lru_cache(maxsize=1)
+    def _extension_map(cls) -> dict[str, "DocumentType"]:
+        """Índice extensión -> tipo, construido una vez para búsquedas en O(1)."""
+        return {doc_type.value: doc_type for doc_type in cls}
\ No newline at end of file
@@ -0,0 +1,78 @@
+"""
+Agrupador de escrituras MongoDB para reducir viajes de red bajo carga
+"""
+import asyncio
+from typing import List, Optional, Set, Tuple
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo.errors import BulkWriteError
+import logging
+
+logger = logging.getLogger(__name__)
+
+class MongoBulkWriter:
+    """
+    Agrupa escrituras concurrentes sobre una colección en un solo bulk_write
+
+    Cada escritura espera hasta que su lote se envía: el lote se despacha al
+    llegar a max_batch operaciones o tras max_delay segundos desde la primera.
+    Usa ordered=False, por lo que solo debe recibir operaciones independientes
+    entre sí (por ejemplo, documentos con _id distintos).
+    """
+
+    def __init__(self, collection: AsyncIOMotorCollection, max_batch: int = 50, max_delay: float = 0.02):
+        self.collection = collection
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._pending: List[Tuple[object, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._flushes: Set[asyncio.Task] = set()
+
+    async def write(self, operation) -> None:
+        """Encola una operación (InsertOne, ReplaceOne, ...) y espera a que se escriba"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((operation, future))
+
+        if len(self._pending) >= self.max_batch:
+            self._dispatch()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_delay, self._dispatch)
+
+        await future
+
+    def _dispatch(self) -> None:
+        """Envía el lote pendiente en una tarea independiente"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+
+        task = asyncio.get_running_loop().create_task(self._flush(batch))
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def _flush(self, batch: List[Tuple[object, asyncio.Future]]) -> None:
+        """Ejecuta el bulk_write y resuelve el resultado de cada operación"""
+        errors = {}
+        try:
+            await self.collection.bulk_write([operation for operation, _ in batch], ordered=False)
+        except BulkWriteError as e:
+            # Solo fallan las operaciones indicadas; el resto se escribió
+            errors = {
+                error["index"]: BulkWriteError({"writeErrors": [error]})
+                for error in e.details.get("writeErrors", [])
+            }
+        except Exception as e:
+            logger.error("Bulk write of %d operations failed: %s", len(batch), e)
+            errors = {index: e for index in range(len(batch))}
+
+        for index, (_, future) in enumerate(batch):
+            if future.done():
+                continue
+            if index in errors:
+                future.set_exception(errors[index])
+            else:
+                future.set_result(None)
@@ -40,10 +40,10 @@ class MongoDBConnection:
             await self.client.admin.command('ping')
             
             self.database = self.client[self.settings.mongodb_db_name]
-            logger.info(f"Successfully connected to MongoDB Atlas database: {self.settings.mongodb_db_name}")
+            logger.info("Successfully connected to MongoDB Atlas database: %s", self.settings.mongodb_db_name)
             
         except Exception as e:
-            logger.error(f"Failed to connect to MongoDB Atlas: {e}")
+            logger.error("Failed to connect to MongoDB Atlas: %s", e)
             # Limpiar el cliente si la conexión falló
             self.client = None
             self.database = None
@@ -58,7 +58,7 @@ class MongoDBConnection:
             sync_client.close()
             return True
         except Exception as e:
-            logger.error(f"Sync connection test failed: {e}")
+            logger.error("Sync connection test failed: %s", e)
             return False
     
     async def disconnect(self):
@@ -114,6 +114,13 @@ class MongoDBConnection:
                 ("created_at", -1)
             ])
             
+            # Índice para la paginación por cursor del listado de documentos
+            await documents_collection.create_index([
+                ("agent_id", 1),
+                ("created_at", -1),
+                ("_id", -1)
+            ])
+            
             # Índice compuesto para búsquedas por agente y tipo
             await documents_collection.create_index([
                 ("agent_id", 1),
@@ -124,7 +131,7 @@ class MongoDBConnection:
             logger.info("All database indexes created successfully")
             
         except Exception as e:
-            logger.error(f"Failed to create indexes: {e}")
+            logger.error("Failed to create indexes: %s", e)
             raise
 
 # Instancia global de la conexión (será inicializada al usarse)
@@ -149,7 +156,7 @@ async def get_database():
             raise Exception("Database connection failed - database is None")
         return mongodb.database
     except Exception as e:
-        logger.error(f"Failed to get database: {e}")
+        logger.error("Failed to get database: %s", e)
         raise Exception(f"Cannot initialize database connection: {e}")
 
 
@@ -53,7 +53,7 @@ class MongoAgentRepository(AgentRepository):
             upsert=True
         )
         
-        logger.debug(f"Agent saved: {agent.id}, modified: {result.modified_count}")
+        logger.debug("Agent saved: %s, modified: %s", agent.id, result.modified_count)
         return agent
     
     async def get_agent_by_id(self, agent_id: AgentId) -> Optional[Agent]:
@@ -89,11 +89,9 @@ class MongoAgentRepository(AgentRepository):
     
     async def exists(self, agent_id: AgentId) -> bool:
         """Verifica si existe un agente"""
-        count = await self.collection.count_documents(
-            {"_id": str(agent_id)},
-            limit=1
-        )
-        return count > 0
+        # find_one con proyección solo de _id: se resuelve con el índice, sin pipeline de conteo
+        document = await self.collection.find_one({"_id": str(agent_id)}, {"_id": 1})
+        return document is not None
     
     async def count(self) -> int:
         """Cuenta el total de agentes"""
@@ -1,10 +1,14 @@
-from typing import Optional, List
+from datetime import datetime
+from typing import Optional, List, Tuple
+import re
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReplaceOne
 
 from src.domain.entities.document import Document
 from src.domain.value_objects.agentId import AgentId
 from src.domain.value_objects.documentType import DocumentType
 from src.domain.ports.repositories.documentRepository import DocumentRepository
+from ..bulkWriter import MongoBulkWriter
 import logging
 
 logger = logging.getLogger(__name__)
@@ -14,10 +18,12 @@ class MongoDocumentRepository(DocumentRepository):
     Implementación MongoDB del repositorio de documentos
     """
     
-    def __init__(self, database: AsyncIOMotorDatabase):
+    def __init__(self, database: AsyncIOMotorDatabase, batch_writes: bool = False):
         if database is None:
             raise Exception("Database cannot be None - MongoDB connection failed")
         self.collection = database["documents"]
+        # Agrupa los guardados concurrentes en un solo bulk_write
+        self._bulk_writer = MongoBulkWriter(self.collection) if batch_writes else None
     
     def _to_domain(self, model: dict) -> Document:
         """Convierte un documento MongoDB a entidad del dominio"""
@@ -51,13 +57,16 @@ class MongoDocumentRepository(DocumentRepository):
         """Guarda un documento"""
         model = self._to_model(document)
         
-        result = await self.collection.replace_one(
-            {"_id": model["_id"]},
-            model,
-            upsert=True
-        )
+        if self._bulk_writer is not None:
+            await self._bulk_writer.write(ReplaceOne({"_id": model["_id"]}, model, upsert=True))
+        else:
+            await self.collection.replace_one(
+                {"_id": model["_id"]},
+                model,
+                upsert=True
+            )
         
-        logger.debug(f"Document saved: {document.id}")
+        logger.debug("Document saved: %s", document.id)
         return document
     
     async def find_by_id(self, document_id: str) -> Optional[Document]:
@@ -80,6 +89,39 @@ class MongoDocumentRepository(DocumentRepository):
         
         return documents
     
+    def _agent_filter(self, agent_id: AgentId, search: Optional[str] = None) -> dict:
+        """Filtro por agente y, opcionalmente, por coincidencia parcial del nombre"""
+        query = {"agent_id": str(agent_id)}
+        if search:
+            query["filename"] = {"$regex": re.escape(search), "$options": "i"}
+        return query
+    
+    async def find_page_by_agent_id(
+        self,
+        agent_id: AgentId,
+        limit: int,
+        skip: int = 0,
+        after: Optional[Tuple[datetime, str]] = None,
+        search: Optional[str] = None
+    ) -> List[Document]:
+        """Obtiene una página de documentos de un agente usando el índice (agent_id, created_at, _id)"""
+        query = self._agent_filter(agent_id, search)
+        
+        if after:
+            # Paginación por cursor: continúa justo después del último documento entregado
+            created_at, document_id = after
+            query["$or"] = [
+                {"created_at": {"$lt": created_at}},
+                {"created_at": created_at, "_id": {"$lt": document_id}}
+            ]
+        
+        cursor = self.collection.find(query).sort([("created_at", -1), ("_id", -1)])
+        if skip and not after:
+            cursor = cursor.skip(skip)
+        cursor = cursor.limit(limit)
+        
+        return [self._to_domain(doc) async for doc in cursor]
+    
     async def delete(self, document_id: str) -> bool:
         """Elimina un documento"""
         result = await self.collection.delete_one({"_id": document_id})
@@ -90,14 +132,11 @@ class MongoDocumentRepository(DocumentRepository):
         result = await self.collection.delete_many({"agent_id": str(agent_id)})
         return result.deleted_count
     
-    async def count_by_agent_id(self, agent_id: AgentId) -> int:
+    async def count_by_agent_id(self, agent_id: AgentId, search: Optional[str] = None) -> int:
         """Cuenta los documentos de un agente"""
-        return await self.collection.count_documents({"agent_id": str(agent_id)})
+        return await self.collection.count_documents(self._agent_filter(agent_id, search))
     
     async def exists(self, document_id: str) -> bool:
         """Verifica si existe un documento"""
-        count = await self.collection.count_documents(
-            {"_id": document_id},
-            limit=1
-        )
-        return count > 0
+        document = await self.collection.find_one({"_id": document_id}, {"_id": 1})
+        return document is not None
@@ -1,9 +1,12 @@
 import boto3
 from botocore.exceptions import ClientError, EndpointConnectionError, SSLError
 from botocore.config import Config
-from typing import BinaryIO, Optional, Dict, Any, List
+from boto3.s3.transfer import TransferConfig
+from typing import BinaryIO, Optional, Dict, Any, List, Tuple
+from collections import OrderedDict
 from io import BytesIO
 import asyncio
+import time
 from concurrent.futures import ThreadPoolExecutor
 from src.domain.ports.services.fileStorage import FileStorage, FileMetadata
 from src.infrastructure.config.settings import get_settings
@@ -18,6 +21,15 @@ class S3FileStorage(FileStorage):
     Adapta la interfaz del dominio a las operaciones de S3
     """
     
+    # Caché de URLs presignadas: se reutiliza una URL mientras le queden al menos 10 minutos
+    PRESIGNED_URL_CACHE_SIZE = 10_000
+    PRESIGNED_URL_MIN_REMAINING = 600
+    
+    # Pool HTTP compartido por todas las operaciones: cubre los hilos del executor
+    # más las partes concurrentes de las subidas multipart
+    MAX_POOL_CONNECTIONS = 64
+    EXECUTOR_WORKERS = 16
+    
     def __init__(self, bucket_name: str, region: str, access_key_id: str, secret_access_key: str):
         self.bucket_name = bucket_name
         self.region = region
@@ -31,12 +43,15 @@ class S3FileStorage(FileStorage):
             },
             read_timeout=60,
             connect_timeout=10,
-            max_pool_connections=10,
+            max_pool_connections=self.MAX_POOL_CONNECTIONS,
+            # Mantener vivas las conexiones TLS reutilizadas entre peticiones
+            tcp_keepalive=True,
             # Configuración SSL más robusta (use_ssl se maneja en el endpoint)
             signature_version='s3v4'
         )
         
-        # Crear cliente S3 con HTTPS habilitado por defecto
+        # Cliente S3 único (thread-safe) con HTTPS habilitado por defecto;
+        # se reutiliza en todas las operaciones para no repetir handshakes TLS
         self.s3_client = boto3.client(
             's3',
             aws_access_key_id=access_key_id,
@@ -45,17 +60,33 @@ class S3FileStorage(FileStorage):
             use_ssl=True  # Asegurar que SSL está habilitado
         )
         
+        # Subidas multipart por bloques: el archivo se envía en streaming sin cargarlo en memoria
+        self.transfer_config = TransferConfig(
+            multipart_threshold=8 * 1024 * 1024,
+            multipart_chunksize=8 * 1024 * 1024,
+            max_concurrency=8,
+            use_threads=True
+        )
+        
+        # (clave S3, expiración) -> (URL, instante monotónico en que expira)
+        self._presigned_urls: "OrderedDict[Tuple[str, int], Tuple[str, float]]" = OrderedDict()
+        
         # Thread pool executor para operaciones síncronas
-        self.executor = ThreadPoolExecutor(max_workers=4)
+        self.executor = ThreadPoolExecutor(max_workers=self.EXECUTOR_WORKERS)
         
-        # Verificar/crear bucket
-        self._ensure_bucket_exists()
+        # El constructor no hace llamadas de red: el bucket se comprueba con
+        # ensure_bucket_exists() al arrancar, fuera del event loop
+    
+    async def ensure_bucket_exists(self) -> None:
+        """Verifica (o crea) el bucket en el executor, sin bloquear el event loop"""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self.executor, self._ensure_bucket_exists)
     
     def _ensure_bucket_exists(self):
         """Verifica que el bucket existe, lo crea si no"""
         try:
             self.s3_client.head_bucket(Bucket=self.bucket_name)
-            logger.info(f"S3 bucket '{self.bucket_name}' exists")
+            logger.info("S3 bucket '%s' exists", self.bucket_name)
         except ClientError as e:
             error_code = e.response['Error']['Code']
             if error_code == '404':
@@ -68,12 +99,12 @@ class S3FileStorage(FileStorage):
                             Bucket=self.bucket_name,
                             CreateBucketConfiguration={'LocationConstraint': self.region}
                         )
-                    logger.info(f"S3 bucket '{self.bucket_name}' created")
+                    logger.info("S3 bucket '%s' created", self.bucket_name)
                 except ClientError as create_error:
-                    logger.error(f"Failed to create bucket: {create_error}")
+                    logger.error("Failed to create bucket: %s", create_error)
                     raise
             else:
-                logger.error(f"Error checking bucket: {e}")
+                logger.error("Error checking bucket: %s", e)
                 raise
     
     async def upload_file(
@@ -97,7 +128,8 @@ class S3FileStorage(FileStorage):
                     file,
                     self.bucket_name,
                     key,
-                    ExtraArgs=extra_args
+                    ExtraArgs=extra_args,
+                    Config=self.transfer_config
                 )
                 
                 # Generar URL pública
@@ -106,7 +138,7 @@ class S3FileStorage(FileStorage):
                 # Obtener información del archivo
                 response = self.s3_client.head_object(Bucket=self.bucket_name, Key=key)
                 
-                logger.info(f"File uploaded to S3: {key}")
+                logger.info("File uploaded to S3: %s", key)
                 
                 return FileMetadata(
                     key=key,
@@ -117,7 +149,7 @@ class S3FileStorage(FileStorage):
                 )
                 
             except (ClientError, SSLError, EndpointConnectionError) as e:
-                logger.error(f"Error uploading file to S3: {e}")
+                logger.error("Error uploading file to S3: %s", e)
                 # Re-lanzar como StorageException para manejo consistente
                 from src.domain.exceptions.domainExceptions import StorageException
                 if "SSL" in str(e) or "EOF occurred in violation of protocol" in str(e):
@@ -127,7 +159,7 @@ class S3FileStorage(FileStorage):
                 else:
                     raise StorageException(f"Error en AWS S3: {str(e)}")
             except Exception as e:
-                logger.error(f"Unexpected error uploading file to S3: {e}")
+                logger.error("Unexpected error uploading file to S3: %s", e)
                 from src.domain.exceptions.domainExceptions import StorageException
                 raise StorageException(f"Error inesperado en S3: {str(e)}")
 
@@ -140,50 +172,57 @@ class S3FileStorage(FileStorage):
             response = self.s3_client.get_object(Bucket=self.bucket_name, Key=key)
             return BytesIO(response['Body'].read())
         except ClientError as e:
-            logger.error(f"Error downloading file from S3: {e}")
+            logger.error("Error downloading file from S3: %s", e)
             raise
     
     async def delete_file(self, key: str) -> bool:
         """Elimina un archivo de S3"""
         try:
             self.s3_client.delete_object(Bucket=self.bucket_name, Key=key)
-            logger.info(f"File deleted from S3: {key}")
+            self._forget_presigned_urls(lambda cached_key: cached_key == key)
+            logger.info("File deleted from S3: %s", key)
             return True
         except ClientError as e:
-            logger.error(f"Error deleting file from S3: {e}")
+            logger.error("Error deleting file from S3: %s", e)
             return False
     
     async def delete_folder(self, prefix: str) -> int:
         """Elimina todos los archivos con un prefijo"""
-        try:
-            # Listar objetos con el prefijo
-            paginator = self.s3_client.get_paginator('list_objects_v2')
-            pages = paginator.paginate(Bucket=self.bucket_name, Prefix=prefix)
-            
-            delete_keys = []
-            for page in pages:
-                if 'Contents' in page:
-                    delete_keys.extend([{'Key': obj['Key']} for obj in page['Contents']])
-            
-            if not delete_keys:
-                return 0
-            
-            # Eliminar en lotes de 1000 (límite de S3)
-            deleted_count = 0
-            for i in range(0, len(delete_keys), 1000):
-                batch = delete_keys[i:i+1000]
-                response = self.s3_client.delete_objects(
-                    Bucket=self.bucket_name,
-                    Delete={'Objects': batch}
-                )
-                deleted_count += len(response.get('Deleted', []))
-            
-            logger.info(f"Deleted {deleted_count} files with prefix: {prefix}")
-            return deleted_count
-            
-        except ClientError as e:
-            logger.error(f"Error deleting folder from S3: {e}")
-            raise Exception(f"Failed to delete S3 folder {prefix}: {str(e)}")
+        def _delete_folder_sync() -> int:
+            try:
+                # Cada página del listado trae como máximo 1000 claves (el límite de
+                # delete_objects), así que se borra página a página sin acumularlas
+                paginator = self.s3_client.get_paginator('list_objects_v2')
+                pages = paginator.paginate(Bucket=self.bucket_name, Prefix=prefix)
+                
+                deleted_count = 0
+                for page in pages:
+                    if 'Contents' not in page:
+                        continue
+                    response = self.s3_client.delete_objects(
+                        Bucket=self.bucket_name,
+                        Delete={'Objects': [{'Key': obj['Key']} for obj in page['Contents']]}
+                    )
+                    deleted_count += len(response.get('Deleted', []))
+                
+                return deleted_count
+                
+            except ClientError as e:
+                logger.error("Error deleting folder from S3: %s", e)
+                raise Exception(f"Failed to delete S3 folder {prefix}: {str(e)}")
+        
+        loop = asyncio.get_event_loop()
+        deleted_count = await loop.run_in_executor(self.executor, _delete_folder_sync)
+        
+        if deleted_count:
+            self._forget_presigned_urls(lambda cached_key: cached_key.startswith(prefix))
+            logger.info("Deleted %s files with prefix: %s", deleted_count, prefix)
+        return deleted_count
+    
+    def _forget_presigned_urls(self, matches) -> None:
+        """Descarta de la caché las URLs de archivos eliminados"""
+        for cache_key in [k for k in self._presigned_urls if matches(k[0])]:
+            del self._presigned_urls[cache_key]
     
     async def file_exists(self, key: str) -> bool:
         """Verifica si existe un archivo"""
@@ -211,7 +250,13 @@ class S3FileStorage(FileStorage):
             return None
     
     async def generate_presigned_url(self, key: str, expiration: int = 3600) -> str:
-        """Genera una URL temporal"""
+        """Genera una URL temporal, reutilizando la última si aún no está por expirar"""
+        cache_key = (key, expiration)
+        cached = self._presigned_urls.get(cache_key)
+        if cached and cached[1] - time.monotonic() >= self.PRESIGNED_URL_MIN_REMAINING:
+            self._presigned_urls.move_to_end(cache_key)
+            return cached[0]
+        
         def _generate_sync():
             try:
                 url = self.s3_client.generate_presigned_url(
@@ -221,7 +266,41 @@ class S3FileStorage(FileStorage):
                 )
                 return url
             except ClientError as e:
-                logger.error(f"Error generating presigned URL: {e}")
+                logger.error("Error generating presigned URL: %s", e)
+                raise
+
+        loop = asyncio.get_event_loop()
+        issued_at = time.monotonic()
+        url = await loop.run_in_executor(self.executor, _generate_sync)
+        
+        self._presigned_urls[cache_key] = (url, issued_at + expiration)
+        self._presigned_urls.move_to_end(cache_key)
+        if len(self._presigned_urls) > self.PRESIGNED_URL_CACHE_SIZE:
+            self._presigned_urls.popitem(last=False)
+        return url
+    
+    async def generate_presigned_post(
+        self,
+        key: str,
+        content_type: str,
+        max_size: int,
+        expiration: int = 900
+    ) -> Dict[str, Any]:
+        """Genera un POST presignado para subir directamente a S3"""
+        def _generate_sync():
+            try:
+                return self.s3_client.generate_presigned_post(
+                    Bucket=self.bucket_name,
+                    Key=key,
+                    Fields={'Content-Type': content_type},
+                    Conditions=[
+                        {'Content-Type': content_type},
+                        ['content-length-range', 1, max_size]
+                    ],
+                    ExpiresIn=expiration
+                )
+            except ClientError as e:
+                logger.error("Error generating presigned POST: %s", e)
                 raise
 
         loop = asyncio.get_event_loop()
@@ -251,7 +330,7 @@ class S3FileStorage(FileStorage):
             return files
             
         except ClientError as e:
-            logger.error(f"Error listing files from S3: {e}")
+            logger.error("Error listing files from S3: %s", e)
             return []
     
     async def create_folder(self, folder_key: str) -> bool:
@@ -274,11 +353,11 @@ class S3FileStorage(FileStorage):
                     ContentType='application/x-directory'
                 )
                 
-                logger.info(f"Created folder in S3: {final_key}")
+                logger.info("Created folder in S3: %s", final_key)
                 return True
                 
             except ClientError as e:
-                logger.error(f"Error creating folder in S3: {e}")
+                logger.error("Error creating folder in S3: %s", e)
                 return False
 
         loop = asyncio.get_event_loop()
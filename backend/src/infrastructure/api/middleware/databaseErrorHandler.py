@@ -30,7 +30,7 @@ class DatabaseErrorMiddleware(BaseHTTPMiddleware):
                 "failed to connect to mongodb",
                 "cannot initialize database connection"
             ]):
-                logger.error(f"Database connection error intercepted: {exc}")
+                logger.error("Database connection error intercepted: %s", exc)
                 
                 return JSONResponse(
                     status_code=503,  # Service Unavailable
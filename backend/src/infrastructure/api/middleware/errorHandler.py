@@ -1,4 +1,4 @@
-from fastapi import Request, status
+from fastapi import FastAPI, Request, Response, status
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException
@@ -12,11 +12,77 @@ from src.domain.exceptions.domainExceptions import (
     StorageException
 )
 from datetime import datetime
+import json
 import logging
+import re
+import time
 import traceback
 
 logger = logging.getLogger(__name__)
 
+# Marcadores de los campos variables en las respuestas precalculadas
+_PLACEHOLDER_RE = re.compile(rb"__(MSG|TS|PATH)__")
+
+def _build_error_template(error_type: str, status_code: int, details: dict, message: str = "__MSG__") -> bytes:
+    """Serializa una sola vez el cuerpo de un error dejando marcadores para los campos variables"""
+    content = {
+        "success": False,
+        "error": {
+            "type": error_type,
+            "message": message,
+            "timestamp": "__TS__",
+            "status_code": status_code,
+            "details": details,
+            "path": "__PATH__"
+        }
+    }
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+def _safe_json_bytes(value: str) -> bytes:
+    """Escapa un string para insertarlo dentro de un literal JSON ya serializado"""
+    return json.dumps(value, ensure_ascii=False)[1:-1].encode("utf-8")
+
+def _render_error_template(template: bytes, status_code: int, path: str, message: str = "") -> Response:
+    """Completa una plantilla precalculada sin volver a construir ni serializar el diccionario"""
+    values = {
+        b"MSG": _safe_json_bytes(message),
+        b"TS": _safe_json_bytes(datetime.now().isoformat()),
+        b"PATH": _safe_json_bytes(path)
+    }
+    body = _PLACEHOLDER_RE.sub(lambda match: values[match.group(1)], template)
+    return Response(content=body, status_code=status_code, media_type="application/json")
+
+# Errores frecuentes con contenido fijo salvo mensaje, timestamp y path
+_AGENT_NOT_FOUND_TEMPLATE = _build_error_template(
+    error_type="AGENT_NOT_FOUND",
+    status_code=status.HTTP_404_NOT_FOUND,
+    details={"resource": "agent", "action": "Verifica el ID del agente"}
+)
+_METHOD_NOT_ALLOWED_TEMPLATE = _build_error_template(
+    error_type="HTTP_ERROR",
+    status_code=status.HTTP_405_METHOD_NOT_ALLOWED,
+    details={"action": "Verifica el método HTTP utilizado"},
+    message="Método no permitido para este endpoint"
+)
+
+# Último instante (monotónico) en que se registró el traceback de cada tipo de excepción
+_TRACEBACK_INTERVAL_SECONDS = 10.0
+_last_traceback_at: dict[type, float] = {}
+
+def _should_log_traceback(exc_type: type) -> bool:
+    """Limita el traceback completo a uno por tipo de excepción cada intervalo"""
+    now = time.monotonic()
+    if now - _last_traceback_at.get(exc_type, float("-inf")) < _TRACEBACK_INTERVAL_SECONDS:
+        return False
+    _last_traceback_at[exc_type] = now
+    return True
+
+# Mensajes amigables (mensaje, acción) para códigos HTTP comunes
+_HTTP_MESSAGES = {
+    404: ("El recurso solicitado no se encontró", "Verifica la URL e inténtalo de nuevo"),
+    500: ("Error interno del servidor", "Inténtalo de nuevo en unos minutos")
+}
+
 def create_error_response(error_type: str, message: str, status_code: int, details: dict = None, path: str = None):
     """Crea una respuesta de error estandarizada con formato consistente"""
     error_content = {
@@ -49,18 +115,17 @@ async def domain_exception_handler(request: Request, exc: DomainException):
     """
     
     error_type = exc.__class__.__name__
-    path = str(request.url)
+    path = request.url.path
     
-    logger.error(f"Domain exception: {error_type} - {str(exc)}")
+    logger.error("Domain exception: %s - %s", error_type, exc)
     
     # Mapeo específico de excepciones con mensajes claros
     if isinstance(exc, AgentNotFoundException):
-        return create_error_response(
-            error_type="AGENT_NOT_FOUND",
-            message=f"El agente solicitado no existe: {str(exc)}",
+        return _render_error_template(
+            _AGENT_NOT_FOUND_TEMPLATE,
             status_code=status.HTTP_404_NOT_FOUND,
-            details={"resource": "agent", "action": "Verifica el ID del agente"},
-            path=path
+            path=path,
+            message=f"El agente solicitado no existe: {str(exc)}"
         )
     
     elif isinstance(exc, DocumentNotFoundException):
@@ -113,7 +178,7 @@ async def domain_exception_handler(request: Request, exc: DomainException):
         )
     
     # Excepción genérica del dominio
-    logger.warning(f"Unhandled domain exception: {error_type}")
+    logger.warning("Unhandled domain exception: %s", error_type)
     return create_error_response(
         error_type="DOMAIN_ERROR",
         message=f"Error de dominio: {str(exc)}",
@@ -124,6 +189,7 @@ async def domain_exception_handler(request: Request, exc: DomainException):
 
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
     """Manejador mejorado de errores de validación"""
+    path = request.url.path
     errors = []
     for error in exc.errors():
         field = ".".join(str(loc) for loc in error["loc"][1:]) if len(error["loc"]) > 1 else "body"
@@ -134,7 +200,7 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
             "input": error.get("input", "N/A")
         })
     
-    logger.warning(f"Validation error on {request.url}: {errors}")
+    logger.warning("Validation error on %s: %s", path, errors)
     
     return create_error_response(
         error_type="VALIDATION_ERROR",
@@ -144,42 +210,42 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
             "errors": errors,
             "action": "Corrige los campos indicados y vuelve a intentar"
         },
-        path=str(request.url)
+        path=path
     )
 
 async def http_exception_handler(request: Request, exc: HTTPException):
     """Manejador mejorado de excepciones HTTP"""
-    logger.warning(f"HTTP exception on {request.url}: {exc.status_code} - {exc.detail}")
+    path = request.url.path
+    logger.warning("HTTP exception on %s: %s - %s", path, exc.status_code, exc.detail)
+    
+    if exc.status_code == 405:
+        return _render_error_template(
+            _METHOD_NOT_ALLOWED_TEMPLATE,
+            status_code=status.HTTP_405_METHOD_NOT_ALLOWED,
+            path=path
+        )
     
     # Mensajes más amigables para códigos comunes
-    user_message = exc.detail
-    action = "Inténtalo de nuevo"
-    
-    if exc.status_code == 404:
-        user_message = "El recurso solicitado no se encontró"
-        action = "Verifica la URL e inténtalo de nuevo"
-    elif exc.status_code == 405:
-        user_message = "Método no permitido para este endpoint"
-        action = "Verifica el método HTTP utilizado"
-    elif exc.status_code == 500:
-        user_message = "Error interno del servidor"
-        action = "Inténtalo de nuevo en unos minutos"
+    user_message, action = _HTTP_MESSAGES.get(exc.status_code, (exc.detail, "Inténtalo de nuevo"))
     
     return create_error_response(
         error_type="HTTP_ERROR",
         message=user_message,
         status_code=exc.status_code,
         details={"action": action},
-        path=str(request.url)
+        path=path
     )
 
 async def generic_exception_handler(request: Request, exc: Exception):
     """Manejador para excepciones no capturadas"""
-    logger.error(f"Unhandled exception on {request.url}: {exc.__class__.__name__} - {str(exc)}")
-    logger.error(f"Traceback: {traceback.format_exc()}")
+    path = request.url.path
+    error_text = str(exc)
+    logger.error("Unhandled exception on %s: %s - %s", path, exc.__class__.__name__, error_text)
+    if logger.isEnabledFor(logging.ERROR) and _should_log_traceback(type(exc)):
+        logger.error("Traceback: %s", traceback.format_exc())
     
     # Manejo específico de errores SSL
-    if "SSL" in str(exc) or "EOF occurred in violation of protocol" in str(exc):
+    if "SSL" in error_text or "EOF occurred in violation of protocol" in error_text:
         return create_error_response(
             error_type="SSL_CONNECTION_ERROR",
             message="Error de conexión SSL con el servicio de almacenamiento",
@@ -188,20 +254,20 @@ async def generic_exception_handler(request: Request, exc: Exception):
                 "error": "Problema de conectividad con AWS S3",
                 "action": "Inténtalo de nuevo en unos minutos. Si persiste, contacta al administrador."
             },
-            path=str(request.url)
+            path=path
         )
     
     # Manejo específico de errores de carga de archivos
-    if "upload" in str(request.url).lower():
+    if "upload" in path.lower():
         return create_error_response(
             error_type="UPLOAD_ERROR",
             message="Error durante la subida del archivo",
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             details={
-                "error": str(exc) if len(str(exc)) < 200 else "Error interno del servidor durante la subida",
+                "error": error_text if len(error_text) < 200 else "Error interno del servidor durante la subida",
                 "action": "Verifica el archivo y vuelve a intentar. Si persiste, usa un archivo diferente."
             },
-            path=str(request.url)
+            path=path
         )
     
     return create_error_response(
@@ -209,5 +275,18 @@ async def generic_exception_handler(request: Request, exc: Exception):
         message="Ha ocurrido un error interno. Nuestro equipo ha sido notificado.",
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         details={"action": "Inténtalo de nuevo en unos minutos"},
-        path=str(request.url)
-    )
\ No newline at end of file
+        path=path
+    )
+
+# Orden importante: más específico a más genérico
+EXCEPTION_HANDLERS = (
+    (DomainException, domain_exception_handler),
+    (RequestValidationError, validation_exception_handler),
+    (HTTPException, http_exception_handler),
+    (Exception, generic_exception_handler)
+)
+
+def register_exception_handlers(app: FastAPI) -> None:
+    """Registra todos los exception handlers de la API en la aplicación"""
+    for exc_class, handler in EXCEPTION_HANDLERS:
+        app.add_exception_handler(exc_class, handler)
\ No newline at end of file
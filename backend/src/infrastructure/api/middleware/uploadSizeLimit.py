@@ -0,0 +1,60 @@
+"""
+Middleware que rechaza subidas demasiado grandes antes de leer el cuerpo
+"""
+import logging
+from fastapi import status
+from starlette.types import ASGIApp, Receive, Scope, Send
+from src.infrastructure.api.middleware.errorHandler import create_error_response
+
+logger = logging.getLogger(__name__)
+
+# Margen para los límites multipart y los campos de formulario que acompañan al archivo
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+class UploadSizeLimitMiddleware:
+    """
+    Devuelve 413 cuando el Content-Length declarado supera el máximo permitido
+
+    FastAPI parsea el formulario multipart antes de ejecutar el endpoint, así que
+    la comprobación de tamaño del router llega con el archivo ya recibido. Aquí se
+    decide solo con el header, sin leer ni un byte del cuerpo. Las peticiones sin
+    Content-Length (chunked) siguen validándose en el router
+    """
+
+    def __init__(self, app: ASGIApp, upload_path: str, max_size_bytes: int):
+        self.app = app
+        self.upload_path = upload_path
+        self.max_size_bytes = max_size_bytes
+        self.max_content_length = max_size_bytes + MULTIPART_OVERHEAD_BYTES
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] != "POST" or scope["path"] != self.upload_path:
+            await self.app(scope, receive, send)
+            return
+
+        content_length = self._content_length(scope)
+        if content_length is not None and content_length > self.max_content_length:
+            logger.warning("Upload rejected by Content-Length: %d bytes", content_length)
+            response = create_error_response(
+                error_type="FILE_SIZE_EXCEEDED",
+                message="El archivo excede el tamaño máximo permitido",
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                details={
+                    "resource": "file",
+                    "max_size_mb": self.max_size_bytes // (1024 * 1024),
+                    "action": "Reduce el tamaño del archivo"
+                },
+                path=scope["path"]
+            )
+            await response(scope, receive, send)
+            return
+
+        await self.app(scope, receive, send)
+
+    @staticmethod
+    def _content_length(scope: Scope):
+        """Content-Length declarado, o None si falta o no es un entero"""
+        for name, value in scope["headers"]:
+            if name == b"content-length":
+                return int(value) if value.isdigit() else None
+        return None
@@ -1,12 +1,13 @@
-from fastapi import APIRouter, Depends, status, Query
+from fastapi import APIRouter, Depends, Response, status, Query
 from typing import List, Optional
-from pydantic import BaseModel, Field
+from pydantic import ConfigDict, Field
 from src.application.commands.createAgent import CreateAgentCommand
 from src.application.commands.updateAgent import UpdateAgentCommand
 from src.application.commands.deleteAgent import DeleteAgentCommand
 from src.application.queries.listAgents import ListAgentsQuery
 from src.application.queries.getAgentDetail import GetAgentDetailQuery
 from src.application.dto.agentDto import CreateAgentDTO, UpdateAgentDTO
+from src.infrastructure.api.schemas.baseSchema import FastModel
 from src.infrastructure.api.dependencies import (
     get_create_agent_command,
     get_update_agent_command,
@@ -18,19 +19,20 @@ from src.infrastructure.api.dependencies import (
 router = APIRouter(prefix="/agents", tags=["agents"])
 
 # Modelos Pydantic para requests/responses
-class CreateAgentRequest(BaseModel):
+class CreateAgentRequest(FastModel):
     name: str = Field(..., min_length=3, max_length=100, description="Agent name")
     prompt: str = Field(..., min_length=10, max_length=5000, description="Agent prompt")
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "name": "Customer Support Agent",
                 "prompt": "You are a helpful customer support agent..."
             }
         }
+    )
 
-class UpdateAgentRequest(BaseModel):
+class UpdateAgentRequest(FastModel):
     name: Optional[str] = Field(None, min_length=3, max_length=100)
     prompt: Optional[str] = Field(None, min_length=10, max_length=5000)
 
@@ -112,6 +114,7 @@ async def update_agent(
 @router.delete(
     "/{agent_id}",
     status_code=status.HTTP_204_NO_CONTENT,
+    response_class=Response,
     summary="Delete an agent",
     description="Deletes an agent and all its associated documents"
 )
@@ -126,4 +129,4 @@ async def delete_agent(
     from both the database and S3 storage.
     """
     await command.execute(agent_id)
-    return None
\ No newline at end of file
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
\ No newline at end of file
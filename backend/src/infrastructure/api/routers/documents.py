@@ -1,29 +1,92 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form, Query
-from fastapi.responses import StreamingResponse, RedirectResponse
-from typing import Optional, List
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, UploadFile, File, Form, Query
+from fastapi.responses import StreamingResponse, RedirectResponse, ORJSONResponse
+from pydantic import Field
+from typing import Optional, List, FrozenSet
 import os
+import hashlib
 import logging
 from src.application.commands.uploadDocument import UploadDocumentCommand
 from src.application.commands.deleteDocument import DeleteDocumentCommand
 from src.application.queries.getDocument import GetDocumentQuery
 from src.application.queries.listDocuments import ListDocumentsQuery
-from src.application.dto.documentDto import UploadDocumentDTO
+from src.application.dto.documentDto import UploadDocumentDTO, RegisterDocumentDTO, DocumentResponseDTO
 from src.domain.value_objects.documentType import DocumentType
-from src.domain.exceptions.domainExceptions import InvalidFileTypeException, DocumentNotFoundException, AgentNotFoundException
+from src.domain.exceptions.domainExceptions import (
+    InvalidFileTypeException,
+    DocumentNotFoundException,
+    AgentNotFoundException,
+    FileNotFoundException,
+    FileSizeExceededException
+)
 from src.infrastructure.api.dependencies import (
     get_upload_document_command,
     get_delete_document_command,
     get_document_query,
     get_list_documents_query
 )
-from src.infrastructure.config.container import get_container
-from src.infrastructure.config.settings import get_settings
+from src.infrastructure.config.container import CONTAINER
+from src.infrastructure.api.schemas.baseSchema import FastModel
+from src.infrastructure.config.settings import RUNTIME_SETTINGS
 from src.shared.utils.validators import FileValidator, DocumentValidator
 from src.shared.utils.formatter import ResponseFormatter, FileFormatter
 
 router = APIRouter(prefix="/documents", tags=["documents"])
 logger = logging.getLogger(__name__)
-settings = get_settings()
+
+# Valores de configuración usados en cada subida, leídos una sola vez
+_MAX_FILE_SIZE_MB: int = RUNTIME_SETTINGS.max_file_size_mb
+_ALLOWED_EXTENSIONS: FrozenSet[str] = RUNTIME_SETTINGS.allowed_extensions
+_ALLOWED_EXTENSIONS_SORTED: List[str] = sorted(_ALLOWED_EXTENSIONS)
+
+# Los documentos no se modifican tras crearse: su información puede cachearse en el cliente
+_DOCUMENT_CACHE_CONTROL = "private, max-age=60"
+
+# URLs de descarga válidas 1 hora; el storage reutiliza una URL mientras le queden
+# al menos 10 minutos, así que ese es el tiempo de vida garantizado al cliente
+_DOWNLOAD_URL_EXPIRATION = 3600
+_DOWNLOAD_URL_MIN_VALIDITY = 600
+_DOWNLOAD_CACHE_CONTROL = f"private, max-age={_DOWNLOAD_URL_MIN_VALIDITY - 60}"
+
+def _document_etag(document) -> str:
+    """ETag fuerte de la información de un documento"""
+    fingerprint = f"{document.id}:{document.created_at.isoformat()}:{document.s3_key}:{document.file_size}"
+    return '"' + hashlib.blake2b(fingerprint.encode(), digest_size=16).hexdigest() + '"'
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Compara el header If-None-Match con el ETag actual"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+def _list_item(document: DocumentResponseDTO) -> dict:
+    """Documento del listado como dict plano, con el tamaño ya formateado para orjson"""
+    return {
+        "id": document.id,
+        "agent_id": document.agent_id,
+        "filename": document.filename,
+        "document_type": document.document_type,
+        "file_url": document.file_url,
+        "s3_key": document.s3_key,
+        "file_size": document.file_size,
+        "file_size_mb": document.file_size_mb,
+        "size_formatted": FileFormatter.format_file_size(document.file_size),
+        "created_at": document.created_at
+    }
+
+# Modelos Pydantic para la subida directa a S3
+class UploadUrlRequest(FastModel):
+    agent_id: str = Field(..., description="ID of the agent")
+    filename: str = Field(..., min_length=1, max_length=255, description="Name of the file to upload")
+    content_type: str = Field(..., min_length=1, description="MIME type of the file")
+    file_size: int = Field(..., gt=0, description="Size of the file in bytes")
+
+class RegisterDocumentRequest(FastModel):
+    agent_id: str = Field(..., description="ID of the agent")
+    filename: str = Field(..., min_length=1, max_length=255, description="Name of the uploaded file")
+    s3_key: str = Field(..., min_length=1, description="S3 key returned by /documents/upload-url")
+    content_type: str = Field(..., min_length=1, description="MIME type of the file")
 
 @router.post(
     "/upload",
@@ -49,120 +112,219 @@ async def upload_document(
     3. Saves metadata to MongoDB
     4. Returns document information with URLs
     """
-    try:
-        logger.info(f"Starting document upload for agent {agent_id}: {file.filename}")
-        
-        # 1. Validar Agent ID
-        is_valid, error_msg = DocumentValidator.validate_agent_id(agent_id)
-        if not is_valid:
-            logger.warning(f"Invalid agent ID: {error_msg}")
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=ResponseFormatter.error_response(
-                    error_message=error_msg,
-                    error_code="INVALID_AGENT_ID"
-                )
+    logger.info("Starting document upload for agent %s: %s", agent_id, file.filename)
+    
+    # 1. Validar Agent ID
+    is_valid, error_msg = DocumentValidator.validate_agent_id(agent_id)
+    if not is_valid:
+        logger.warning("Invalid agent ID: %s", error_msg)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=ResponseFormatter.error_response(
+                error_message=error_msg,
+                error_code="INVALID_AGENT_ID"
             )
-        
-        # 2. Validar archivo
-        is_valid, file_type, error_msg = FileValidator.validate_file(
-            file=file,
-            max_size_mb=settings.max_file_size_mb,
-            allowed_extensions=settings.allowed_extensions
         )
-        
-        if not is_valid:
-            logger.warning(f"File validation failed: {error_msg}")
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=ResponseFormatter.error_response(
-                    error_message=error_msg,
-                    error_code="INVALID_FILE",
-                    details={
-                        "filename": file.filename,
-                        "content_type": file.content_type,
-                        "max_size_mb": settings.max_file_size_mb,
-                        "allowed_extensions": settings.allowed_extensions
-                    }
-                )
+    
+    # 2. Validar archivo
+    is_valid, file_type, error_msg = FileValidator.validate_file(
+        file=file,
+        max_size_mb=_MAX_FILE_SIZE_MB,
+        allowed_extensions=_ALLOWED_EXTENSIONS
+    )
+    
+    if not is_valid:
+        logger.warning("File validation failed: %s", error_msg)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=ResponseFormatter.error_response(
+                error_message=error_msg,
+                error_code="INVALID_FILE",
+                details={
+                    "filename": file.filename,
+                    "content_type": file.content_type,
+                    "max_size_mb": _MAX_FILE_SIZE_MB,
+                    "allowed_extensions": _ALLOWED_EXTENSIONS_SORTED
+                }
             )
-        
-        # 3. Leer contenido del archivo para validaciones adicionales
-        file_content = await file.read()
-        file_size = len(file_content)
-        
-        # Validar contenido si es posible
-        content_valid, content_error = FileValidator.validate_file_content(file_content, file.filename)
-        if not content_valid:
-            logger.warning(f"File content validation failed: {content_error}")
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=ResponseFormatter.error_response(
-                    error_message=content_error,
-                    error_code="INVALID_FILE_CONTENT"
-                )
+        )
+    
+    # 3. Validar contenido con la cabecera (los magic bytes están al inicio) y, en
+    # formatos Office, con el directorio central del ZIP. Se lee directamente del
+    # archivo temporal del parser: lecturas pequeñas que no justifican el salto
+    # al threadpool de UploadFile.read
+    spooled = file.file
+    spooled.seek(0)
+    header = spooled.read(FileValidator.CONTENT_SNIFF_SIZE)
+    content_valid, content_error = FileValidator.validate_file_content(header, file.filename, file_type, spooled)
+    if not content_valid:
+        logger.warning("File content validation failed: %s", content_error)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=ResponseFormatter.error_response(
+                error_message=content_error,
+                error_code="INVALID_FILE_CONTENT"
             )
-        
-        # 4. Resetear el archivo para lectura en el comando
-        await file.seek(0)
-        
-        # 5. Preparar metadata adicional
-        metadata = {
-            "description": description or "",
-            "original_size": file_size,
-            "content_type": file.content_type or "application/octet-stream"
-        }
-        
-        # Validar metadata
-        metadata_valid, metadata_error = DocumentValidator.validate_document_metadata(metadata)
-        if not metadata_valid:
-            logger.warning(f"Metadata validation failed: {metadata_error}")
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=ResponseFormatter.error_response(
-                    error_message=metadata_error,
-                    error_code="INVALID_METADATA"
-                )
+        )
+    
+    # El parser multipart ya contó los bytes al recibir el archivo; si no lo
+    # informó, el tamaño sale de la posición final sin leer el contenido
+    file_size = file.size
+    if file_size is None:
+        file_size = spooled.seek(0, os.SEEK_END)
+    
+    # 4. Volver al inicio para que el comando envíe el archivo a S3 por partes
+    spooled.seek(0)
+    
+    # 5. Preparar metadata adicional
+    metadata = {
+        "description": description or "",
+        "original_size": file_size,
+        "content_type": file.content_type or "application/octet-stream"
+    }
+    
+    # Validar metadata
+    metadata_valid, metadata_error = DocumentValidator.validate_document_metadata(metadata)
+    if not metadata_valid:
+        logger.warning("Metadata validation failed: %s", metadata_error)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=ResponseFormatter.error_response(
+                error_message=metadata_error,
+                error_code="INVALID_METADATA"
             )
-        
-        # 6. Crear DTO para el comando
-        dto = UploadDocumentDTO(
-            agent_id=agent_id,
-            filename=file.filename,
-            file=file.file,
-            content_type=file.content_type or "application/octet-stream",
-            file_size=file_size,
-            metadata=metadata
         )
-        
-        # 7. Ejecutar comando de upload
-        logger.info(f"Executing upload command for {file.filename}")
+    
+    # 6. Crear DTO para el comando
+    dto = UploadDocumentDTO(
+        agent_id=agent_id,
+        filename=file.filename,
+        file=file.file,
+        content_type=file.content_type or "application/octet-stream",
+        file_size=file_size,
+        metadata=metadata
+    )
+    
+    # 7. Ejecutar comando de upload (solo aquí pueden surgir errores de dominio o de infraestructura)
+    logger.info("Executing upload command for %s", file.filename)
+    try:
         result = await command.execute(dto)
-        
-        # 8. Formatear respuesta exitosa
-        file_info = FileFormatter.extract_file_info(
-            filename=file.filename,
-            file_size=file_size,
-            content_type=file.content_type or "application/octet-stream"
+    except AgentNotFoundException as e:
+        logger.warning("Agent not found: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=ResponseFormatter.error_response(
+                error_message=str(e),
+                error_code="AGENT_NOT_FOUND"
+            )
+        )
+    except InvalidFileTypeException as e:
+        logger.warning("Invalid file type: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=ResponseFormatter.error_response(
+                error_message=str(e),
+                error_code="INVALID_FILE_TYPE"
+            )
+        )
+    except Exception as e:
+        logger.exception("Unexpected error during upload: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=ResponseFormatter.error_response(
+                error_message="Error interno del servidor durante la subida",
+                error_code="UPLOAD_ERROR",
+                details={"error": str(e)}
+            )
+        )
+    
+    # 8. Formatear respuesta exitosa
+    file_info = FileFormatter.extract_file_info(
+        filename=file.filename,
+        file_size=file_size,
+        content_type=file.content_type or "application/octet-stream",
+        extension=file_type
+    )
+    
+    response_data = {
+        "document": result,
+        "file_info": file_info,
+        "upload_status": "completed"
+    }
+    
+    logger.info("Document uploaded successfully: %s", result.id)
+    return ResponseFormatter.success_response(
+        data=response_data,
+        message=f"Documento '{file.filename}' subido exitosamente"
+    )
+
+@router.post(
+    "/upload-url",
+    status_code=status.HTTP_201_CREATED,
+    summary="Create a direct upload URL",
+    description="Generate a presigned S3 POST so the client uploads the file directly to storage"
+)
+async def create_upload_url(
+    request: UploadUrlRequest,
+    command: UploadDocumentCommand = Depends(get_upload_document_command)
+):
+    """
+    Create a presigned POST to upload a document directly to S3.
+    
+    **Process:**
+    1. Validates agent ID, file type and declared size
+    2. Returns the S3 URL and form fields to send with the file
+    3. After the upload, the client calls `/documents/register` with the returned `s3_key`
+    """
+    logger.info("Creating upload URL for agent %s: %s", request.agent_id, request.filename)
+    
+    is_valid, error_msg = DocumentValidator.validate_agent_id(request.agent_id)
+    if not is_valid:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=ResponseFormatter.error_response(
+                error_message=error_msg,
+                error_code="INVALID_AGENT_ID"
+            )
+        )
+    
+    is_valid, _, error_msg = FileValidator.validate_file_info(
+        filename=request.filename,
+        content_type=request.content_type,
+        size=request.file_size,
+        max_size_mb=_MAX_FILE_SIZE_MB,
+        allowed_extensions=_ALLOWED_EXTENSIONS
+    )
+    if not is_valid:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=ResponseFormatter.error_response(
+                error_message=error_msg,
+                error_code="INVALID_FILE",
+                details={
+                    "filename": request.filename,
+                    "content_type": request.content_type,
+                    "max_size_mb": _MAX_FILE_SIZE_MB,
+                    "allowed_extensions": _ALLOWED_EXTENSIONS_SORTED
+                }
+            )
+        )
+    
+    try:
+        result = await command.create_upload_url(
+            agent_id=request.agent_id,
+            filename=request.filename,
+            content_type=request.content_type,
+            max_size=RUNTIME_SETTINGS.max_file_size_bytes
         )
         
-        response_data = {
-            "document": result,
-            "file_info": file_info,
-            "upload_status": "completed"
-        }
-        
-        logger.info(f"Document uploaded successfully: {result.id}")
         return ResponseFormatter.success_response(
-            data=response_data,
-            message=f"Documento '{file.filename}' subido exitosamente"
+            data={"upload": result},
+            message="URL de subida generada exitosamente"
         )
         
-    except HTTPException:
-        # Re-raise HTTP exceptions
-        raise
     except AgentNotFoundException as e:
-        logger.error(f"Agent not found: {e}")
+        logger.warning("Agent not found: %s", e)
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=ResponseFormatter.error_response(
@@ -171,7 +333,7 @@ async def upload_document(
             )
         )
     except InvalidFileTypeException as e:
-        logger.error(f"Invalid file type: {e}")
+        logger.warning("Invalid file type: %s", e)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=ResponseFormatter.error_response(
@@ -180,19 +342,103 @@ async def upload_document(
             )
         )
     except Exception as e:
-        logger.error(f"Unexpected error during upload: {e}", exc_info=True)
+        logger.exception("Unexpected error creating upload URL: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=ResponseFormatter.error_response(
-                error_message="Error interno del servidor durante la subida",
-                error_code="UPLOAD_ERROR",
+                error_message="Error interno del servidor al generar la URL de subida",
+                error_code="UPLOAD_URL_ERROR",
+                details={"error": str(e)}
+            )
+        )
+
+@router.post(
+    "/register",
+    status_code=status.HTTP_201_CREATED,
+    summary="Register a directly uploaded document",
+    description="Save the metadata of a document uploaded with a presigned S3 POST"
+)
+async def register_document(
+    request: RegisterDocumentRequest,
+    command: UploadDocumentCommand = Depends(get_upload_document_command)
+):
+    """
+    Register a document uploaded directly to S3.
+    
+    The file size is read from the stored object, not from the client.
+    """
+    logger.info("Registering document for agent %s: %s", request.agent_id, request.filename)
+    
+    metadata_valid, metadata_error = DocumentValidator.validate_document_metadata(
+        {"content_type": request.content_type}
+    )
+    if not metadata_valid:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=ResponseFormatter.error_response(
+                error_message=metadata_error,
+                error_code="INVALID_METADATA"
+            )
+        )
+    
+    dto = RegisterDocumentDTO(
+        agent_id=request.agent_id,
+        filename=request.filename,
+        s3_key=request.s3_key,
+        content_type=request.content_type
+    )
+    
+    try:
+        result = await command.register(dto)
+        
+        logger.info("Document registered successfully: %s", result.id)
+        return ResponseFormatter.success_response(
+            data={"document": result, "upload_status": "completed"},
+            message=f"Documento '{request.filename}' registrado exitosamente"
+        )
+        
+    except AgentNotFoundException as e:
+        logger.warning("Agent not found: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=ResponseFormatter.error_response(
+                error_message=str(e),
+                error_code="AGENT_NOT_FOUND"
+            )
+        )
+    except FileNotFoundException as e:
+        logger.warning("Uploaded file not found: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=ResponseFormatter.error_response(
+                error_message=str(e),
+                error_code="FILE_NOT_FOUND"
+            )
+        )
+    except (InvalidFileTypeException, FileSizeExceededException) as e:
+        logger.warning("Invalid uploaded file: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=ResponseFormatter.error_response(
+                error_message=str(e),
+                error_code="INVALID_FILE"
+            )
+        )
+    except Exception as e:
+        logger.exception("Unexpected error registering document: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=ResponseFormatter.error_response(
+                error_message="Error interno del servidor al registrar el documento",
+                error_code="REGISTER_ERROR",
                 details={"error": str(e)}
             )
         )
 
 @router.delete(
     "/{document_id}",
-    status_code=status.HTTP_200_OK,
+    status_code=status.HTTP_204_NO_CONTENT,
+    response_class=Response,
     summary="Delete a document",
     description="Delete a specific document from storage and database"
 )
@@ -208,32 +454,15 @@ async def delete_document(
     2. Removes file from S3 storage
     3. Removes metadata from MongoDB
     
-    Returns confirmation of deletion.
+    Returns 204 No Content on success.
     """
+    logger.info("Starting document deletion: %s", document_id)
+    
     try:
-        logger.info(f"Starting document deletion: {document_id}")
-        
         # Ejecutar comando de eliminación
         success = await command.execute(document_id)
-        
-        if success:
-            logger.info(f"Document deleted successfully: {document_id}")
-            return ResponseFormatter.success_response(
-                data={"document_id": document_id, "deleted": True},
-                message="Documento eliminado exitosamente"
-            )
-        else:
-            logger.warning(f"Document deletion failed: {document_id}")
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=ResponseFormatter.error_response(
-                    error_message="No se pudo eliminar el documento",
-                    error_code="DELETION_FAILED"
-                )
-            )
-            
     except DocumentNotFoundException as e:
-        logger.error(f"Document not found: {e}")
+        logger.warning("Document not found: %s", e)
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=ResponseFormatter.error_response(
@@ -242,7 +471,7 @@ async def delete_document(
             )
         )
     except Exception as e:
-        logger.error(f"Unexpected error during deletion: {e}", exc_info=True)
+        logger.exception("Unexpected error during deletion: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=ResponseFormatter.error_response(
@@ -251,6 +480,19 @@ async def delete_document(
                 details={"error": str(e)}
             )
         )
+    
+    if not success:
+        logger.warning("Document deletion failed: %s", document_id)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=ResponseFormatter.error_response(
+                error_message="No se pudo eliminar el documento",
+                error_code="DELETION_FAILED"
+            )
+        )
+    
+    logger.info("Document deleted successfully: %s", document_id)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 @router.get(
     "/{document_id}",
@@ -259,26 +501,35 @@ async def delete_document(
 )
 async def get_document_info(
     document_id: str,
+    request: Request,
+    response: Response,
     query: GetDocumentQuery = Depends(get_document_query)
 ):
     """
     Get detailed information about a document.
     
     Returns document metadata, S3 URL, and other relevant information.
+    Responds 304 Not Modified when `If-None-Match` matches the current ETag.
     """
     try:
-        logger.info(f"Getting document info: {document_id}")
+        logger.info("Getting document info: %s", document_id)
         
         # Ejecutar query para obtener documento
         document = await query.execute(document_id)
         
+        etag = _document_etag(document)
+        cache_headers = {"ETag": etag, "Cache-Control": _DOCUMENT_CACHE_CONTROL}
+        if _etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers)
+        
+        response.headers.update(cache_headers)
         return ResponseFormatter.success_response(
             data={"document": document},
             message="Información del documento obtenida exitosamente"
         )
         
     except DocumentNotFoundException as e:
-        logger.error(f"Document not found: {e}")
+        logger.warning("Document not found: %s", e)
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=ResponseFormatter.error_response(
@@ -287,7 +538,7 @@ async def get_document_info(
             )
         )
     except Exception as e:
-        logger.error(f"Unexpected error getting document info: {e}", exc_info=True)
+        logger.exception("Unexpected error getting document info: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=ResponseFormatter.error_response(
@@ -304,6 +555,7 @@ async def get_document_info(
 )
 async def download_document(
     document_id: str,
+    redirect: bool = Query(True, description="Redirect to the file (true) or return the presigned URL as JSON (false)"),
     query: GetDocumentQuery = Depends(get_document_query)
 ):
     """
@@ -312,33 +564,50 @@ async def download_document(
     **Process:**
     1. Validates document exists
     2. Generates presigned URL for secure download
-    3. Redirects to download URL
+    3. Redirects to download URL, or returns it as JSON with `redirect=false`
     
-    Returns a redirect to the secure download URL.
+    With `redirect=false` the client fetches the file from S3 directly,
+    saving the extra redirect round-trip through the API.
     """
     try:
-        logger.info(f"Starting document download: {document_id}")
+        logger.info("Starting document download: %s", document_id)
         
         # Obtener información del documento
         document = await query.execute(document_id)
         
         # Obtener servicio de almacenamiento desde el container
-        container = get_container()
-        file_storage = container.file_storage
+        file_storage = CONTAINER.file_storage
         
         # Usar la clave S3 directamente del documento
         s3_key = document.s3_key
         
         # Generar URL presignada (válida por 1 hora)
-        presigned_url = await file_storage.generate_presigned_url(s3_key, expiration=3600)
+        presigned_url = await file_storage.generate_presigned_url(s3_key, expiration=_DOWNLOAD_URL_EXPIRATION)
         
-        logger.info(f"Generated presigned URL for document: {document_id}")
+        logger.info("Generated presigned URL for document: %s", document_id)
         
-        # Redirigir directamente a la URL de descarga
-        return RedirectResponse(url=presigned_url, status_code=307)
+        if not redirect:
+            return ORJSONResponse(
+                ResponseFormatter.success_response(
+                    data={
+                        "url": presigned_url,
+                        "expires_in": _DOWNLOAD_URL_MIN_VALIDITY,
+                        "s3_key": s3_key
+                    },
+                    message="URL de descarga generada exitosamente"
+                ),
+                headers={"Cache-Control": _DOWNLOAD_CACHE_CONTROL}
+            )
+        
+        # Redirigir directamente a la URL de descarga; el cliente puede reutilizarla mientras sea válida
+        return RedirectResponse(
+            url=presigned_url,
+            status_code=307,
+            headers={"Cache-Control": _DOWNLOAD_CACHE_CONTROL}
+        )
         
     except DocumentNotFoundException as e:
-        logger.error(f"Document not found for download: {e}")
+        logger.warning("Document not found for download: %s", e)
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=ResponseFormatter.error_response(
@@ -347,7 +616,7 @@ async def download_document(
             )
         )
     except Exception as e:
-        logger.error(f"Unexpected error during download: {e}", exc_info=True)
+        logger.exception("Unexpected error during download: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=ResponseFormatter.error_response(
@@ -360,13 +629,15 @@ async def download_document(
 @router.get(
     "/",
     summary="List documents",
-    description="List all documents with optional filtering"
+    description="List all documents with optional filtering",
+    response_class=ORJSONResponse
 )
 async def list_documents(
     agent_id: Optional[str] = Query(None, description="Filter by specific agent"),
     skip: int = Query(0, ge=0, description="Number of documents to skip"),
     limit: int = Query(20, ge=1, le=100, description="Maximum number of documents to return"),
     search: Optional[str] = Query(None, description="Search term for filename"),
+    after: Optional[str] = Query(None, description="Cursor (next_cursor) returned by the previous page"),
     query: ListDocumentsQuery = Depends(get_list_documents_query)
 ):
     """
@@ -377,25 +648,38 @@ async def list_documents(
     - skip: Number of documents to skip (pagination)
     - limit: Maximum number of documents to return
     - search: Search term for filename (optional)
+    - after: Cursor from `pagination.next_cursor`; takes precedence over skip (optional)
     """
     try:
-        logger.info(f"Listing documents: agent_id={agent_id}, skip={skip}, limit={limit}, search={search}")
+        logger.info("Listing documents: agent_id=%s, skip=%s, limit=%s, search=%s, after=%s", agent_id, skip, limit, search, after)
         
         # Ejecutar query para listar documentos
         result = await query.execute(
             agent_id=agent_id,
             skip=skip,
             limit=limit,
-            search=search
+            search=search,
+            after=after
         )
         
-        return ResponseFormatter.success_response(
+        # Dicts planos serializados directamente por orjson, sin pasar por jsonable_encoder
+        result["documents"] = [_list_item(document) for document in result["documents"]]
+        return ORJSONResponse(ResponseFormatter.success_response(
             data=result,
             message="Lista de documentos obtenida exitosamente"
-        )
+        ))
         
+    except ValueError as e:
+        logger.warning("Invalid listing parameters: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=ResponseFormatter.error_response(
+                error_message=str(e),
+                error_code="INVALID_CURSOR"
+            )
+        )
     except AgentNotFoundException as e:
-        logger.error(f"Agent not found: {e}")
+        logger.warning("Agent not found: %s", e)
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=ResponseFormatter.error_response(
@@ -404,7 +688,7 @@ async def list_documents(
             )
         )
     except Exception as e:
-        logger.error(f"Unexpected error listing documents: {e}", exc_info=True)
+        logger.exception("Unexpected error listing documents: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=ResponseFormatter.error_response(
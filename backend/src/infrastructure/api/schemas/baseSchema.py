@@ -0,0 +1,10 @@
+from pydantic import BaseModel, ConfigDict
+
+class FastModel(BaseModel):
+    """
+    Modelo base para los requests de la API
+
+    Solo centraliza model_config: conserva el comportamiento por defecto de
+    pydantic (campos desconocidos ignorados, strings sin recortar)
+    """
+    model_config = ConfigDict(populate_by_name=True)
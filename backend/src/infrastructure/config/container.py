@@ -1,7 +1,8 @@
 """
 Contenedor de inyección de dependencias usando el patrón Dependency Injection
 """
-from functools import lru_cache
+import asyncio
+import logging
 from typing import Optional
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
@@ -24,6 +25,9 @@ from src.application.queries.listAgents import ListAgentsQuery
 from src.application.queries.getAgentDetail import GetAgentDetailQuery
 from src.application.queries.getDocument import GetDocumentQuery
 from src.application.queries.listDocuments import ListDocumentsQuery
+from src.domain.exceptions.domainExceptions import StorageException
+
+logger = logging.getLogger(__name__)
 
 
 class Container:
@@ -35,6 +39,23 @@ class Container:
         self._agent_repository: Optional[AgentRepository] = None
         self._document_repository: Optional[DocumentRepository] = None
         self._file_storage: Optional[FileStorage] = None
+        self._initialized = False
+        # Evita que varias requests concurrentes repitan la inicialización a la vez
+        self._init_lock = asyncio.Lock()
+        
+        # Handlers que solo necesitan MongoDB
+        self._update_agent_command: Optional[UpdateAgentCommand] = None
+        self._list_agents_query: Optional[ListAgentsQuery] = None
+        self._get_agent_detail_query: Optional[GetAgentDetailQuery] = None
+        self._get_document_query: Optional[GetDocumentQuery] = None
+        self._list_documents_query: Optional[ListDocumentsQuery] = None
+        
+        # Handlers que necesitan S3: se construyen aparte para que un fallo de
+        # almacenamiento no deje sin servicio las rutas que solo usan MongoDB
+        self._create_agent_command: Optional[CreateAgentCommand] = None
+        self._delete_agent_command: Optional[DeleteAgentCommand] = None
+        self._upload_document_command: Optional[UploadDocumentCommand] = None
+        self._delete_document_command: Optional[DeleteDocumentCommand] = None
     
     @property
     async def database(self) -> AsyncIOMotorDatabase:
@@ -61,7 +82,9 @@ class Container:
         """Obtiene el repositorio de documentos"""
         if self._document_repository is None:
             db = await self.database
-            self._document_repository = MongoDocumentRepository(db)
+            self._document_repository = MongoDocumentRepository(
+                db, batch_writes=self.settings.mongodb_batch_writes
+            )
         return self._document_repository
     
     @property
@@ -76,66 +99,121 @@ class Container:
             )
         return self._file_storage
     
+    @property
+    def initialized(self) -> bool:
+        """Indica si los handlers ya fueron construidos"""
+        return self._initialized
+    
+    async def initialize(self) -> None:
+        """
+        Construye repositorios, servicios y handlers una sola vez
+        
+        Se invoca al arrancar la aplicación; los handlers no guardan estado
+        por request, así que se reutilizan en todas las peticiones. Si falla
+        MongoDB se propaga el error; si falla S3 los handlers de solo MongoDB
+        quedan disponibles y los de almacenamiento se reintentan al pedirlos
+        """
+        if self._initialized:
+            return
+        
+        async with self._init_lock:
+            # Otra request pudo completar la inicialización mientras se esperaba el lock
+            if self._initialized:
+                return
+            
+            agent_repo = await self.agent_repository
+            document_repo = await self.document_repository
+            
+            self._update_agent_command = UpdateAgentCommand(agent_repo)
+            self._list_agents_query = ListAgentsQuery(agent_repo)
+            self._get_agent_detail_query = GetAgentDetailQuery(agent_repo, document_repo)
+            self._get_document_query = GetDocumentQuery(document_repo)
+            self._list_documents_query = ListDocumentsQuery(document_repo, agent_repo)
+            
+            try:
+                self._build_storage_handlers()
+            except StorageException as e:
+                logger.error("%s", e)
+            
+            self._initialized = True
+    
+    def _build_storage_handlers(self) -> None:
+        """Construye los handlers que dependen del almacenamiento de archivos"""
+        if self._create_agent_command is not None:
+            return
+        # Sin repositorios (MongoDB caído al arrancar) no se construye nada: si se
+        # construyeran con None quedarían fijados aunque MongoDB vuelva después
+        if self._agent_repository is None or self._document_repository is None:
+            raise Exception("Repositories not initialized - MongoDB connection failed")
+        
+        try:
+            file_storage = self.file_storage
+        except Exception as e:
+            raise StorageException(f"File storage unavailable: {e}")
+        
+        agent_repo = self._agent_repository
+        document_repo = self._document_repository
+        self._delete_agent_command = DeleteAgentCommand(agent_repo, document_repo, file_storage)
+        self._upload_document_command = UploadDocumentCommand(agent_repo, document_repo, file_storage)
+        self._delete_document_command = DeleteDocumentCommand(agent_repo, document_repo, file_storage)
+        # Se asigna el último: es el que indica que el grupo está completo
+        self._create_agent_command = CreateAgentCommand(agent_repo, file_storage)
+    
+    async def ensure_storage_bucket(self) -> None:
+        """
+        Verifica el bucket de S3 sin bloquear el event loop (se llama al arrancar)
+        
+        Solo necesita el cliente de S3, así que funciona aunque MongoDB no esté disponible
+        """
+        await self.file_storage.ensure_bucket_exists()
+    
     # Command Handlers
-    async def create_agent_command(self) -> CreateAgentCommand:
+    def create_agent_command(self) -> CreateAgentCommand:
         """Obtiene el command handler para crear agentes"""
-        agent_repo = await self.agent_repository
-        file_storage = self.file_storage
-        return CreateAgentCommand(agent_repo, file_storage)
+        self._build_storage_handlers()
+        return self._create_agent_command
     
-    async def update_agent_command(self) -> UpdateAgentCommand:
+    def update_agent_command(self) -> UpdateAgentCommand:
         """Obtiene el command handler para actualizar agentes"""
-        agent_repo = await self.agent_repository
-        return UpdateAgentCommand(agent_repo)
+        return self._update_agent_command
     
-    async def delete_agent_command(self) -> DeleteAgentCommand:
+    def delete_agent_command(self) -> DeleteAgentCommand:
         """Obtiene el command handler para eliminar agentes"""
-        agent_repo = await self.agent_repository
-        document_repo = await self.document_repository
-        file_storage = self.file_storage
-        return DeleteAgentCommand(agent_repo, document_repo, file_storage)
+        self._build_storage_handlers()
+        return self._delete_agent_command
     
-    async def upload_document_command(self) -> UploadDocumentCommand:
+    def upload_document_command(self) -> UploadDocumentCommand:
         """Obtiene el command handler para subir documentos"""
-        agent_repo = await self.agent_repository
-        document_repo = await self.document_repository
-        file_storage = self.file_storage
-        return UploadDocumentCommand(agent_repo, document_repo, file_storage)
+        self._build_storage_handlers()
+        return self._upload_document_command
     
-    async def delete_document_command(self) -> DeleteDocumentCommand:
+    def delete_document_command(self) -> DeleteDocumentCommand:
         """Obtiene el command handler para eliminar documentos"""
-        agent_repo = await self.agent_repository
-        document_repo = await self.document_repository
-        file_storage = self.file_storage
-        return DeleteDocumentCommand(agent_repo, document_repo, file_storage)
+        self._build_storage_handlers()
+        return self._delete_document_command
     
     # Query Handlers
-    async def list_agents_query(self) -> ListAgentsQuery:
+    def list_agents_query(self) -> ListAgentsQuery:
         """Obtiene el query handler para listar agentes"""
-        agent_repo = await self.agent_repository
-        return ListAgentsQuery(agent_repo)
+        return self._list_agents_query
     
-    async def get_agent_detail_query(self) -> GetAgentDetailQuery:
+    def get_agent_detail_query(self) -> GetAgentDetailQuery:
         """Obtiene el query handler para obtener detalle de agente"""
-        agent_repo = await self.agent_repository
-        document_repo = await self.document_repository
-        return GetAgentDetailQuery(agent_repo, document_repo)
+        return self._get_agent_detail_query
     
-    async def get_document_query(self) -> GetDocumentQuery:
+    def get_document_query(self) -> GetDocumentQuery:
         """Obtiene el query handler para obtener detalle de documento"""
-        document_repo = await self.document_repository
-        return GetDocumentQuery(document_repo)
+        return self._get_document_query
     
-    async def list_documents_query(self) -> ListDocumentsQuery:
+    def list_documents_query(self) -> ListDocumentsQuery:
         """Obtiene el query handler para listar documentos"""
-        document_repo = await self.document_repository
-        agent_repo = await self.agent_repository
-        return ListDocumentsQuery(document_repo, agent_repo)
+        return self._list_documents_query
+
 
+# Singleton del contenedor, creado al importar el módulo
+CONTAINER = Container()
 
-# Singleton del contenedor
-@lru_cache()
 def get_container() -> Container:
     """Obtiene la instancia singleton del contenedor"""
-    return Container()
+    return CONTAINER
 
@@ -1,6 +1,6 @@
-from pydantic_settings import BaseSettings
+from pydantic_settings import BaseSettings, SettingsConfigDict
+from dataclasses import dataclass
 from typing import List
-from functools import lru_cache
 
 class Settings(BaseSettings):
     """
@@ -27,6 +27,9 @@ class Settings(BaseSettings):
     mongodb_db_name: str = "ai_agents_db"
     mongodb_max_pool_size: int = 10
     mongodb_min_pool_size: int = 1
+    # Agrupar escrituras de documentos en bulk_write (cada escritura espera hasta 20 ms
+    # a que se llene el lote): solo compensa con muchas subidas concurrentes
+    mongodb_batch_writes: bool = False
     
     # AWS S3
     aws_access_key_id: str
@@ -42,15 +45,15 @@ class Settings(BaseSettings):
     # Logging
     log_level: str = "INFO"
     log_file: str = "logs/app.log"
+    # Nivel del access log de uvicorn (WARNING en producción evita una línea por petición)
+    access_log_level: str = "INFO"
     
     # Rate limiting
     rate_limit_requests: int = 100
     rate_limit_period: int = 60
     
-    class Config:
-        env_file = ".env"
-        case_sensitive = False
-        
+    model_config = SettingsConfigDict(env_file=".env", case_sensitive=False)
+    
     @property
     def max_file_size_bytes(self) -> int:
         return self.max_file_size_mb * 1024 * 1024
@@ -61,7 +64,36 @@ class Settings(BaseSettings):
             return [origin.strip() for origin in self.allowed_origins.split(",")]
         return self.allowed_origins
 
-@lru_cache()
+# Configuración leída una sola vez al importar el módulo
+SETTINGS = Settings()
+
 def get_settings() -> Settings:
     """Singleton para obtener la configuración"""
-    return Settings()
\ No newline at end of file
+    return SETTINGS
+
+@dataclass(frozen=True, slots=True)
+class RuntimeSettings:
+    """
+    Valores de configuración usados en rutas calientes, precalculados una vez
+    
+    Se construye a partir de Settings para evitar propiedades y listas en cada request
+    """
+    max_file_size_mb: int
+    max_file_size_bytes: int
+    allowed_extensions: frozenset[str]
+    cors_origins: tuple[str, ...]
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "RuntimeSettings":
+        return cls(
+            max_file_size_mb=settings.max_file_size_mb,
+            max_file_size_bytes=settings.max_file_size_bytes,
+            allowed_extensions=frozenset(ext.lower() for ext in settings.allowed_extensions),
+            cors_origins=tuple(settings.cors_origins)
+        )
+
+RUNTIME_SETTINGS = RuntimeSettings.from_settings(SETTINGS)
+
+def get_runtime_settings() -> RuntimeSettings:
+    """Singleton con la configuración precalculada"""
+    return RUNTIME_SETTINGS
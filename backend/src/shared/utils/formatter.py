@@ -1,10 +1,21 @@
 """
 Utilidades para formatear datos y respuestas
 """
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Dict, Any, Optional
+import os
+import re
 import uuid
 
+# Caracteres no permitidos en nombres de archivo generados (se conservan letras, dígitos, '-' y '_')
+_UNSAFE_FILENAME_CHARS = re.compile(r"[^\w-]")
+
+_SIZE_UNITS = ("B", "KB", "MB", "GB", "TB")
+
+def _utc_timestamp() -> str:
+    """Marca de tiempo ISO 8601 en UTC con precisión de milisegundos"""
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds")
+
 class FileFormatter:
     """Formateador para archivos y documentos"""
     
@@ -14,24 +25,20 @@ class FileFormatter:
         if size_bytes == 0:
             return "0 B"
         
-        size_names = ["B", "KB", "MB", "GB", "TB"]
-        i = 0
-        while size_bytes >= 1024 and i < len(size_names) - 1:
-            size_bytes /= 1024.0
-            i += 1
-        
-        return f"{size_bytes:.1f} {size_names[i]}"
+        # Cada unidad son 10 bits más: el índice sale directo de bit_length
+        i = min((size_bytes.bit_length() - 1) // 10, len(_SIZE_UNITS) - 1)
+        return f"{size_bytes / (1 << (10 * i)):.1f} {_SIZE_UNITS[i]}"
     
     @staticmethod
     def generate_unique_filename(original_filename: str) -> str:
         """Genera un nombre único para el archivo"""
-        timestamp = datetime.utc().strftime("%Y%m%d_%H%M%S")
+        timestamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
         unique_id = str(uuid.uuid4())[:8]
         
         name, extension = original_filename.rsplit('.', 1) if '.' in original_filename else (original_filename, '')
         
         # Limpiar nombre del archivo
-        clean_name = "".join(c for c in name if c.isalnum() or c in '-_').rstrip()[:50]
+        clean_name = _UNSAFE_FILENAME_CHARS.sub("", name)[:50]
         
         if extension:
             return f"{clean_name}_{timestamp}_{unique_id}.{extension}"
@@ -39,9 +46,15 @@ class FileFormatter:
             return f"{clean_name}_{timestamp}_{unique_id}"
     
     @staticmethod
-    def extract_file_info(filename: str, file_size: int, content_type: str) -> Dict[str, Any]:
-        """Extrae información del archivo"""
-        extension = filename.lower().split('.')[-1] if '.' in filename else ''
+    def extract_file_info(
+        filename: str,
+        file_size: int,
+        content_type: str,
+        extension: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Extrae información del archivo (reutiliza la extensión si ya se validó)"""
+        if extension is None:
+            extension = os.path.splitext(filename)[1][1:].lower()
         
         return {
             "original_name": filename,
@@ -49,7 +62,7 @@ class FileFormatter:
             "size_bytes": file_size,
             "size_formatted": FileFormatter.format_file_size(file_size),
             "content_type": content_type,
-            "upload_timestamp": datetime.utc().isoformat()
+            "upload_timestamp": _utc_timestamp()
         }
 
 class ResponseFormatter:
@@ -65,7 +78,7 @@ class ResponseFormatter:
         response = {
             "success": True,
             "message": message,
-            "timestamp": datetime.utc().isoformat()
+            "timestamp": _utc_timestamp()
         }
         
         if data is not None:
@@ -88,7 +101,7 @@ class ResponseFormatter:
             "error": {
                 "code": error_code,
                 "message": error_message,
-                "timestamp": datetime.utc().isoformat()
+                "timestamp": _utc_timestamp()
             }
         }
         
@@ -168,6 +181,7 @@ class AgentFormatter:
     ) -> Dict[str, Any]:
         """Formatea detalle completo del agente"""
         documents = documents or []
+        total_size = sum(doc.get("size_bytes", 0) for doc in documents)
         
         return {
             "id": agent_id,
@@ -180,9 +194,7 @@ class AgentFormatter:
             "updated_at": updated_at.isoformat() if updated_at else None,
             "storage_info": {
                 "total_documents": len(documents),
-                "total_size": sum(doc.get("size_bytes", 0) for doc in documents),
-                "total_size_formatted": FileFormatter.format_file_size(
-                    sum(doc.get("size_bytes", 0) for doc in documents)
-                )
+                "total_size": total_size,
+                "total_size_formatted": FileFormatter.format_file_size(total_size)
             }
         }
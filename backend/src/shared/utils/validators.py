@@ -1,10 +1,53 @@
 """
 Validadores para archivos y datos de entrada
 """
-from typing import List, Tuple
-from fastapi import UploadFile, HTTPException
-import magic
+from typing import BinaryIO, Collection, Optional, Tuple
+from fastapi import UploadFile
+from functools import lru_cache
+import io
 import os
+import re
+import zipfile
+
+# Firmas de contenido de los formatos permitidos. Todos se identifican por sus
+# primeros bytes, sin necesidad de libmagic
+_PDF_SIGNATURE = b'%PDF-'
+_PDF_SIGNATURE_WINDOW = 1024  # la especificación admite bytes previos a la firma
+_ZIP_SIGNATURES = (b'PK\x03\x04', b'PK\x05\x06')  # ZIP con entradas / ZIP vacío
+_TEXT_BOMS = (b'\xef\xbb\xbf', b'\xff\xfe', b'\xfe\xff')
+# Bytes de control que no aparecen en texto (se permiten \b \t \n \f \r y ESC);
+# cualquier codificación ASCII compatible (UTF-8, Latin-1, cp1252) pasa la comprobación
+_BINARY_BYTES = bytes(sorted(set(range(32)) - {8, 9, 10, 12, 13, 27}))
+
+# Carpeta que identifica cada formato Office dentro del paquete ZIP
+_DOCX_MIME = 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+_XLSX_MIME = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+_PPTX_MIME = 'application/vnd.openxmlformats-officedocument.presentationml.presentation'
+_OFFICE_PACKAGE_PREFIXES = (('word/', _DOCX_MIME), ('xl/', _XLSX_MIME), ('ppt/', _PPTX_MIME))
+
+# Patrones compilados una sola vez (\w y \s equivalen a isalnum()/'_' e isspace())
+_AGENT_NAME_CHARS = re.compile(r'[\w\s-]+')
+_UNSAFE_KEY_CHARS = re.compile(r'[^\w.-]')
+
+@lru_cache(maxsize=256)
+def _is_allowed_mime_type(mime_type: str, file_extension: str) -> bool:
+    """
+    Comprueba un par (MIME, extensión) contra FileValidator._ALLOWED_MIME_LOOKUP
+    
+    Los pares posibles son pocos y se repiten en cada subida; maxsize acota la
+    memoria aunque el cliente envíe Content-Types arbitrarios
+    """
+    allowed = FileValidator._ALLOWED_MIME_LOOKUP.get(file_extension)
+    if allowed is None:
+        return False
+    # Los clientes suelen enviar el MIME ya en minúsculas: lower() solo si hace falta
+    return mime_type in allowed or mime_type.lower() in allowed
+
+def _file_extension(filename: str) -> str:
+    """Extrae la extensión del archivo en minúsculas"""
+    # splitext ignora los puntos de directorios y de archivos ocultos ('.pdf')
+    extension = os.path.splitext(filename)[1]
+    return extension[1:].lower() if extension else ''
 
 class FileValidator:
     """Validador de archivos subidos"""
@@ -34,22 +77,67 @@ class FileValidator:
         'csv': ['text/csv', 'application/csv']
     }
     
-    # Extensiones permitidas
-    ALLOWED_EXTENSIONS = list(ALLOWED_TYPES.keys())
+    # Extensiones permitidas (conjunto: la pertenencia se comprueba en cada subida)
+    ALLOWED_EXTENSIONS = frozenset(ALLOWED_TYPES)
+    
+    # MIME types normalizados por extensión, calculados una sola vez
+    _ALLOWED_MIME_LOOKUP = {
+        ext: frozenset(mime_type.lower() for mime_type in mime_types)
+        for ext, mime_types in ALLOWED_TYPES.items()
+    }
+    
+    # Tipo que debe detectarse en el contenido para cada extensión
+    CONTENT_MIME_TYPES = {
+        'pdf': 'application/pdf',
+        'docx': _DOCX_MIME,
+        'xlsx': _XLSX_MIME,
+        'pptx': _PPTX_MIME,
+        'txt': 'text/plain',
+        'csv': 'text/plain'
+    }
     
     # Tamaño máximo por defecto (10MB)
     DEFAULT_MAX_SIZE = 10 * 1024 * 1024
     
+    # Bytes de cabecera que se analizan: suficientes para los magic bytes de todos
+    # los formatos permitidos (incluidas las primeras entradas ZIP de Office)
+    CONTENT_SNIFF_SIZE = 4096
+    
     @classmethod
     def validate_file(
         cls, 
         file: UploadFile, 
         max_size_mb: int = 10,
-        allowed_extensions: List[str] = None
+        allowed_extensions: Collection[str] = None
     ) -> Tuple[bool, str, str]:
         """
         Valida un archivo subido
         
+        Returns:
+            Tuple[is_valid, file_type, error_message]
+        """
+        return cls.validate_file_info(
+            filename=file.filename,
+            content_type=file.content_type,
+            size=file.size,
+            max_size_mb=max_size_mb,
+            allowed_extensions=allowed_extensions
+        )
+    
+    @classmethod
+    def validate_file_info(
+        cls,
+        filename: Optional[str],
+        content_type: Optional[str],
+        size: Optional[int],
+        max_size_mb: int = 10,
+        allowed_extensions: Collection[str] = None
+    ) -> Tuple[bool, str, str]:
+        """
+        Valida nombre, tipo MIME y tamaño declarados de un archivo
+        
+        Permite validar archivos que no pasan por la API (subida directa a S3)
+        
         Returns:
             Tuple[is_valid, file_type, error_message]
         """
@@ -59,82 +147,111 @@ class FileValidator:
         max_size_bytes = max_size_mb * 1024 * 1024
         
         # 1. Validar que el archivo no esté vacío
-        if not file.filename:
+        if not filename:
             return False, '', "No se proporcionó un archivo"
         
-        # 2. Validar extensión del archivo
-        file_extension = cls._get_file_extension(file.filename)
+        # 2. Validar tamaño del archivo (la comprobación más barata va primero)
+        if size and size > max_size_bytes:
+            return False, '', f"Archivo demasiado grande. Máximo permitido: {max_size_mb}MB"
+        
+        # 3. Validar extensión del archivo
+        file_extension = _file_extension(filename)
         if file_extension not in allowed_extensions:
-            return False, '', f"Tipo de archivo no permitido. Permitidos: {', '.join(allowed_extensions)}"
+            return False, '', f"Tipo de archivo no permitido. Permitidos: {', '.join(sorted(allowed_extensions))}"
         
-        # 3. Validar MIME type si está disponible
-        if file.content_type:
-            if not cls._is_valid_mime_type(file.content_type, file_extension):
+        # 4. Validar MIME type si está disponible
+        if content_type:
+            if not _is_allowed_mime_type(content_type, file_extension):
                 return False, '', f"Tipo MIME no coincide con la extensión del archivo"
         
-        # 4. Validar tamaño del archivo
-        if file.size and file.size > max_size_bytes:
-            return False, '', f"Archivo demasiado grande. Máximo permitido: {max_size_mb}MB"
-        
         return True, file_extension, ""
     
-    @classmethod
-    def _get_file_extension(cls, filename: str) -> str:
-        """Extrae la extensión del archivo"""
-        return filename.lower().split('.')[-1] if '.' in filename else ''
+    @staticmethod
+    def _detect_mime_type(header: bytes) -> str:
+        """
+        Detecta el tipo real del contenido a partir de su cabecera
+        
+        Los formatos Office (docx, xlsx, pptx) son archivos ZIP: aquí se detectan
+        como application/zip y _detect_office_type los distingue
+        """
+        if _PDF_SIGNATURE in header[:_PDF_SIGNATURE_WINDOW]:
+            return 'application/pdf'
+        if header.startswith(_ZIP_SIGNATURES):
+            return 'application/zip'
+        if header.startswith(_TEXT_BOMS):
+            return 'text/plain'
+        if header and len(header.translate(None, _BINARY_BYTES)) == len(header):
+            return 'text/plain'
+        return 'application/octet-stream'
     
-    @classmethod
-    def _is_valid_mime_type(cls, mime_type: str, file_extension: str) -> bool:
-        """Verifica si el MIME type coincide con la extensión"""
-        if file_extension not in cls.ALLOWED_TYPES:
-            return False
+    @staticmethod
+    def _detect_office_type(archive_file: BinaryIO) -> Optional[str]:
+        """
+        Identifica el formato Office de un ZIP por las entradas de su directorio central
         
-        return mime_type.lower() in [mt.lower() for mt in cls.ALLOWED_TYPES[file_extension]]
+        zipfile solo lee el directorio central (al final del archivo), no el
+        contenido comprimido. Un ZIP cualquiera renombrado no tiene estas carpetas.
+        """
+        try:
+            with zipfile.ZipFile(archive_file) as archive:
+                names = archive.namelist()
+        except (zipfile.BadZipFile, EOFError, OSError, ValueError):
+            return None
+        finally:
+            archive_file.seek(0)
+        
+        for name in names:
+            for prefix, mime_type in _OFFICE_PACKAGE_PREFIXES:
+                if name.startswith(prefix):
+                    return mime_type
+        return None
     
     @classmethod
-    def validate_file_content(cls, file_content: bytes, filename: str) -> Tuple[bool, str]:
+    def validate_file_content(
+        cls,
+        file_content: bytes,
+        filename: str,
+        file_extension: Optional[str] = None,
+        file: Optional[BinaryIO] = None
+    ) -> Tuple[bool, str]:
         """
-        Valida el contenido del archivo usando python-magic
+        Valida que el contenido del archivo corresponda a su extensión
+        
+        Solo se analizan los primeros CONTENT_SNIFF_SIZE bytes, aunque se reciba
+        el archivo completo. Para los formatos Office se lee además el directorio
+        central del ZIP, desde file si se indica o desde file_content
         
         Args:
-            file_content: Contenido del archivo en bytes
+            file_content: Cabecera o contenido completo del archivo en bytes
             filename: Nombre del archivo
-            
+            file_extension: Extensión ya extraída por validate_file (se calcula si no se indica)
+            file: Archivo completo con acceso aleatorio (necesario si file_content es solo la cabecera)
+        
         Returns:
             Tuple[is_valid, error_message]
         """
-        try:
-            # Detectar MIME type real del contenido
-            mime_type = magic.from_buffer(file_content, mime=True)
-            file_extension = cls._get_file_extension(filename)
-            
-            if not cls._is_valid_mime_type(mime_type, file_extension):
-                # Mensaje más claro y específico
-                expected_types = cls.ALLOWED_TYPES.get(file_extension, [])
-                expected_str = ', '.join(expected_types)
-                
-                return False, (
-                    f"El archivo '{filename}' parece estar dañado o tener formato incorrecto. "
-                    f"Detectado: {mime_type}, esperado: {expected_str}. "
-                    f"Intenta convertir el archivo al formato correcto o usar un archivo diferente."
-                )
-            
-            return True, ""
-            
-        except Exception as e:
-            # Si python-magic no está disponible o falla, hacer validación más permisiva
-            # Solo validar que el archivo no esté completamente vacío
-            if len(file_content) == 0:
-                return False, "El archivo está vacío"
-            
-            # Para archivos pequeños (< 100 bytes), ser más estricto
-            if len(file_content) < 100:
-                return False, "El archivo parece estar incompleto o dañado"
-            
-            # Para otros casos, permitir el archivo con advertencia en logs
-            import logging
-            logging.warning(f"No se pudo validar contenido de {filename}: {str(e)}")
-            return True, ""
+        if not file_content:
+            return False, "El archivo está vacío"
+        
+        # Detectar el tipo real del contenido
+        mime_type = cls._detect_mime_type(bytes(file_content[:cls.CONTENT_SNIFF_SIZE]))
+        if file_extension is None:
+            file_extension = _file_extension(filename)
+        
+        if mime_type == 'application/zip':
+            archive_file = file if file is not None else io.BytesIO(file_content)
+            mime_type = cls._detect_office_type(archive_file) or mime_type
+        
+        expected_type = cls.CONTENT_MIME_TYPES.get(file_extension)
+        if mime_type != expected_type:
+            # Mensaje más claro y específico
+            return False, (
+                f"El archivo '{filename}' parece estar dañado o tener formato incorrecto. "
+                f"Detectado: {mime_type}, esperado: {expected_type or 'formato no soportado'}. "
+                f"Intenta convertir el archivo al formato correcto o usar un archivo diferente."
+            )
+        
+        return True, ""
 
 class AgentValidator:
     """Validador para datos de agentes"""
@@ -143,14 +260,22 @@ class AgentValidator:
     MAX_NAME_LENGTH = 100
     MIN_PROMPT_LENGTH = 10
     MAX_PROMPT_LENGTH = 5000
+    # Margen sobre el máximo para espacios al inicio y al final que strip() elimina
+    WHITESPACE_SLACK = 4
     
     @classmethod
     def validate_agent_name(cls, name: str) -> Tuple[bool, str]:
         """Valida el nombre del agente"""
-        if not name or not name.strip():
+        if not name:
             return False, "El nombre del agente es requerido"
         
+        # Rechazar entradas desmesuradas antes de copiarlas con strip()
+        if len(name) > cls.MAX_NAME_LENGTH * cls.WHITESPACE_SLACK:
+            return False, f"El nombre no puede exceder {cls.MAX_NAME_LENGTH} caracteres"
+        
         name = name.strip()
+        if not name:
+            return False, "El nombre del agente es requerido"
         
         if len(name) < cls.MIN_NAME_LENGTH:
             return False, f"El nombre debe tener al menos {cls.MIN_NAME_LENGTH} caracteres"
@@ -159,7 +284,7 @@ class AgentValidator:
             return False, f"El nombre no puede exceder {cls.MAX_NAME_LENGTH} caracteres"
         
         # Verificar caracteres válidos (letras, números, espacios, guiones)
-        if not all(c.isalnum() or c.isspace() or c in '-_' for c in name):
+        if not _AGENT_NAME_CHARS.fullmatch(name):
             return False, "El nombre solo puede contener letras, números, espacios y guiones"
         
         return True, ""
@@ -167,10 +292,16 @@ class AgentValidator:
     @classmethod
     def validate_agent_prompt(cls, prompt: str) -> Tuple[bool, str]:
         """Valida el prompt del agente"""
-        if not prompt or not prompt.strip():
+        if not prompt:
             return False, "El prompt del agente es requerido"
         
+        # Rechazar entradas desmesuradas antes de copiarlas con strip()
+        if len(prompt) > cls.MAX_PROMPT_LENGTH * cls.WHITESPACE_SLACK:
+            return False, f"El prompt no puede exceder {cls.MAX_PROMPT_LENGTH} caracteres"
+        
         prompt = prompt.strip()
+        if not prompt:
+            return False, "El prompt del agente es requerido"
         
         if len(prompt) < cls.MIN_PROMPT_LENGTH:
             return False, f"El prompt debe tener al menos {cls.MIN_PROMPT_LENGTH} caracteres"
@@ -183,6 +314,9 @@ class AgentValidator:
 class DocumentValidator:
     """Validador para metadata de documentos"""
     
+    MAX_METADATA_KEY_LENGTH = 50
+    METADATA_VALUE_TYPES = (str, int, float, bool)
+    
     @classmethod
     def validate_agent_id(cls, agent_id: str) -> Tuple[bool, str]:
         """Valida el ID del agente"""
@@ -199,8 +333,8 @@ class DocumentValidator:
     @classmethod
     def generate_document_key(cls, agent_id: str, filename: str) -> str:
         """Genera la clave S3 para un documento"""
-        # Limpiar el nombre del archivo
-        clean_filename = "".join(c for c in filename if c.isalnum() or c in '.-_').rstrip()
+        # Limpiar el nombre del archivo en una sola pasada (el patrón ya elimina los espacios)
+        clean_filename = _UNSAFE_KEY_CHARS.sub('', filename)
         
         # Generar clave con estructura organizada
         return f"agents/{agent_id}/documents/{clean_filename}"
@@ -211,12 +345,14 @@ class DocumentValidator:
         if not isinstance(metadata, dict):
             return False, "Metadata debe ser un diccionario"
         
-        # Verificar que las claves sean strings válidos
+        # Verificar que las claves sean strings válidos (el bucle sale en el primer error)
+        max_key_length = cls.MAX_METADATA_KEY_LENGTH
+        value_types = cls.METADATA_VALUE_TYPES
         for key, value in metadata.items():
-            if not isinstance(key, str) or len(key) > 50:
+            if not isinstance(key, str) or len(key) > max_key_length:
                 return False, f"Clave de metadata inválida: {key}"
             
-            if not isinstance(value, (str, int, float, bool)):
+            if not isinstance(value, value_types):
                 return False, f"Valor de metadata inválido para {key}"
         
         return True, ""
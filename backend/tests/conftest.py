@@ -3,6 +3,8 @@ Configuración global de pruebas con fixtures comunes
 """
 import pytest
 import asyncio
+import copy
+import dataclasses
 from datetime import datetime
 from unittest.mock import AsyncMock, MagicMock
 from httpx import AsyncClient
@@ -12,11 +14,20 @@ import os
 # Agregar src al path para imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
+# Credenciales ficticias para poder importar la configuración sin un .env (no pisan las reales)
+os.environ.setdefault("AWS_ACCESS_KEY_ID", "test_key")
+os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "test_secret")
+
 from src.domain.entities.agent import Agent
 from src.domain.entities.document import Document
 from src.domain.value_objects.agentId import AgentId
 from src.domain.value_objects.documentType import DocumentType
-from src.domain.ports.services.fileStorage import FileMetadata
+from src.domain.ports.repositories.agentRepository import AgentRepository
+from src.domain.ports.repositories.documentRepository import DocumentRepository
+from src.domain.ports.services.fileStorage import FileMetadata, FileStorage
+
+# Marca de tiempo fija de los datos de prueba (datetime es inmutable: se comparte)
+FIXED_TIMESTAMP = datetime(2025, 1, 1, 10, 0, 0)
 
 
 @pytest.fixture(scope="session")
@@ -27,28 +38,28 @@ def event_loop():
     loop.close()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_agent_id():
-    """Fixture que proporciona un AgentId de prueba"""
+    """Fixture que proporciona un AgentId de prueba (inmutable: se comparte en la sesión)"""
     return AgentId.generate()
 
 
-@pytest.fixture
-def sample_agent(sample_agent_id):
-    """Fixture que proporciona un Agent de prueba"""
+@pytest.fixture(scope="session")
+def _sample_agent_base(sample_agent_id):
+    """Agent construido y validado una vez por sesión; las pruebas reciben copias"""
     return Agent(
         id=sample_agent_id,
         name="Agente Test",
         prompt="Este es un prompt de prueba para el agente.",
-        created_at=datetime(2025, 1, 1, 10, 0, 0),
-        updated_at=datetime(2025, 1, 1, 10, 0, 0),
+        created_at=FIXED_TIMESTAMP,
+        updated_at=FIXED_TIMESTAMP,
         documents_count=0
     )
 
 
-@pytest.fixture
-def sample_document(sample_agent_id):
-    """Fixture que proporciona un Document de prueba"""
+@pytest.fixture(scope="session")
+def _sample_document_base(sample_agent_id):
+    """Document construido y validado una vez por sesión; las pruebas reciben copias"""
     return Document(
         id="doc-123",
         agent_id=sample_agent_id,
@@ -57,11 +68,54 @@ def sample_document(sample_agent_id):
         s3_url="https://bucket.s3.region.amazonaws.com/agents/agent-id/test_document.pdf",
         s3_key="agents/agent-id/test_document.pdf",
         file_size=1024,
-        created_at=datetime(2025, 1, 1, 10, 0, 0),
-        updated_at=datetime(2025, 1, 1, 10, 0, 0)
+        created_at=FIXED_TIMESTAMP,
+        updated_at=FIXED_TIMESTAMP
     )
 
 
+@pytest.fixture
+def sample_agent(_sample_agent_base):
+    """Fixture que proporciona un Agent de prueba"""
+    # Copia superficial: los campos son inmutables y la prueba puede modificar la suya
+    return copy.copy(_sample_agent_base)
+
+
+@pytest.fixture
+def sample_document(_sample_document_base):
+    """Fixture que proporciona un Document de prueba"""
+    return copy.copy(_sample_document_base)
+
+
+@pytest.fixture
+def make_document(_sample_document_base):
+    """
+    Fábrica de variantes de sample_document
+    
+    dataclasses.replace crea un Document nuevo con los campos indicados y
+    vuelve a ejecutar su validación, así que las variantes siguen siendo válidas
+    """
+    def _make(**overrides):
+        return dataclasses.replace(_sample_document_base, **overrides)
+    return _make
+
+
+@pytest.fixture
+def frozen_time(monkeypatch):
+    """
+    Congela datetime.now() en las entidades del dominio y devuelve el instante fijo
+    
+    Para pruebas que comprueban los timestamps exactos de Agent.create/Document.create
+    """
+    class _FrozenDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return FIXED_TIMESTAMP
+    
+    monkeypatch.setattr("src.domain.entities.agent.datetime", _FrozenDatetime)
+    monkeypatch.setattr("src.domain.entities.document.datetime", _FrozenDatetime)
+    return FIXED_TIMESTAMP
+
+
 @pytest.fixture
 def sample_file_metadata():
     """Fixture que proporciona FileMetadata de prueba"""
@@ -74,42 +128,80 @@ def sample_file_metadata():
     )
 
 
-@pytest.fixture
+# Los mocks se construyen una sola vez (crear un AsyncMock es ~20 veces más caro
+# que reiniciarlo) y se reinician tras cada prueba en _reset_shared_mocks
+# Con spec de cada puerto, llamar o configurar un método que el puerto no declara falla
+_SHARED_AGENT_REPOSITORY = AsyncMock(spec=AgentRepository)
+_SHARED_DOCUMENT_REPOSITORY = AsyncMock(spec=DocumentRepository)
+_SHARED_FILE_STORAGE = AsyncMock(spec=FileStorage)
+_SHARED_COLLECTION = AsyncMock()
+_SHARED_DATABASE = MagicMock()
+_SHARED_DATABASE.__getitem__.return_value = _SHARED_COLLECTION
+
+
+@pytest.fixture(autouse=True)
+def _reset_shared_mocks():
+    """Borra llamadas, valores de retorno y side effects configurados por la prueba"""
+    yield
+    for mock in (_SHARED_AGENT_REPOSITORY, _SHARED_DOCUMENT_REPOSITORY, _SHARED_FILE_STORAGE, _SHARED_COLLECTION):
+        mock.reset_mock(return_value=True, side_effect=True)
+    # Sin return_value=True: se conserva la colección que devuelve db[...]
+    _SHARED_DATABASE.reset_mock()
+
+
+@pytest.fixture(scope="session")
 def mock_agent_repository():
     """Mock del repositorio de agentes"""
-    return AsyncMock()
+    return _SHARED_AGENT_REPOSITORY
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_document_repository():
     """Mock del repositorio de documentos"""
-    return AsyncMock()
+    return _SHARED_DOCUMENT_REPOSITORY
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_file_storage():
     """Mock del servicio de almacenamiento de archivos"""
-    return AsyncMock()
+    return _SHARED_FILE_STORAGE
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_database():
     """Mock de la base de datos MongoDB"""
-    mock_db = MagicMock()
-    mock_collection = AsyncMock()
-    mock_db.__getitem__.return_value = mock_collection
-    return mock_db
+    return _SHARED_DATABASE
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 async def test_client():
-    """Cliente HTTP de prueba para endpoints"""
+    """
+    Cliente HTTP de prueba para endpoints
+    
+    Se comparte por módulo: las pruebas sustituyen dependencias con el fixture
+    dependency_overrides, que se vacía tras cada prueba
+    """
     from httpx import ASGITransport
     from main import app
     
     transport = ASGITransport(app=app)
     async with AsyncClient(transport=transport, base_url="http://test") as ac:
         yield ac
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def dependency_overrides(test_client):
+    """
+    app.dependency_overrides de la app bajo prueba
+    
+    Depends guarda la función original, así que @patch sobre el módulo de
+    dependencias no tiene efecto: los mocks se registran aquí
+    """
+    from main import app
+    
+    yield app.dependency_overrides
+    app.dependency_overrides.clear()
 
 
 # Fixtures para datos de prueba comunes
@@ -0,0 +1,20 @@
+"""
+Utilidades compartidas por las pruebas
+"""
+from unittest.mock import Mock
+
+
+def assert_calls(mock: Mock, *expected_calls) -> None:
+    """
+    Verifica en una sola comparación la secuencia exacta de llamadas de un mock
+
+    Recorre mock.mock_calls una vez en lugar de repetir assert_called_once_with
+    por método. Comprueba también el orden y que no haya llamadas de más
+
+    Ejemplo:
+        assert_calls(repository, call.get_agent_by_name("Agente"), call.save_agent(ANY))
+    """
+    actual_calls = mock.mock_calls
+    assert actual_calls == list(expected_calls), (
+        f"Llamadas esperadas: {list(expected_calls)}\nLlamadas recibidas: {actual_calls}"
+    )
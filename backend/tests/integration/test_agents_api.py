@@ -2,9 +2,29 @@
 Pruebas de integración para endpoints de agentes
 """
 import pytest
-from httpx import AsyncClient
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock
 from datetime import datetime
+from types import MappingProxyType
+from src.application.dto.agentDto import AgentResponseDTO
+from src.infrastructure.api.dependencies import (
+    get_create_agent_command,
+    get_update_agent_command,
+    get_delete_agent_command,
+    get_list_agents_query,
+    get_agent_detail_query
+)
+
+FIXED_TIMESTAMP = datetime(2025, 1, 1, 10, 0, 0)
+
+# Datos base de agente, de solo lectura; cada prueba recibe su propio dict
+_AGENT_DATA = MappingProxyType({
+    "id": "test-agent-123",
+    "name": "Agente Test API",
+    "prompt": "Este es un prompt de prueba para API.",
+    "documents_count": 0,
+    "created_at": FIXED_TIMESTAMP,
+    "updated_at": FIXED_TIMESTAMP
+})
 
 
 @pytest.mark.api
@@ -12,46 +32,23 @@ from datetime import datetime
 class TestAgentsAPI:
     """Pruebas de integración para API de agentes"""
     
-    @pytest.fixture
-    async def client(self):
-        """Cliente HTTP para pruebas"""
-        from httpx import ASGITransport
-        from main import app
-        
-        transport = ASGITransport(app=app)
-        async with AsyncClient(transport=transport, base_url="http://test") as ac:
-            yield ac
-    
     @pytest.fixture
     def mock_agent_data(self):
-        """Datos de agente para mocks"""
-        return {
-            "id": "test-agent-123",
-            "name": "Agente Test API",
-            "prompt": "Este es un prompt de prueba para API.",
-            "documents_count": 0,
-            "created_at": datetime(2025, 1, 1, 10, 0, 0),
-            "updated_at": datetime(2025, 1, 1, 10, 0, 0)
-        }
+        """Fábrica de datos de agente para mocks; los cambios se pasan como argumentos"""
+        def _make(**overrides):
+            return {**_AGENT_DATA, **overrides}
+        return _make
     
-    @patch('src.infrastructure.api.dependencies.get_create_agent_command')
-    async def test_create_agent_success(self, mock_get_command, client):
+    async def test_create_agent_success(self, test_client, dependency_overrides):
         """Prueba creación exitosa de agente via API"""
         # Arrange
         mock_command = AsyncMock()
-        mock_result = AsyncMock()
-        mock_result.id = "test-agent-123"
-        mock_result.name = "Agente Test API"
-        mock_result.prompt = "Este es un prompt de prueba para API."
-        mock_result.documents_count = 0
-        mock_result.created_at = datetime(2025, 1, 1, 10, 0, 0)
-        mock_result.updated_at = datetime(2025, 1, 1, 10, 0, 0)
-        
-        mock_command.execute.return_value = mock_result
-        mock_get_command.return_value = mock_command
+        # DTO real: la ruta lo serializa tal cual y un mock no es serializable
+        mock_command.execute.return_value = AgentResponseDTO(**_AGENT_DATA)
+        dependency_overrides[get_create_agent_command] = lambda: mock_command
         
         # Act
-        response = await client.post(
+        response = await test_client.post(
             "/api/v1/agents",
             json={
                 "name": "Agente Test API",
@@ -67,15 +64,14 @@ class TestAgentsAPI:
         assert data["documents_count"] == 0
         assert "id" in data
     
-    @patch('src.infrastructure.api.dependencies.get_create_agent_command')
-    async def test_create_agent_validation_error(self, mock_get_command, client):
+    async def test_create_agent_validation_error(self, test_client, dependency_overrides):
         """Prueba error de validación en creación de agente"""
         # Arrange
         mock_command = AsyncMock()
-        mock_get_command.return_value = mock_command
+        dependency_overrides[get_create_agent_command] = lambda: mock_command
         
         # Act - nombre muy corto
-        response = await client.post(
+        response = await test_client.post(
             "/api/v1/agents",
             json={
                 "name": "A",  # Muy corto
@@ -86,24 +82,25 @@ class TestAgentsAPI:
         # Assert
         assert response.status_code == 422
         data = response.json()
-        assert "detail" in data
+        assert data["error"]["type"] == "VALIDATION_ERROR"
+        assert data["error"]["details"]["errors"][0]["field"] == "name"
+        mock_command.execute.assert_not_called()
     
-    @patch('src.infrastructure.api.dependencies.get_agent_detail_query')
-    async def test_get_agent_success(self, mock_get_query, client, mock_agent_data):
+    async def test_get_agent_success(self, test_client, dependency_overrides, mock_agent_data):
         """Prueba obtener agente existente via API"""
         # Arrange
         mock_query = AsyncMock()
         mock_result = {
-            "agent": mock_agent_data,
+            "agent": mock_agent_data(),
             "documents": []
         }
         mock_query.execute.return_value = mock_result
-        mock_get_query.return_value = mock_query
         
         agent_id = "test-agent-123"
+        dependency_overrides[get_agent_detail_query] = lambda: mock_query
         
         # Act
-        response = await client.get(f"/api/v1/agents/{agent_id}")
+        response = await test_client.get(f"/api/v1/agents/{agent_id}")
         
         # Assert
         assert response.status_code == 200
@@ -113,35 +110,32 @@ class TestAgentsAPI:
         assert data["agent"]["id"] == agent_id
         assert data["agent"]["name"] == "Agente Test API"
     
-    @patch('src.infrastructure.api.dependencies.get_agent_detail_query')
-    async def test_get_agent_not_found(self, mock_get_query, client):
+    async def test_get_agent_not_found(self, test_client, dependency_overrides):
         """Prueba obtener agente que no existe"""
         # Arrange
         from src.domain.exceptions.domainExceptions import AgentNotFoundException
         mock_query = AsyncMock()
         mock_query.execute.side_effect = AgentNotFoundException("nonexistent-agent")
-        mock_get_query.return_value = mock_query
+        dependency_overrides[get_agent_detail_query] = lambda: mock_query
         
         # Act
-        response = await client.get("/api/v1/agents/nonexistent-agent")
+        response = await test_client.get("/api/v1/agents/nonexistent-agent")
         
         # Assert
         assert response.status_code == 404
     
-    @patch('src.infrastructure.api.dependencies.get_update_agent_command')
-    async def test_update_agent_success(self, mock_get_command, client, mock_agent_data):
+    async def test_update_agent_success(self, test_client, dependency_overrides, mock_agent_data):
         """Prueba actualización exitosa de agente"""
         # Arrange
         mock_command = AsyncMock()
-        updated_agent = mock_agent_data.copy()
-        updated_agent["name"] = "Agente Actualizado"
+        updated_agent = mock_agent_data(name="Agente Actualizado")
         mock_command.execute.return_value = updated_agent
-        mock_get_command.return_value = mock_command
         
         agent_id = "test-agent-123"
+        dependency_overrides[get_update_agent_command] = lambda: mock_command
         
         # Act
-        response = await client.put(
+        response = await test_client.put(
             f"/api/v1/agents/{agent_id}",
             json={
                 "name": "Agente Actualizado"
@@ -153,38 +147,36 @@ class TestAgentsAPI:
         data = response.json()
         assert data["name"] == "Agente Actualizado"
     
-    @patch('src.infrastructure.api.dependencies.get_delete_agent_command')
-    async def test_delete_agent_success(self, mock_get_command, client):
+    async def test_delete_agent_success(self, test_client, dependency_overrides):
         """Prueba eliminación exitosa de agente"""
         # Arrange
         mock_command = AsyncMock()
         mock_command.execute.return_value = None
-        mock_get_command.return_value = mock_command
         
         agent_id = "test-agent-123"
+        dependency_overrides[get_delete_agent_command] = lambda: mock_command
         
         # Act
-        response = await client.delete(f"/api/v1/agents/{agent_id}")
+        response = await test_client.delete(f"/api/v1/agents/{agent_id}")
         
         # Assert
         assert response.status_code == 204
     
-    @patch('src.infrastructure.api.dependencies.get_list_agents_query')
-    async def test_list_agents_success(self, mock_get_query, client, mock_agent_data):
+    async def test_list_agents_success(self, test_client, dependency_overrides, mock_agent_data):
         """Prueba listado de agentes"""
         # Arrange
         mock_query = AsyncMock()
         mock_result = {
-            "agents": [mock_agent_data],
+            "agents": [mock_agent_data()],
             "total": 1,
             "page": 1,
             "per_page": 20
         }
         mock_query.execute.return_value = mock_result
-        mock_get_query.return_value = mock_query
+        dependency_overrides[get_list_agents_query] = lambda: mock_query
         
         # Act
-        response = await client.get("/api/v1/agents")
+        response = await test_client.get("/api/v1/agents")
         
         # Assert
         assert response.status_code == 200
@@ -194,8 +186,7 @@ class TestAgentsAPI:
         assert len(data["agents"]) == 1
         assert data["agents"][0]["name"] == "Agente Test API"
     
-    @patch('src.infrastructure.api.dependencies.get_list_agents_query')
-    async def test_list_agents_with_pagination(self, mock_get_query, client):
+    async def test_list_agents_with_pagination(self, test_client, dependency_overrides):
         """Prueba listado de agentes con paginación"""
         # Arrange
         mock_query = AsyncMock()
@@ -206,10 +197,10 @@ class TestAgentsAPI:
             "per_page": 10
         }
         mock_query.execute.return_value = mock_result
-        mock_get_query.return_value = mock_query
+        dependency_overrides[get_list_agents_query] = lambda: mock_query
         
         # Act
-        response = await client.get("/api/v1/agents?skip=10&limit=10")
+        response = await test_client.get("/api/v1/agents?skip=10&limit=10")
         
         # Assert
         assert response.status_code == 200
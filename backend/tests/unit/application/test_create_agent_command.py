@@ -2,20 +2,21 @@
 Pruebas unitarias para CreateAgentCommand
 """
 import pytest
-from unittest.mock import AsyncMock
+from unittest.mock import ANY, AsyncMock, call
 from src.application.commands.createAgent import CreateAgentCommand
 from src.application.dto.agentDto import CreateAgentDTO
 from src.domain.entities.agent import Agent
 from src.domain.exceptions.domainExceptions import DuplicateAgentNameException
+from tests.helpers import assert_calls
 
 
 @pytest.mark.unit
 class TestCreateAgentCommand:
     """Pruebas para el comando CreateAgent"""
     
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def command(self, mock_agent_repository, mock_file_storage):
-        """Comando con repositorio y file storage mock"""
+        """Comando con repositorio y file storage mock (sin estado: se comparte en la clase)"""
         return CreateAgentCommand(mock_agent_repository, mock_file_storage)
     
     @pytest.fixture
@@ -48,8 +49,11 @@ class TestCreateAgentCommand:
         assert result.id is not None
         
         # Verificar llamadas al repositorio
-        mock_agent_repository.get_agent_by_name.assert_called_once_with(valid_create_dto.name)
-        mock_agent_repository.save_agent.assert_called_once()
+        assert_calls(
+            mock_agent_repository,
+            call.get_agent_by_name(valid_create_dto.name),
+            call.save_agent(ANY)
+        )
     
     async def test_create_agent_already_exists(self, command, mock_agent_repository, valid_create_dto, sample_agent):
         """Prueba error cuando el agente ya existe"""
@@ -61,8 +65,7 @@ class TestCreateAgentCommand:
             await command.execute(valid_create_dto)
         
         # Verificar que no se intentó guardar
-        mock_agent_repository.get_agent_by_name.assert_called_once_with(valid_create_dto.name)
-        mock_agent_repository.save_agent.assert_not_called()
+        assert_calls(mock_agent_repository, call.get_agent_by_name(valid_create_dto.name))
     
     async def test_create_agent_with_whitespace_name(self, command, mock_agent_repository):
         """Prueba creación con nombre que tiene espacios en blanco"""
@@ -124,30 +127,23 @@ class TestCreateAgentCommand:
         mock_agent_repository.get_agent_by_name.assert_called_once_with("Agente Test Unique")
         mock_agent_repository.save_agent.assert_not_called()
     
-    async def test_create_agent_repository_error(self, command, mock_agent_repository, valid_create_dto):
-        """Prueba manejo de error del repositorio"""
+    @pytest.mark.parametrize("failing_method, message, save_called", [
+        ("save_agent", "Database error", True),
+        ("get_agent_by_name", "Database connection error", False)
+    ], ids=["save_fails", "name_check_fails"])
+    async def test_create_agent_repository_errors(
+        self, command, mock_agent_repository, valid_create_dto, failing_method, message, save_called
+    ):
+        """Prueba que los errores del repositorio se propagan y que no se guarda si falla la verificación"""
         # Arrange
         mock_agent_repository.get_agent_by_name.return_value = None
-        mock_agent_repository.save_agent.side_effect = Exception("Database error")
-        
-        # Act & Assert
-        with pytest.raises(Exception, match="Database error"):
-            await command.execute(valid_create_dto)
-        
-        # Verificar que se intentó guardar
-        mock_agent_repository.save_agent.assert_called_once()
-    
-    async def test_create_agent_check_name_error(self, command, mock_agent_repository, valid_create_dto):
-        """Prueba manejo de error al verificar nombre existente"""
-        # Arrange
-        mock_agent_repository.get_agent_by_name.side_effect = Exception("Database connection error")
+        getattr(mock_agent_repository, failing_method).side_effect = Exception(message)
         
         # Act & Assert
-        with pytest.raises(Exception, match="Database connection error"):
+        with pytest.raises(Exception, match=message):
             await command.execute(valid_create_dto)
         
-        # No debe intentar guardar si falla la verificación
-        mock_agent_repository.save_agent.assert_not_called()
+        assert mock_agent_repository.save_agent.called is save_called
     
     async def test_create_agent_dto_validation(self, command, mock_agent_repository):
         """Prueba validación del DTO"""
@@ -0,0 +1,75 @@
+"""
+Pruebas unitarias para DeleteAgentCommand
+"""
+import pytest
+from src.application.commands.deleteAgent import DeleteAgentCommand
+from src.domain.exceptions.domainExceptions import AgentNotFoundException
+
+
+@pytest.mark.unit
+class TestDeleteAgentCommand:
+    """Pruebas para el comando DeleteAgent"""
+    
+    @pytest.fixture
+    def command(self, mock_agent_repository, mock_document_repository, mock_file_storage):
+        """Comando con repositorios y storage mock"""
+        return DeleteAgentCommand(mock_agent_repository, mock_document_repository, mock_file_storage)
+    
+    async def test_delete_agent_removes_files_and_documents_in_bulk(
+        self,
+        command,
+        mock_agent_repository,
+        mock_document_repository,
+        mock_file_storage,
+        sample_agent
+    ):
+        """Prueba que la cascada usa una operación por lotes en S3 y en la BD"""
+        # Arrange
+        agent_id = str(sample_agent.id)
+        mock_agent_repository.get_agent_by_id.return_value = sample_agent
+        mock_file_storage.delete_folder.return_value = 3
+        mock_document_repository.delete_by_agent_id.return_value = 3
+        mock_agent_repository.delete_agent.return_value = True
+        
+        # Act
+        result = await command.execute(agent_id)
+        
+        # Assert
+        assert result is True
+        mock_file_storage.delete_folder.assert_awaited_once_with(f"agents/{agent_id}/")
+        mock_document_repository.delete_by_agent_id.assert_awaited_once_with(sample_agent.id)
+        mock_document_repository.find_by_agent_id.assert_not_called()
+        mock_agent_repository.delete_agent.assert_awaited_once_with(sample_agent.id)
+    
+    async def test_delete_agent_continues_when_storage_fails(
+        self,
+        command,
+        mock_agent_repository,
+        mock_document_repository,
+        mock_file_storage,
+        sample_agent
+    ):
+        """Prueba que un fallo de S3 no impide eliminar documentos y agente"""
+        # Arrange
+        mock_agent_repository.get_agent_by_id.return_value = sample_agent
+        mock_file_storage.delete_folder.side_effect = Exception("S3 unavailable")
+        mock_document_repository.delete_by_agent_id.return_value = 2
+        mock_agent_repository.delete_agent.return_value = True
+        
+        # Act
+        result = await command.execute(str(sample_agent.id))
+        
+        # Assert
+        assert result is True
+        mock_document_repository.delete_by_agent_id.assert_awaited_once()
+        mock_agent_repository.delete_agent.assert_awaited_once()
+    
+    async def test_delete_agent_not_found(self, command, mock_agent_repository, mock_file_storage, sample_agent_id):
+        """Prueba error cuando el agente no existe"""
+        # Arrange
+        mock_agent_repository.get_agent_by_id.return_value = None
+        
+        # Act & Assert
+        with pytest.raises(AgentNotFoundException):
+            await command.execute(str(sample_agent_id))
+        mock_file_storage.delete_folder.assert_not_called()
@@ -0,0 +1,83 @@
+"""
+Pruebas unitarias para ListDocumentsQuery
+"""
+import pytest
+from dataclasses import replace
+from datetime import timedelta
+from src.application.queries.listDocuments import ListDocumentsQuery
+from src.domain.exceptions.domainExceptions import AgentNotFoundException
+
+
+@pytest.mark.unit
+class TestListDocumentsQuery:
+    """Pruebas para la query ListDocuments"""
+    
+    @pytest.fixture
+    def query(self, mock_document_repository, mock_agent_repository):
+        """Query con repositorios mock"""
+        return ListDocumentsQuery(mock_document_repository, mock_agent_repository)
+    
+    @pytest.fixture
+    def documents(self, sample_document):
+        """Tres documentos del más reciente al más antiguo"""
+        return [
+            replace(sample_document, id=f"doc-{i}", created_at=sample_document.created_at - timedelta(minutes=i))
+            for i in range(3)
+        ]
+    
+    async def test_list_documents_returns_next_cursor(
+        self, query, mock_agent_repository, mock_document_repository, sample_agent, documents
+    ):
+        """Prueba que se pide un documento extra y se devuelve el cursor de la página siguiente"""
+        # Arrange
+        mock_agent_repository.get_agent_by_id.return_value = sample_agent
+        mock_document_repository.find_page_by_agent_id.return_value = documents
+        mock_document_repository.count_by_agent_id.return_value = 5
+        
+        # Act
+        result = await query.execute(agent_id=str(sample_agent.id), limit=2)
+        
+        # Assert
+        assert [doc.id for doc in result["documents"]] == ["doc-0", "doc-1"]
+        pagination = result["pagination"]
+        assert pagination["total"] == 5
+        assert pagination["has_next"] is True
+        assert ListDocumentsQuery.decode_cursor(pagination["next_cursor"]) == (documents[1].created_at, "doc-1")
+        assert mock_document_repository.find_page_by_agent_id.call_args[1]["limit"] == 3
+    
+    async def test_list_documents_last_page_has_no_cursor(
+        self, query, mock_agent_repository, mock_document_repository, sample_agent, documents
+    ):
+        """Prueba que la última página no devuelve cursor"""
+        # Arrange
+        mock_agent_repository.get_agent_by_id.return_value = sample_agent
+        mock_document_repository.find_page_by_agent_id.return_value = documents
+        mock_document_repository.count_by_agent_id.return_value = 3
+        cursor = ListDocumentsQuery.encode_cursor(documents[0])
+        
+        # Act
+        result = await query.execute(agent_id=str(sample_agent.id), limit=20, after=cursor)
+        
+        # Assert
+        assert result["pagination"]["has_next"] is False
+        assert result["pagination"]["has_previous"] is True
+        assert result["pagination"]["next_cursor"] is None
+        assert mock_document_repository.find_page_by_agent_id.call_args[1]["after"] == (documents[0].created_at, "doc-0")
+    
+    async def test_list_documents_invalid_cursor(self, query, mock_agent_repository, sample_agent):
+        """Prueba error con un cursor mal formado"""
+        # Arrange
+        mock_agent_repository.get_agent_by_id.return_value = sample_agent
+        
+        # Act & Assert
+        with pytest.raises(ValueError, match="Cursor"):
+            await query.execute(agent_id=str(sample_agent.id), after="no-es-un-cursor")
+    
+    async def test_list_documents_agent_not_found(self, query, mock_agent_repository):
+        """Prueba error cuando el agente no existe"""
+        # Arrange
+        mock_agent_repository.get_agent_by_id.return_value = None
+        
+        # Act & Assert
+        with pytest.raises(AgentNotFoundException):
+            await query.execute(agent_id="missing-agent")
@@ -2,25 +2,33 @@
 Pruebas unitarias para UploadDocumentCommand
 """
 import pytest
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import AsyncMock
 from io import BytesIO
-from src.application.commands.uploadDocument import UploadDocumentCommand
-from src.application.dto.documentDto import UploadDocumentDTO
+from src.application.commands.uploadDocument import UploadDocumentCommand, sanitize_filename_for_s3_metadata
+from src.application.dto.documentDto import UploadDocumentDTO, RegisterDocumentDTO
 from src.domain.entities.agent import Agent
 from src.domain.entities.document import Document
 from src.domain.value_objects.agentId import AgentId
 from src.domain.value_objects.documentType import DocumentType
-from src.domain.exceptions.domainExceptions import AgentNotFoundException, FileSizeExceededException, InvalidFileTypeException
+from src.domain.exceptions.domainExceptions import (
+    AgentNotFoundException,
+    FileNotFoundException,
+    FileSizeExceededException,
+    InvalidFileTypeException
+)
 from src.domain.ports.services.fileStorage import FileMetadata
 
+# Contenido compartido; cada DTO recibe su propio BytesIO porque el comando consume el stream
+_TEST_CONTENT = b"test content"
+
 
 @pytest.mark.unit
 class TestUploadDocumentCommand:
     """Pruebas para el comando UploadDocument"""
     
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def command(self, mock_agent_repository, mock_document_repository, mock_file_storage):
-        """Comando con repositorios y storage mock"""
+        """Comando con repositorios y storage mock (sin estado: se comparte en la clase)"""
         return UploadDocumentCommand(
             mock_agent_repository, 
             mock_document_repository, 
@@ -30,7 +38,7 @@ class TestUploadDocumentCommand:
     @pytest.fixture
     def valid_upload_dto(self, sample_agent_id):
         """DTO válido para subir documento"""
-        test_file = BytesIO(b"test content")
+        test_file = BytesIO(_TEST_CONTENT)
         return UploadDocumentDTO(
             agent_id=str(sample_agent_id),
             filename="test_document.pdf",
@@ -50,6 +58,24 @@ class TestUploadDocumentCommand:
             etag="abc123"
         )
     
+    @pytest.fixture
+    def saved_document_factory(self, valid_upload_dto, sample_agent, mock_file_metadata):
+        """Fábrica del documento que devuelve el repositorio al guardar (entidad real, sin mocks)"""
+        def _make(**overrides):
+            return Document(**{
+                "id": "doc-123",
+                "agent_id": sample_agent.id,
+                "filename": valid_upload_dto.filename,
+                "document_type": DocumentType.PDF,
+                "s3_url": mock_file_metadata.url,
+                "s3_key": mock_file_metadata.key,
+                "file_size": valid_upload_dto.file_size,
+                "created_at": sample_agent.created_at,
+                "updated_at": sample_agent.created_at,
+                **overrides
+            })
+        return _make
+    
     async def test_upload_document_success(
         self, 
         command, 
@@ -58,23 +84,15 @@ class TestUploadDocumentCommand:
         mock_file_storage,
         valid_upload_dto, 
         sample_agent, 
-        mock_file_metadata
+        mock_file_metadata,
+        saved_document_factory
     ):
         """Prueba subida exitosa de documento"""
         # Arrange
         mock_agent_repository.get_agent_by_id.return_value = sample_agent
         mock_file_storage.upload_file.return_value = mock_file_metadata
         
-        # Mock del documento guardado
-        saved_document = MagicMock()
-        saved_document.id = "doc-123"
-        saved_document.filename = valid_upload_dto.filename
-        saved_document.s3_url = mock_file_metadata.url
-        saved_document.file_size = valid_upload_dto.file_size
-        saved_document.get_size.return_value = 0.0
-        saved_document.document_type.value = "pdf"
-        saved_document.created_at = sample_agent.created_at
-        saved_document.agent_id = sample_agent.id
+        saved_document = saved_document_factory()
         
         mock_document_repository.save.return_value = saved_document
         mock_agent_repository.save_agent.return_value = sample_agent
@@ -86,6 +104,7 @@ class TestUploadDocumentCommand:
         assert result.filename == valid_upload_dto.filename
         assert result.file_url == mock_file_metadata.url
         assert result.id == "doc-123"
+        assert result.s3_key == mock_file_metadata.key
         
         # Verificar llamadas
         mock_agent_repository.get_agent_by_id.assert_called_once()
@@ -123,7 +142,7 @@ class TestUploadDocumentCommand:
         invalid_dto = UploadDocumentDTO(
             agent_id=str(sample_agent.id),
             filename="test_document.exe",  # Extensión inválida
-            file=BytesIO(b"test content"),
+            file=BytesIO(_TEST_CONTENT),
             content_type="application/x-executable",
             file_size=1024
         )
@@ -145,7 +164,7 @@ class TestUploadDocumentCommand:
         large_file_dto = UploadDocumentDTO(
             agent_id=str(sample_agent.id),
             filename="large_file.pdf",
-            file=BytesIO(b"test content"),
+            file=BytesIO(_TEST_CONTENT),
             content_type="application/pdf",
             file_size=25 * 1024 * 1024  # 25 MB (más del límite)
         )
@@ -182,22 +201,15 @@ class TestUploadDocumentCommand:
         mock_file_storage,
         valid_upload_dto, 
         sample_agent, 
-        mock_file_metadata
+        mock_file_metadata,
+        saved_document_factory
     ):
         """Prueba que se genera la clave S3 correcta"""
         # Arrange
         mock_agent_repository.get_agent_by_id.return_value = sample_agent
         mock_file_storage.upload_file.return_value = mock_file_metadata
         
-        saved_document = MagicMock()
-        saved_document.id = "doc-123"
-        saved_document.filename = valid_upload_dto.filename
-        saved_document.s3_url = mock_file_metadata.url
-        saved_document.file_size = valid_upload_dto.file_size
-        saved_document.get_size.return_value = 0.0
-        saved_document.document_type.value = "pdf"
-        saved_document.created_at = sample_agent.created_at
-        saved_document.agent_id = sample_agent.id
+        saved_document = saved_document_factory()
         
         mock_document_repository.save.return_value = saved_document
         mock_agent_repository.save_agent.return_value = sample_agent
@@ -219,23 +231,20 @@ class TestUploadDocumentCommand:
         mock_file_storage,
         valid_upload_dto, 
         sample_agent, 
-        mock_file_metadata
+        mock_file_metadata,
+        saved_document_factory,
+        _sample_agent_base
     ):
         """Prueba que se actualiza el contador de documentos del agente"""
-        # Arrange
+        # Arrange: sample_agent es una copia propia de la base, que es de sesión
+        # y la comparten todas las pruebas: el comando solo debe modificar la copia
+        assert sample_agent is not _sample_agent_base
         initial_count = sample_agent.documents_count
+        assert initial_count == 0
         mock_agent_repository.get_agent_by_id.return_value = sample_agent
         mock_file_storage.upload_file.return_value = mock_file_metadata
         
-        saved_document = MagicMock()
-        saved_document.id = "doc-123"
-        saved_document.filename = valid_upload_dto.filename
-        saved_document.s3_url = mock_file_metadata.url
-        saved_document.file_size = valid_upload_dto.file_size
-        saved_document.get_size.return_value = 0.0
-        saved_document.document_type.value = "pdf"
-        saved_document.created_at = sample_agent.created_at
-        saved_document.agent_id = sample_agent.id
+        saved_document = saved_document_factory()
         
         mock_document_repository.save.return_value = saved_document
         mock_agent_repository.save_agent.return_value = sample_agent
@@ -245,6 +254,7 @@ class TestUploadDocumentCommand:
         
         # Assert
         assert sample_agent.documents_count == initial_count + 1
+        assert _sample_agent_base.documents_count == 0
         mock_agent_repository.save_agent.assert_called_once_with(sample_agent)
     
     async def test_upload_document_save_error(
@@ -266,3 +276,155 @@ class TestUploadDocumentCommand:
         # Act & Assert
         with pytest.raises(Exception, match="no se guardó correctamente"):
             await command.execute(valid_upload_dto)
+    
+    async def test_create_upload_url_success(
+        self,
+        command,
+        mock_agent_repository,
+        mock_file_storage,
+        sample_agent
+    ):
+        """Prueba la generación del POST presignado para subida directa"""
+        # Arrange
+        mock_agent_repository.get_agent_by_id.return_value = sample_agent
+        mock_file_storage.generate_presigned_post.return_value = {
+            "url": "https://bucket.s3.amazonaws.com/",
+            "fields": {"key": "k", "policy": "p"}
+        }
+        
+        # Act
+        result = await command.create_upload_url(
+            agent_id=str(sample_agent.id),
+            filename="test_document.pdf",
+            content_type="application/pdf",
+            max_size=10 * 1024 * 1024
+        )
+        
+        # Assert
+        expected_key = f"agents/{sample_agent.id}/test_document.pdf"
+        assert result.s3_key == expected_key
+        assert result.url == "https://bucket.s3.amazonaws.com/"
+        assert result.fields == {"key": "k", "policy": "p"}
+        call_args = mock_file_storage.generate_presigned_post.call_args
+        assert call_args[1]['key'] == expected_key
+        assert call_args[1]['max_size'] == 10 * 1024 * 1024
+    
+    async def test_create_upload_url_invalid_file_type(
+        self,
+        command,
+        mock_agent_repository,
+        mock_file_storage,
+        sample_agent
+    ):
+        """Prueba que no se genera URL para extensiones no soportadas"""
+        # Arrange
+        mock_agent_repository.get_agent_by_id.return_value = sample_agent
+        
+        # Act & Assert
+        with pytest.raises(InvalidFileTypeException):
+            await command.create_upload_url(
+                agent_id=str(sample_agent.id),
+                filename="test_document.exe",
+                content_type="application/x-executable",
+                max_size=1024
+            )
+        mock_file_storage.generate_presigned_post.assert_not_called()
+    
+    async def test_register_uses_stored_file_size(
+        self,
+        command,
+        mock_agent_repository,
+        mock_document_repository,
+        mock_file_storage,
+        sample_agent,
+        mock_file_metadata
+    ):
+        """Prueba que el registro toma el tamaño del objeto almacenado en S3"""
+        # Arrange
+        mock_agent_repository.get_agent_by_id.return_value = sample_agent
+        mock_file_storage.get_file_metadata.return_value = mock_file_metadata
+        mock_document_repository.save.side_effect = lambda document: document
+        dto = RegisterDocumentDTO(
+            agent_id=str(sample_agent.id),
+            filename="test_document.pdf",
+            s3_key=mock_file_metadata.key,
+            content_type="application/pdf"
+        )
+        
+        # Act
+        result = await command.register(dto)
+        
+        # Assert
+        assert result.file_size == mock_file_metadata.size
+        assert result.s3_key == mock_file_metadata.key
+        mock_file_storage.upload_file.assert_not_called()
+        mock_agent_repository.save_agent.assert_called_once_with(sample_agent)
+    
+    async def test_register_missing_object(
+        self,
+        command,
+        mock_agent_repository,
+        mock_document_repository,
+        mock_file_storage,
+        sample_agent,
+        mock_file_metadata
+    ):
+        """Prueba error cuando el archivo no fue subido a S3"""
+        # Arrange
+        mock_agent_repository.get_agent_by_id.return_value = sample_agent
+        mock_file_storage.get_file_metadata.return_value = None
+        dto = RegisterDocumentDTO(
+            agent_id=str(sample_agent.id),
+            filename="test_document.pdf",
+            s3_key=mock_file_metadata.key,
+            content_type="application/pdf"
+        )
+        
+        # Act & Assert
+        with pytest.raises(FileNotFoundException):
+            await command.register(dto)
+        mock_document_repository.save.assert_not_called()
+    
+    async def test_register_rejects_foreign_key(
+        self,
+        command,
+        mock_agent_repository,
+        mock_file_storage,
+        sample_agent
+    ):
+        """Prueba que no se registran claves S3 de otro agente o archivo"""
+        # Arrange
+        mock_agent_repository.get_agent_by_id.return_value = sample_agent
+        dto = RegisterDocumentDTO(
+            agent_id=str(sample_agent.id),
+            filename="test_document.pdf",
+            s3_key="agents/other-agent/test_document.pdf",
+            content_type="application/pdf"
+        )
+        
+        # Act & Assert
+        with pytest.raises(FileNotFoundException):
+            await command.register(dto)
+        mock_file_storage.get_file_metadata.assert_not_called()
+
+
+@pytest.mark.unit
+class TestSanitizeFilenameForS3Metadata:
+    """Pruebas para la sanitización del nombre en metadatos de S3"""
+    
+    def test_ascii_filename_only_replaces_unsafe_chars(self):
+        """Prueba que un nombre ASCII solo sustituye caracteres problemáticos"""
+        # Act
+        result = sanitize_filename_for_s3_metadata('  informe: "final"?.pdf ')
+        
+        # Assert
+        assert result == 'informe_ _final__.pdf'
+    
+    def test_unicode_filename_is_transliterated(self):
+        """Prueba que acentos y caracteres especiales se convierten a ASCII"""
+        # Act
+        result = sanitize_filename_for_s3_metadata('Año_Straße_café_中.docx')
+        
+        # Assert
+        assert result == 'Ano_Strasse_cafe__.docx'
+        assert result.isascii()
@@ -0,0 +1,37 @@
+"""
+Pruebas de rendimiento para la creación de agentes (requieren pytest-benchmark)
+
+Para guardar y comparar una línea base:
+    pytest tests/unit/domain/test_agent_benchmarks.py --benchmark-autosave
+    pytest tests/unit/domain/test_agent_benchmarks.py --benchmark-compare
+"""
+import pytest
+from src.domain.entities.agent import Agent
+from src.domain.value_objects.agentId import AgentId
+
+pytest.importorskip("pytest_benchmark")
+
+
+@pytest.mark.unit
+class TestAgentBenchmarks:
+    """Mide las rutas de creación de agentes que se ejecutan en cada alta"""
+
+    def test_agent_id_generation(self, benchmark):
+        """Mide AgentId.generate y comprueba que sigue generando IDs válidos"""
+        # Act
+        agent_id = benchmark(AgentId.generate)
+
+        # Assert
+        assert isinstance(agent_id, AgentId)
+
+    def test_agent_create(self, benchmark):
+        """Mide Agent.create con su validación completa"""
+        # Act
+        agent = benchmark.pedantic(
+            Agent.create,
+            args=("Agente Test", "Este es un prompt de prueba con suficientes caracteres."),
+            rounds=1000
+        )
+
+        # Assert
+        assert agent.name == "Agente Test"
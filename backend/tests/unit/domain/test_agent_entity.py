@@ -6,12 +6,17 @@ from datetime import datetime
 from src.domain.entities.agent import Agent
 from src.domain.value_objects.agentId import AgentId
 
+# Valores válidos que acompañan al campo inválido en cada caso
+_VALID_NAME = "Agente Test"
+_VALID_PROMPT = "Prompt válido con suficientes caracteres."
+_FIXED_TIMESTAMP = datetime(2024, 1, 1, 12, 0, 0)
+
 
 @pytest.mark.unit
 class TestAgentEntity:
     """Pruebas para la entidad Agent"""
     
-    def test_create_agent_success(self):
+    def test_create_agent_success(self, frozen_time):
         """Prueba creación exitosa de un agente"""
         # Arrange
         name = "Agente Test"
@@ -25,58 +30,20 @@ class TestAgentEntity:
         assert agent.prompt == prompt
         assert agent.documents_count == 0
         assert isinstance(agent.id, AgentId)
-        assert isinstance(agent.created_at, datetime)
-        assert isinstance(agent.updated_at, datetime)
-        assert agent.created_at == agent.updated_at
-    
-    def test_agent_name_validation_empty(self):
-        """Prueba validación de nombre vacío"""
-        # Arrange
-        name = ""
-        prompt = "Prompt válido con suficientes caracteres."
-        
-        # Act & Assert
-        with pytest.raises(ValueError, match="Agent name cannot be empty"):
-            Agent.create(name, prompt)
-    
-    def test_agent_name_validation_too_long(self):
-        """Prueba validación de nombre demasiado largo"""
-        # Arrange
-        name = "A" * 31  # 31 caracteres
-        prompt = "Prompt válido con suficientes caracteres."
-        
-        # Act & Assert
-        with pytest.raises(ValueError, match="Agent name must be at most 30 characters"):
-            Agent.create(name, prompt)
-    
-    def test_agent_prompt_validation_empty(self):
-        """Prueba validación de prompt vacío"""
-        # Arrange
-        name = "Agente Test"
-        prompt = ""
-        
-        # Act & Assert
-        with pytest.raises(ValueError, match="Agent prompt cannot be empty"):
-            Agent.create(name, prompt)
+        assert agent.created_at == frozen_time
+        assert agent.updated_at == frozen_time
     
-    def test_agent_prompt_validation_too_short(self):
-        """Prueba validación de prompt demasiado corto"""
-        # Arrange
-        name = "Agente Test"
-        prompt = "Corto"  # Menos de 10 caracteres
-        
-        # Act & Assert
-        with pytest.raises(ValueError, match="Agent prompt must be at least 10 characters"):
-            Agent.create(name, prompt)
-    
-    def test_agent_prompt_validation_too_long(self):
-        """Prueba validación de prompt demasiado largo"""
-        # Arrange
-        name = "Agente Test"
-        prompt = "A" * 2001  # Más de 2000 caracteres
-        
+    @pytest.mark.parametrize("name, prompt, message", [
+        ("", _VALID_PROMPT, "Agent name cannot be empty"),
+        ("A" * 31, _VALID_PROMPT, "Agent name must be at most 30 characters"),
+        (_VALID_NAME, "", "Agent prompt cannot be empty"),
+        (_VALID_NAME, "Corto", "Agent prompt must be at least 10 characters"),
+        (_VALID_NAME, "A" * 2001, "Agent prompt must be at most 2000 characters")
+    ], ids=["name_empty", "name_too_long", "prompt_empty", "prompt_too_short", "prompt_too_long"])
+    def test_agent_create_invalid(self, name, prompt, message):
+        """Prueba que los nombres y prompts fuera de los límites se rechazan"""
         # Act & Assert
-        with pytest.raises(ValueError, match="Agent prompt must be at most 2000 characters"):
+        with pytest.raises(ValueError, match=message):
             Agent.create(name, prompt)
     
     def test_agent_update_name(self, sample_agent):
@@ -135,7 +102,7 @@ class TestAgentEntity:
         agent_id = AgentId.generate()
         name = "Agente Test"
         prompt = "Prompt de prueba con suficientes caracteres."
-        created_at = datetime.now()
+        created_at = _FIXED_TIMESTAMP
         
         agent1 = Agent(
             id=agent_id,
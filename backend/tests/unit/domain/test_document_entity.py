@@ -7,12 +7,17 @@ from src.domain.entities.document import Document
 from src.domain.value_objects.agentId import AgentId
 from src.domain.value_objects.documentType import DocumentType
 
+_FIXED_TIMESTAMP = datetime(2025, 1, 1, 12, 0, 0)
+_LONG_NAME = "A" * 101  # Uno más que el máximo de 100 caracteres
+_OVERSIZE = 21 * 1024 * 1024  # 21 MB (más del límite de 20MB)
+_FIVE_MB = 5 * 1024 * 1024
+
 
 @pytest.mark.unit
 class TestDocumentEntity:
     """Pruebas para la entidad Document"""
     
-    def test_create_document_success(self, sample_agent_id):
+    def test_create_document_success(self, sample_agent_id, frozen_time):
         """Prueba creación exitosa de un documento"""
         # Arrange
         filename = "test_document.pdf"
@@ -39,89 +44,32 @@ class TestDocumentEntity:
         assert document.s3_key == s3_key
         assert document.file_size == file_size
         assert isinstance(document.id, str)
-        assert isinstance(document.created_at, datetime)
-        assert isinstance(document.updated_at, datetime)
-        assert document.created_at == document.updated_at
-    
-    def test_document_filename_validation_empty(self, sample_agent_id):
-        """Prueba validación de filename vacío"""
-        # Arrange
-        filename = ""
-        
-        # Act & Assert
-        with pytest.raises(ValueError, match="File name cannot be empty"):
-            Document.create(
-                agent_id=sample_agent_id,
-                filename=filename,
-                document_type=DocumentType.PDF,
-                s3_url="https://test.com/file.pdf",
-                s3_key="test/file.pdf",
-                file_size=1024
-            )
-    
-    def test_document_filename_validation_too_long(self, sample_agent_id):
-        """Prueba validación de filename demasiado largo"""
-        # Arrange
-        filename = "A" * 101  # Más de 100 caracteres
-        
-        # Act & Assert
-        with pytest.raises(ValueError, match="File name must be at most 100 characters"):
-            Document.create(
-                agent_id=sample_agent_id,
-                filename=filename,
-                document_type=DocumentType.PDF,
-                s3_url="https://test.com/file.pdf",
-                s3_key="test/file.pdf",
-                file_size=1024
-            )
-    
-    def test_document_file_size_validation_zero(self, sample_agent_id):
-        """Prueba validación de tamaño de archivo cero"""
-        # Arrange
-        file_size = 0
-        
-        # Act & Assert
-        with pytest.raises(ValueError, match="File size must be a positive integer"):
-            Document.create(
-                agent_id=sample_agent_id,
-                filename="test.pdf",
-                document_type=DocumentType.PDF,
-                s3_url="https://test.com/file.pdf",
-                s3_key="test/file.pdf",
-                file_size=file_size
-            )
-    
-    def test_document_file_size_validation_negative(self, sample_agent_id):
-        """Prueba validación de tamaño de archivo negativo"""
-        # Arrange
-        file_size = -100
-        
-        # Act & Assert
-        with pytest.raises(ValueError, match="File size must be a positive integer"):
-            Document.create(
-                agent_id=sample_agent_id,
-                filename="test.pdf",
-                document_type=DocumentType.PDF,
-                s3_url="https://test.com/file.pdf",
-                s3_key="test/file.pdf",
-                file_size=file_size
-            )
+        assert document.created_at == frozen_time
+        assert document.updated_at == frozen_time
     
-    def test_document_file_size_validation_too_large(self, sample_agent_id):
-        """Prueba validación de tamaño de archivo demasiado grande"""
+    @pytest.mark.parametrize("field, value, message", [
+        ("filename", "", "File name cannot be empty"),
+        ("filename", _LONG_NAME, "File name must be at most 100 characters"),
+        ("file_size", 0, "File size must be a positive integer"),
+        ("file_size", -100, "File size must be a positive integer"),
+        ("file_size", _OVERSIZE, "File size must not exceed")
+    ], ids=["filename_empty", "filename_too_long", "size_zero", "size_negative", "size_too_large"])
+    def test_document_validation_errors(self, sample_agent_id, field, value, message):
+        """Prueba que los nombres y tamaños fuera de los límites se rechazan"""
         # Arrange
-        file_size = 21 * 1024 * 1024  # 21 MB (más del límite de 20MB)
+        kwargs = {
+            "agent_id": sample_agent_id,
+            "filename": "test.pdf",
+            "document_type": DocumentType.PDF,
+            "s3_url": "https://test.com/file.pdf",
+            "s3_key": "test/file.pdf",
+            "file_size": 1024,
+            field: value
+        }
         
         # Act & Assert
-        with pytest.raises(ValueError, match="File size must not exceed"):
-            Document.create(
-                agent_id=sample_agent_id,
-                filename="test.pdf",
-                document_type=DocumentType.PDF,
-                s3_url="https://test.com/file.pdf",
-                s3_key="test/file.pdf",
-                file_size=file_size
-            )
+        with pytest.raises(ValueError, match=message):
+            Document.create(**kwargs)
     
     def test_get_extension(self, sample_document):
         """Prueba obtener extensión del archivo"""
@@ -139,18 +87,10 @@ class TestDocumentEntity:
         # Assert
         assert size_mb == 0.0  # 1024 bytes = 0.00 MB (redondeado)
     
-    def test_get_size_larger_file(self, sample_agent_id):
+    def test_get_size_larger_file(self, make_document):
         """Prueba obtener tamaño en MB para archivo más grande"""
         # Arrange
-        file_size = 5 * 1024 * 1024  # 5 MB
-        document = Document.create(
-            agent_id=sample_agent_id,
-            filename="large_file.pdf",
-            document_type=DocumentType.PDF,
-            s3_url="https://test.com/large_file.pdf",
-            s3_key="test/large_file.pdf",
-            file_size=file_size
-        )
+        document = make_document(filename="large_file.pdf", file_size=_FIVE_MB)
         
         # Act
         size_mb = document.get_size()
@@ -158,26 +98,11 @@ class TestDocumentEntity:
         # Assert
         assert size_mb == 5.0
     
-    def test_document_with_different_types(self, sample_agent_id):
+    def test_document_with_different_types(self, make_document):
         """Prueba creación de documentos con diferentes tipos"""
         # Arrange & Act
-        pdf_doc = Document.create(
-            agent_id=sample_agent_id,
-            filename="test.pdf",
-            document_type=DocumentType.PDF,
-            s3_url="https://test.com/test.pdf",
-            s3_key="test/test.pdf",
-            file_size=1024
-        )
-        
-        docx_doc = Document.create(
-            agent_id=sample_agent_id,
-            filename="test.docx",
-            document_type=DocumentType.DOCX,
-            s3_url="https://test.com/test.docx",
-            s3_key="test/test.docx",
-            file_size=2048
-        )
+        pdf_doc = make_document()
+        docx_doc = make_document(filename="test.docx", document_type=DocumentType.DOCX, file_size=2048)
         
         # Assert
         assert pdf_doc.document_type == DocumentType.PDF
@@ -199,8 +124,8 @@ class TestDocumentEntity:
             s3_url="https://test.com/test.pdf",
             s3_key="test/test.pdf",
             file_size=1024,
-            created_at=datetime.now(),
-            updated_at=datetime.now()
+            created_at=_FIXED_TIMESTAMP,
+            updated_at=_FIXED_TIMESTAMP
         )
         
         doc2 = Document(
@@ -211,8 +136,8 @@ class TestDocumentEntity:
             s3_url="https://test.com/test.pdf",
             s3_key="test/test.pdf",
             file_size=1024,
-            created_at=datetime.now(),
-            updated_at=datetime.now()
+            created_at=_FIXED_TIMESTAMP,
+            updated_at=_FIXED_TIMESTAMP
         )
         
         # Act & Assert
@@ -64,6 +64,15 @@ class TestAgentId:
         # Debe poder usarse en sets y diccionarios
         agent_set = {agent_id}
         assert agent_id in agent_set
+        assert hash(AgentId(agent_id.value)) == hash_value
+    
+    def test_agent_id_uses_slots(self):
+        """Prueba que AgentId no reserva un __dict__ por instancia"""
+        # Arrange
+        agent_id = AgentId.generate()
+        
+        # Act & Assert
+        assert not hasattr(agent_id, "__dict__")
 
 
 @pytest.mark.unit
@@ -80,41 +89,38 @@ class TestDocumentType:
         assert DocumentType.TXT.value == "txt"
         assert DocumentType.CSV.value == "csv"
     
-    def test_from_extension_valid(self):
+    @pytest.mark.parametrize("extension, expected", [
+        (".pdf", DocumentType.PDF),
+        ("pdf", DocumentType.PDF),
+        (".DOCX", DocumentType.DOCX),
+        ("txt", DocumentType.TXT)
+    ])
+    def test_from_extension_valid(self, extension, expected):
         """Prueba creación desde extensión válida"""
-        # Arrange & Act & Assert
-        assert DocumentType.from_extension(".pdf") == DocumentType.PDF
-        assert DocumentType.from_extension("pdf") == DocumentType.PDF
-        assert DocumentType.from_extension(".DOCX") == DocumentType.DOCX
-        assert DocumentType.from_extension("txt") == DocumentType.TXT
+        # Act & Assert
+        assert DocumentType.from_extension(extension) == expected
     
-    def test_from_extension_invalid(self):
+    @pytest.mark.parametrize("extension", [".exe", "unknown", ""])
+    def test_from_extension_invalid(self, extension):
         """Prueba creación desde extensión inválida"""
         # Act & Assert
         with pytest.raises(ValueError, match="Unsupported file extension"):
-            DocumentType.from_extension(".exe")
-        
-        with pytest.raises(ValueError, match="Unsupported file extension"):
-            DocumentType.from_extension("unknown")
-        
-        with pytest.raises(ValueError, match="Unsupported file extension"):
-            DocumentType.from_extension("")
-    
-    def test_is_valid_extension_true(self):
-        """Prueba validación de extensiones válidas"""
-        # Act & Assert
-        assert DocumentType.is_valid_extension(".pdf") is True
-        assert DocumentType.is_valid_extension("docx") is True
-        assert DocumentType.is_valid_extension(".XLSX") is True
-        assert DocumentType.is_valid_extension("TXT") is True
+            DocumentType.from_extension(extension)
     
-    def test_is_valid_extension_false(self):
-        """Prueba validación de extensiones inválidas"""
+    @pytest.mark.parametrize("extension, expected", [
+        (".pdf", True),
+        ("docx", True),
+        (".XLSX", True),
+        ("TXT", True),
+        (".exe", False),
+        ("unknown", False),
+        ("", False),
+        (None, False)
+    ])
+    def test_is_valid_extension(self, extension, expected):
+        """Prueba validación de extensiones válidas e inválidas"""
         # Act & Assert
-        assert DocumentType.is_valid_extension(".exe") is False
-        assert DocumentType.is_valid_extension("unknown") is False
-        assert DocumentType.is_valid_extension("") is False
-        assert DocumentType.is_valid_extension(None) is False
+        assert DocumentType.is_valid_extension(extension) is expected
     
     def test_get_all_extensions(self):
         """Prueba obtener todas las extensiones soportadas"""
@@ -125,6 +131,8 @@ class TestDocumentType:
         expected_extensions = ["pdf", "docx", "xlsx", "pptx", "txt", "csv"]
         assert set(extensions) == set(expected_extensions)
         assert len(extensions) == len(expected_extensions)
+        assert isinstance(extensions, tuple)
+        assert DocumentType.get_all_extensions() is extensions
     
     def test_document_type_string_representation(self):
         """Prueba representación string de DocumentType"""
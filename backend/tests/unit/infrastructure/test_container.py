@@ -0,0 +1,116 @@
+"""
+Pruebas unitarias para el contenedor de dependencias
+"""
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from src.infrastructure.config import container as container_module
+from src.infrastructure.config.container import Container
+from src.application.queries.listAgents import ListAgentsQuery
+from src.domain.exceptions.domainExceptions import StorageException
+
+
+@pytest.mark.unit
+class TestContainer:
+    """Pruebas para Container.initialize"""
+    
+    @pytest.fixture
+    def get_database(self, monkeypatch):
+        """Sustituye la conexión a MongoDB por una base de datos mock"""
+        get_database = AsyncMock(return_value=MagicMock())
+        monkeypatch.setattr(container_module, "get_database", get_database)
+        return get_database
+    
+    @pytest.fixture
+    def s3_storage(self, monkeypatch):
+        """Sustituye S3FileStorage para que las pruebas decidan si falla"""
+        s3_storage = MagicMock()
+        monkeypatch.setattr(container_module, "S3FileStorage", s3_storage)
+        return s3_storage
+    
+    async def test_mongo_handlers_available_when_s3_fails(self, get_database, s3_storage):
+        """Prueba que las rutas de solo MongoDB siguen funcionando si S3 no está disponible"""
+        # Arrange
+        s3_storage.side_effect = Exception("Could not connect to the endpoint URL")
+        container = Container()
+        
+        # Act
+        await container.initialize()
+        
+        # Assert
+        assert container.initialized is True
+        assert isinstance(container.list_agents_query(), ListAgentsQuery)
+        with pytest.raises(StorageException, match="File storage unavailable"):
+            container.upload_document_command()
+    
+    async def test_storage_handlers_retried_after_s3_recovers(self, get_database, s3_storage):
+        """Prueba que los handlers de almacenamiento se construyen cuando S3 vuelve"""
+        # Arrange
+        s3_storage.side_effect = [Exception("S3 down"), MagicMock()]
+        container = Container()
+        await container.initialize()
+        
+        # Act
+        command = container.upload_document_command()
+        
+        # Assert
+        assert command is container.upload_document_command()
+        assert s3_storage.call_count == 2
+    
+    async def test_mongo_down_at_startup_does_not_pin_storage_handlers(self, get_database, s3_storage):
+        """Prueba que con MongoDB caído y S3 disponible los handlers se construyen al volver MongoDB"""
+        # Arrange
+        s3_storage.return_value.ensure_bucket_exists = AsyncMock()
+        database = MagicMock()
+        get_database.side_effect = [Exception("Cannot initialize database connection"), database]
+        container = Container()
+        
+        # Act: arranque como en el lifespan, con MongoDB caído
+        with pytest.raises(Exception, match="Failed to initialize database connection"):
+            await container.initialize()
+        await container.ensure_storage_bucket()
+        
+        # Assert: S3 verificado, pero sin handlers construidos con repositorios None
+        s3_storage.return_value.ensure_bucket_exists.assert_awaited_once()
+        assert container.initialized is False
+        with pytest.raises(Exception, match="Repositories not initialized"):
+            container.create_agent_command()
+        
+        # Act: MongoDB vuelve y la siguiente request reintenta
+        await container.initialize()
+        command = container.create_agent_command()
+        
+        # Assert
+        assert command.agent_repository is not None
+        assert command.file_storage is s3_storage.return_value
+    
+    @pytest.mark.parametrize("batch_writes", [False, True], ids=["default_direct", "opt_in_batched"])
+    async def test_document_writes_batched_only_when_enabled(self, get_database, monkeypatch, batch_writes):
+        """Prueba que el agrupado de escrituras depende de la configuración (desactivado por defecto)"""
+        # Arrange
+        container = Container()
+        monkeypatch.setattr(container.settings, "mongodb_batch_writes", batch_writes)
+        
+        # Act
+        repository = await container.document_repository
+        
+        # Assert
+        assert (repository._bulk_writer is not None) is batch_writes
+    
+    async def test_concurrent_initialize_connects_once(self, get_database, s3_storage):
+        """Prueba que las primeras requests concurrentes no repiten la inicialización"""
+        # Arrange
+        async def slow_connect():
+            # Cede el event loop como una conexión real, para que las requests se solapen
+            await asyncio.sleep(0)
+            return MagicMock()
+        
+        get_database.side_effect = slow_connect
+        container = Container()
+        
+        # Act
+        await asyncio.gather(*(container.initialize() for _ in range(5)))
+        
+        # Assert
+        get_database.assert_awaited_once()
+        s3_storage.assert_called_once()
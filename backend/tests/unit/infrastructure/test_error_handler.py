@@ -0,0 +1,93 @@
+"""
+Pruebas unitarias para los manejadores de errores de la API
+"""
+import json
+import pytest
+from starlette.requests import Request
+from starlette.exceptions import HTTPException
+from src.infrastructure.api.middleware import errorHandler
+from src.infrastructure.api.middleware.errorHandler import (
+    domain_exception_handler,
+    generic_exception_handler,
+    http_exception_handler
+)
+from src.domain.exceptions.domainExceptions import AgentNotFoundException
+
+
+def build_request(path: str) -> Request:
+    """Construye un Request mínimo de Starlette para los handlers"""
+    return Request({
+        "type": "http",
+        "method": "GET",
+        "path": path,
+        "query_string": b"",
+        "headers": [],
+        "scheme": "http",
+        "server": ("test", 80)
+    })
+
+
+@pytest.mark.unit
+class TestErrorHandler:
+    """Pruebas para las respuestas de error precalculadas"""
+
+    async def test_agent_not_found_uses_template(self):
+        """Prueba que el 404 de agente mantiene el formato estándar"""
+        # Act
+        response = await domain_exception_handler(
+            build_request("/api/v1/agents/missing"),
+            AgentNotFoundException("missing")
+        )
+
+        # Assert
+        assert response.status_code == 404
+        assert response.media_type == "application/json"
+        error = json.loads(response.body)["error"]
+        assert error["type"] == "AGENT_NOT_FOUND"
+        assert error["status_code"] == 404
+        assert error["path"] == "/api/v1/agents/missing"
+        assert "missing" in error["message"]
+        assert error["details"] == {"resource": "agent", "action": "Verifica el ID del agente"}
+
+    async def test_template_escapes_dynamic_fields(self):
+        """Prueba que comillas y marcadores en la entrada no rompen el JSON"""
+        # Arrange
+        agent_id = 'x"__PATH__'
+        path = '/api/v1/agents/"__TS__'
+
+        # Act
+        response = await domain_exception_handler(build_request(path), AgentNotFoundException(agent_id))
+
+        # Assert
+        error = json.loads(response.body)["error"]
+        assert error["path"] == path
+        assert agent_id in error["message"]
+
+    async def test_method_not_allowed_uses_template(self):
+        """Prueba la respuesta precalculada para 405"""
+        # Act
+        response = await http_exception_handler(build_request("/api/v1/agents"), HTTPException(405))
+
+        # Assert
+        assert response.status_code == 405
+        error = json.loads(response.body)["error"]
+        assert error["type"] == "HTTP_ERROR"
+        assert error["message"] == "Método no permitido para este endpoint"
+        assert error["path"] == "/api/v1/agents"
+
+    async def test_traceback_is_sampled_per_exception_type(self, monkeypatch):
+        """Prueba que el traceback se formatea una vez por tipo dentro del intervalo"""
+        # Arrange
+        calls = []
+        monkeypatch.setattr(errorHandler, "_last_traceback_at", {})
+        monkeypatch.setattr(errorHandler.traceback, "format_exc", lambda: calls.append(1) or "tb")
+        request = build_request("/api/v1/agents")
+
+        # Act
+        for _ in range(3):
+            await generic_exception_handler(request, RuntimeError("boom"))
+        response = await generic_exception_handler(request, KeyError("k"))
+
+        # Assert
+        assert response.status_code == 500
+        assert len(calls) == 2
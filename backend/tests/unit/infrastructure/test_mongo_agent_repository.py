@@ -9,13 +9,37 @@ from src.domain.entities.agent import Agent
 from src.domain.value_objects.agentId import AgentId
 
 
+class _FakeCursor:
+    """Cursor mínimo de Motor: encadena skip/limit/sort y registra las llamadas"""
+    
+    def __init__(self, documents):
+        self.documents = documents
+        self.calls = []
+    
+    def skip(self, n):
+        self.calls.append(("skip", n))
+        return self
+    
+    def limit(self, n):
+        self.calls.append(("limit", n))
+        return self
+    
+    def sort(self, key, direction):
+        self.calls.append(("sort", key, direction))
+        return self
+    
+    async def __aiter__(self):
+        for document in self.documents:
+            yield document
+
+
 @pytest.mark.unit
 class TestMongoAgentRepository:
     """Pruebas para MongoAgentRepository"""
     
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def mock_collection(self):
-        """Mock de la colección MongoDB"""
+        """Mock de la colección MongoDB (se construye una vez y se reinicia tras cada prueba)"""
         collection = MagicMock()
         
         # Configurar métodos async específicos
@@ -26,18 +50,24 @@ class TestMongoAgentRepository:
         
         return collection
     
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def mock_database(self, mock_collection):
         """Mock de la base de datos MongoDB"""
         mock_db = MagicMock()
         mock_db.__getitem__.return_value = mock_collection
         return mock_db
     
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def repository(self, mock_database):
-        """Repositorio con base de datos mock"""
+        """Repositorio con base de datos mock (sin estado propio: se comparte en la clase)"""
         return MongoAgentRepository(mock_database)
     
+    @pytest.fixture(autouse=True)
+    def _reset_collection(self, mock_collection):
+        """Borra llamadas, valores de retorno y side effects que configuró la prueba"""
+        yield
+        mock_collection.reset_mock(return_value=True, side_effect=True)
+    
     @pytest.fixture
     def agent_document_data(self):
         """Datos de documento MongoDB para un agente"""
@@ -50,7 +80,6 @@ class TestMongoAgentRepository:
             "updated_at": datetime(2025, 1, 1, 11, 0, 0)
         }
     
-    @pytest.mark.asyncio
     async def test_save_agent_success(self, repository, mock_collection, sample_agent):
         """Prueba guardado exitoso de agente"""
         # Arrange
@@ -72,7 +101,6 @@ class TestMongoAgentRepository:
         assert document_dict["name"] == sample_agent.name
         assert document_dict["prompt"] == sample_agent.prompt
     
-    @pytest.mark.asyncio
     async def test_get_agent_by_id_found(self, repository, mock_collection, agent_document_data):
         """Prueba obtener agente por ID cuando existe"""
         # Arrange
@@ -91,7 +119,6 @@ class TestMongoAgentRepository:
         
         mock_collection.find_one.assert_called_once_with({"_id": "test-agent-123"})
     
-    @pytest.mark.asyncio
     async def test_get_agent_by_id_not_found(self, repository, mock_collection):
         """Prueba obtener agente por ID cuando no existe"""
         # Arrange
@@ -105,7 +132,6 @@ class TestMongoAgentRepository:
         assert result is None
         mock_collection.find_one.assert_called_once_with({"_id": "nonexistent-agent"})
     
-    @pytest.mark.asyncio
     async def test_get_agent_by_name_found(self, repository, mock_collection, agent_document_data):
         """Prueba obtener agente por nombre cuando existe"""
         # Arrange
@@ -120,7 +146,6 @@ class TestMongoAgentRepository:
         assert result.name == agent_name
         mock_collection.find_one.assert_called_once_with({"name": agent_name})
     
-    @pytest.mark.asyncio
     async def test_get_agent_by_name_not_found(self, repository, mock_collection):
         """Prueba obtener agente por nombre cuando no existe"""
         # Arrange
@@ -134,24 +159,11 @@ class TestMongoAgentRepository:
         assert result is None
         mock_collection.find_one.assert_called_once_with({"name": agent_name})
     
-    @pytest.mark.asyncio
     async def test_get_all_agents(self, repository, mock_collection, agent_document_data):
         """Prueba obtener todos los agentes con paginación"""
         # Arrange
-        # Crear un mock cursor que soporte el chaining de métodos
-        mock_cursor = MagicMock()
-        
-        # Configurar el chaining: find().skip().limit().sort()
-        mock_cursor.skip.return_value = mock_cursor
-        mock_cursor.limit.return_value = mock_cursor
-        mock_cursor.sort.return_value = mock_cursor
-        
-        # Configurar el async iteration
-        async def mock_async_iter(self):
-            yield agent_document_data
-        
-        mock_cursor.__aiter__ = mock_async_iter
-        mock_collection.find.return_value = mock_cursor
+        cursor = _FakeCursor([agent_document_data])
+        mock_collection.find.return_value = cursor
         
         # Act
         result = await repository.get_all(skip=0, limit=10)
@@ -160,12 +172,9 @@ class TestMongoAgentRepository:
         assert len(result) == 1
         assert result[0].name == "Agente Test"
         
-        mock_collection.find.assert_called_once()
-        mock_cursor.skip.assert_called_once_with(0)
-        mock_cursor.limit.assert_called_once_with(10)
-        mock_cursor.sort.assert_called_once_with("created_at", -1)
+        mock_collection.find.assert_called_once_with()
+        assert cursor.calls == [("skip", 0), ("limit", 10), ("sort", "created_at", -1)]
     
-    @pytest.mark.asyncio
     async def test_delete_agent_success(self, repository, mock_collection):
         """Prueba eliminación exitosa de agente"""
         # Arrange
@@ -179,7 +188,6 @@ class TestMongoAgentRepository:
         assert result is True
         mock_collection.delete_one.assert_called_once_with({"_id": "test-agent-123"})
     
-    @pytest.mark.asyncio
     async def test_delete_agent_not_found(self, repository, mock_collection):
         """Prueba eliminación de agente que no existe"""
         # Arrange
@@ -193,39 +201,38 @@ class TestMongoAgentRepository:
         assert result is False
         mock_collection.delete_one.assert_called_once_with({"_id": "nonexistent-agent"})
     
-    @pytest.mark.asyncio
     async def test_exists_agent_true(self, repository, mock_collection):
         """Prueba verificación de existencia cuando el agente existe"""
         # Arrange
         agent_id = AgentId("test-agent-123")
-        mock_collection.count_documents.return_value = 1
+        mock_collection.find_one.return_value = {"_id": "test-agent-123"}
         
         # Act
         result = await repository.exists(agent_id)
         
         # Assert
         assert result is True
-        mock_collection.count_documents.assert_called_once_with(
-            {"_id": "test-agent-123"}, limit=1
+        mock_collection.find_one.assert_called_once_with(
+            {"_id": "test-agent-123"}, {"_id": 1}
         )
+        mock_collection.count_documents.assert_not_called()
     
-    @pytest.mark.asyncio
     async def test_exists_agent_false(self, repository, mock_collection):
         """Prueba verificación de existencia cuando el agente no existe"""
         # Arrange
         agent_id = AgentId("nonexistent-agent")
-        mock_collection.count_documents.return_value = 0
+        mock_collection.find_one.return_value = None
         
         # Act
         result = await repository.exists(agent_id)
         
         # Assert
         assert result is False
-        mock_collection.count_documents.assert_called_once_with(
-            {"_id": "nonexistent-agent"}, limit=1
+        mock_collection.find_one.assert_called_once_with(
+            {"_id": "nonexistent-agent"}, {"_id": 1}
         )
+        mock_collection.count_documents.assert_not_called()
     
-    @pytest.mark.asyncio
     async def test_count_agents(self, repository, mock_collection):
         """Prueba contar total de agentes"""
         # Arrange
@@ -238,7 +245,6 @@ class TestMongoAgentRepository:
         assert result == 42
         mock_collection.count_documents.assert_called_once_with({})
     
-    @pytest.mark.asyncio
     async def test_to_domain_conversion(self, repository, agent_document_data):
         """Prueba conversión de documento MongoDB a entidad de dominio"""
         # Act
@@ -251,7 +257,6 @@ class TestMongoAgentRepository:
         assert agent.prompt == "Este es un prompt de prueba."
         assert agent.documents_count == 5
     
-    @pytest.mark.asyncio
     async def test_to_model_conversion(self, repository, sample_agent):
         """Prueba conversión de entidad de dominio a documento MongoDB"""
         # Act
@@ -264,6 +269,11 @@ class TestMongoAgentRepository:
         assert model["documents_count"] == sample_agent.documents_count
         assert model["created_at"] == sample_agent.created_at
         assert model["updated_at"] == sample_agent.updated_at
+
+
+@pytest.mark.unit
+class TestMongoAgentRepositoryInit:
+    """Pruebas de construcción de MongoAgentRepository (sin mocks de colección)"""
     
     def test_repository_initialization_error(self):
         """Prueba error en inicialización con base de datos None"""
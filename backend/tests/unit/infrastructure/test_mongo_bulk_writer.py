@@ -0,0 +1,61 @@
+"""
+Pruebas unitarias para MongoBulkWriter
+"""
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from pymongo import ReplaceOne
+from pymongo.errors import BulkWriteError
+from src.infrastructure.adapters.persistence.mongodb.bulkWriter import MongoBulkWriter
+
+
+@pytest.mark.unit
+class TestMongoBulkWriter:
+    """Pruebas para el agrupador de escrituras"""
+
+    @pytest.fixture
+    def mock_collection(self):
+        """Mock de la colección MongoDB"""
+        collection = MagicMock()
+        collection.bulk_write = AsyncMock()
+        return collection
+
+    async def test_concurrent_writes_share_one_bulk_write(self, mock_collection):
+        """Prueba que las escrituras concurrentes se envían en un solo lote"""
+        # Arrange
+        writer = MongoBulkWriter(mock_collection, max_batch=50, max_delay=0.01)
+        operations = [ReplaceOne({"_id": str(i)}, {"_id": str(i)}, upsert=True) for i in range(3)]
+
+        # Act
+        await asyncio.gather(*(writer.write(operation) for operation in operations))
+
+        # Assert
+        mock_collection.bulk_write.assert_awaited_once_with(operations, ordered=False)
+
+    async def test_full_batch_is_flushed_without_waiting(self, mock_collection):
+        """Prueba que un lote lleno se envía sin esperar el retardo"""
+        # Arrange
+        writer = MongoBulkWriter(mock_collection, max_batch=2, max_delay=60)
+        operations = [ReplaceOne({"_id": str(i)}, {"_id": str(i)}) for i in range(2)]
+
+        # Act
+        await asyncio.wait_for(asyncio.gather(*(writer.write(op) for op in operations)), timeout=1)
+
+        # Assert
+        mock_collection.bulk_write.assert_awaited_once()
+
+    async def test_write_errors_fail_only_their_operation(self, mock_collection):
+        """Prueba que un error de escritura solo afecta a su operación"""
+        # Arrange
+        mock_collection.bulk_write.side_effect = BulkWriteError({
+            "writeErrors": [{"index": 1, "code": 11000, "errmsg": "duplicate key"}]
+        })
+        writer = MongoBulkWriter(mock_collection, max_delay=0.01)
+        operations = [ReplaceOne({"_id": str(i)}, {"_id": str(i)}) for i in range(2)]
+
+        # Act
+        results = await asyncio.gather(*(writer.write(op) for op in operations), return_exceptions=True)
+
+        # Assert
+        assert results[0] is None
+        assert isinstance(results[1], BulkWriteError)
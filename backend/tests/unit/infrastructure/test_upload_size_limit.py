@@ -0,0 +1,72 @@
+"""
+Pruebas unitarias para el rechazo temprano de subidas por Content-Length
+"""
+import json
+import pytest
+from src.infrastructure.api.middleware.uploadSizeLimit import (
+    MULTIPART_OVERHEAD_BYTES,
+    UploadSizeLimitMiddleware
+)
+
+UPLOAD_PATH = "/api/v1/documents/upload"
+MAX_SIZE = 1024 * 1024
+
+
+def build_scope(content_length: str = None, path: str = UPLOAD_PATH) -> dict:
+    """Construye un scope HTTP mínimo con el Content-Length indicado"""
+    headers = [(b"content-length", content_length.encode())] if content_length is not None else []
+    return {"type": "http", "method": "POST", "path": path, "headers": headers}
+
+
+async def run_middleware(scope: dict):
+    """Ejecuta el middleware y devuelve (si se llamó a la app, mensajes enviados)"""
+    called = []
+    sent = []
+
+    async def app(scope, receive, send):
+        called.append(True)
+
+    async def receive():
+        raise AssertionError("El cuerpo no debe leerse")
+
+    async def send(message):
+        sent.append(message)
+
+    middleware = UploadSizeLimitMiddleware(app, upload_path=UPLOAD_PATH, max_size_bytes=MAX_SIZE)
+    await middleware(scope, receive, send)
+    return bool(called), sent
+
+
+@pytest.mark.unit
+class TestUploadSizeLimitMiddleware:
+    """Pruebas para UploadSizeLimitMiddleware"""
+
+    async def test_oversized_upload_is_rejected_without_reading_body(self):
+        """Prueba que un Content-Length excesivo devuelve 413 sin llegar a la app"""
+        # Arrange
+        scope = build_scope(str(MAX_SIZE + MULTIPART_OVERHEAD_BYTES + 1))
+
+        # Act
+        called, sent = await run_middleware(scope)
+
+        # Assert
+        assert called is False
+        assert sent[0]["status"] == 413
+        body = json.loads(sent[1]["body"])
+        assert body["error"]["type"] == "FILE_SIZE_EXCEEDED"
+        assert body["error"]["details"]["max_size_mb"] == 1
+
+    @pytest.mark.parametrize("scope", [
+        build_scope(str(MAX_SIZE)),
+        build_scope(None),
+        build_scope("not-a-number"),
+        build_scope(str(MAX_SIZE * 10), path="/api/v1/agents")
+    ])
+    async def test_other_requests_pass_through(self, scope):
+        """Prueba que tamaños válidos, headers ausentes u otras rutas llegan a la app"""
+        # Act
+        called, sent = await run_middleware(scope)
+
+        # Assert
+        assert called is True
+        assert sent == []
@@ -0,0 +1,269 @@
+"""
+Pruebas unitarias para los validadores de entrada
+"""
+import io
+import zipfile
+import pytest
+from src.shared.utils.validators import AgentValidator, DocumentValidator, FileValidator
+
+
+def build_zip(*names: str) -> bytes:
+    """Construye en memoria un ZIP con las entradas indicadas"""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name in names:
+            archive.writestr(name, "<xml/>" * 50)
+    return buffer.getvalue()
+
+
+@pytest.mark.unit
+class TestFileValidatorContent:
+    """Pruebas para la detección del tipo real por magic bytes"""
+
+    @pytest.mark.parametrize("header, filename", [
+        (b"%PDF-1.7\n%\xe2\xe3\xcf\xd3\n", "informe.pdf"),
+        (build_zip("[Content_Types].xml", "word/document.xml"), "contrato.docx"),
+        (build_zip("[Content_Types].xml", "xl/workbook.xml"), "datos.xlsx"),
+        (build_zip("[Content_Types].xml", "ppt/presentation.xml"), "charla.pptx"),
+        (b"nombre,edad\nAna,30\n", "personas.csv"),
+        ("descripción en español\r\n".encode("cp1252"), "notas.txt"),
+        (b"\xef\xbb\xbfcolumna;valor\n", "export.csv"),
+    ])
+    def test_valid_content_for_extension(self, header, filename):
+        """Prueba que cada formato permitido se reconoce por su cabecera"""
+        # Act
+        is_valid, error = FileValidator.validate_file_content(header, filename)
+
+        # Assert
+        assert is_valid is True
+        assert error == ""
+
+    def test_renamed_binary_is_rejected(self):
+        """Prueba que un PDF renombrado a .csv se rechaza indicando lo detectado"""
+        # Act
+        is_valid, error = FileValidator.validate_file_content(b"%PDF-1.4\n" + b"x" * 200, "datos.csv")
+
+        # Assert
+        assert is_valid is False
+        assert "datos.csv" in error
+        assert "application/pdf" in error
+
+    def test_plain_zip_renamed_as_office_is_rejected(self):
+        """Prueba que un ZIP sin la estructura Office no pasa como docx"""
+        # Act
+        is_valid, error = FileValidator.validate_file_content(build_zip("fotos/a.jpg"), "contrato.docx")
+
+        # Assert
+        assert is_valid is False
+        assert "Detectado: application/zip" in error
+
+    def test_office_format_must_match_extension(self):
+        """Prueba que una hoja de cálculo renombrada a .docx se rechaza"""
+        # Act
+        is_valid, error = FileValidator.validate_file_content(
+            build_zip("[Content_Types].xml", "xl/workbook.xml"),
+            "contrato.docx"
+        )
+
+        # Assert
+        assert is_valid is False
+        assert "spreadsheetml" in error
+
+    def test_office_directory_is_read_from_file(self):
+        """Prueba que con solo la cabecera se usa el archivo completo para leer el directorio ZIP"""
+        # Arrange
+        content = build_zip("[Content_Types].xml", "word/document.xml", "word/media/image.png")
+        spooled = io.BytesIO(content)
+        spooled.seek(10)
+
+        # Act
+        is_valid, _ = FileValidator.validate_file_content(content[:64], "contrato.docx", "docx", spooled)
+
+        # Assert
+        assert is_valid is True
+        assert spooled.tell() == 0
+
+    def test_office_files_with_identical_header_are_told_apart(self):
+        """Prueba que dos paquetes Office con los mismos primeros 64KB se distinguen"""
+        # Arrange: misma primera entrada (más de 64KB sin comprimir), distinta carpeta de formato
+        def build_package(part: str) -> bytes:
+            buffer = io.BytesIO()
+            with zipfile.ZipFile(buffer, "w", zipfile.ZIP_STORED) as archive:
+                archive.writestr(zipfile.ZipInfo("[Content_Types].xml", (2025, 1, 1, 0, 0, 0)), b"<Types/>" * 9000)
+                archive.writestr(zipfile.ZipInfo(part, (2025, 1, 1, 0, 0, 0)), b"<xml/>")
+            return buffer.getvalue()
+
+        document = build_package("word/document.xml")
+        workbook = build_package("xl/workbook.xml")
+        assert document[:65536] == workbook[:65536]
+
+        # Act
+        document_valid, _ = FileValidator.validate_file_content(document, "informe.docx", "docx")
+        workbook_valid, error = FileValidator.validate_file_content(workbook, "informe.docx", "docx")
+
+        # Assert
+        assert document_valid is True
+        assert workbook_valid is False
+        assert "spreadsheetml" in error
+
+    def test_binary_content_is_not_text(self):
+        """Prueba que bytes de control fuera de los espacios marcan contenido binario"""
+        # Act
+        is_valid, error = FileValidator.validate_file_content(b"\x7fELF\x02\x01\x01\x00" + b"\x00" * 100, "a.txt")
+
+        # Assert
+        assert is_valid is False
+        assert "application/octet-stream" in error
+
+    def test_empty_content_is_rejected(self):
+        """Prueba que un archivo vacío se rechaza"""
+        # Act
+        result = FileValidator.validate_file_content(b"", "vacio.pdf")
+
+        # Assert
+        assert result == (False, "El archivo está vacío")
+
+    def test_only_header_is_sniffed(self):
+        """Prueba que solo se analiza la cabecera aunque llegue el archivo completo"""
+        # Arrange: texto válido en la cabecera y bytes binarios después
+        content = b"a,b\n" * (FileValidator.CONTENT_SNIFF_SIZE // 4) + b"\x00" * 1024
+
+        # Act
+        is_valid, _ = FileValidator.validate_file_content(content, "grande.csv")
+
+        # Assert
+        assert is_valid is True
+
+
+@pytest.mark.unit
+class TestFileValidatorInfo:
+    """Pruebas para la validación de nombre, MIME declarado y tamaño"""
+
+    def test_declared_mime_is_case_insensitive(self):
+        """Prueba que el MIME declarado se compara sin distinguir mayúsculas"""
+        # Act
+        result = FileValidator.validate_file_info("Informe.PDF", "Application/PDF", 1024)
+
+        # Assert
+        assert result == (True, "pdf", "")
+
+    def test_declared_mime_must_match_extension(self):
+        """Prueba que un MIME de otro formato se rechaza"""
+        # Act
+        is_valid, file_type, error = FileValidator.validate_file_info("datos.csv", "application/pdf", 1024)
+
+        # Assert
+        assert is_valid is False
+        assert file_type == ""
+        assert "MIME" in error
+
+    def test_unknown_extension_lists_allowed_ones(self):
+        """Prueba que una extensión no permitida devuelve la lista ordenada de permitidas"""
+        # Act
+        is_valid, _, error = FileValidator.validate_file_info("script.exe", None, 10)
+
+        # Assert
+        assert is_valid is False
+        assert error.endswith("csv, docx, pdf, pptx, txt, xlsx")
+
+    def test_size_is_checked_before_extension(self):
+        """Prueba que un archivo demasiado grande se rechaza por tamaño antes que por tipo"""
+        # Act
+        is_valid, _, error = FileValidator.validate_file_info("script.exe", None, 11 * 1024 * 1024)
+
+        # Assert
+        assert is_valid is False
+        assert error.startswith("Archivo demasiado grande")
+
+    @pytest.mark.parametrize("filename", [".pdf", "informes.v2/notas", "sin_extension"])
+    def test_names_without_extension_are_rejected(self, filename):
+        """Prueba que los puntos de archivos ocultos o directorios no cuentan como extensión"""
+        # Act
+        is_valid, file_type, _ = FileValidator.validate_file_info(filename, None, 10)
+
+        # Assert
+        assert is_valid is False
+        assert file_type == ""
+
+
+@pytest.mark.unit
+class TestAgentValidator:
+    """Pruebas para la validación del nombre y el prompt de agentes"""
+
+    @pytest.mark.parametrize("name", ["Agente Ventas", "José Núñez", "bot_v2-beta", "Agent\t42"])
+    def test_valid_names(self, name):
+        """Prueba que se aceptan letras (incluidas las acentuadas), dígitos, espacios, guiones y guiones bajos"""
+        # Act
+        result = AgentValidator.validate_agent_name(name)
+
+        # Assert
+        assert result == (True, "")
+
+    @pytest.mark.parametrize("name", ["Agente!", "mi/agente", "agent@home", "emoji 🤖"])
+    def test_names_with_symbols_are_rejected(self, name):
+        """Prueba que cualquier otro símbolo invalida el nombre"""
+        # Act
+        is_valid, error = AgentValidator.validate_agent_name(name)
+
+        # Assert
+        assert is_valid is False
+        assert "solo puede contener" in error
+
+    @pytest.mark.parametrize("name, expected_error", [
+        ("   ", "El nombre del agente es requerido"),
+        ("  Agente Ventas  ", ""),
+        (" " * 350 + "Agente" + " " * 40, ""),
+        ("a" * 401, "El nombre no puede exceder 100 caracteres"),
+        ("a" * 101, "El nombre no puede exceder 100 caracteres")
+    ])
+    def test_name_length_is_checked_after_strip(self, name, expected_error):
+        """Prueba que los espacios sobrantes no cuentan y que las entradas enormes se rechazan"""
+        # Act
+        is_valid, error = AgentValidator.validate_agent_name(name)
+
+        # Assert
+        assert is_valid is (expected_error == "")
+        assert error == expected_error
+
+    def test_oversized_prompt_is_rejected(self):
+        """Prueba que un prompt muy por encima del máximo se rechaza sin llegar a recortarlo"""
+        # Act
+        is_valid, error = AgentValidator.validate_agent_prompt("x" * 1_000_000)
+
+        # Assert
+        assert is_valid is False
+        assert error == "El prompt no puede exceder 5000 caracteres"
+
+
+@pytest.mark.unit
+class TestDocumentValidator:
+    """Pruebas para la generación de claves y la metadata de documentos"""
+
+    @pytest.mark.parametrize("filename, expected", [
+        ("mi informe (final)#2.pdf", "miinformefinal2.pdf"),
+        ("año_2024-v1.xlsx ", "año_2024-v1.xlsx"),
+        ("../../etc/passwd", "....etcpasswd"),
+    ])
+    def test_document_key_drops_unsafe_characters(self, filename, expected):
+        """Prueba que la clave S3 solo conserva letras, dígitos, puntos, guiones y guiones bajos"""
+        # Act
+        key = DocumentValidator.generate_document_key("agent-1", filename)
+
+        # Assert
+        assert key == f"agents/agent-1/documents/{expected}"
+
+    @pytest.mark.parametrize("metadata, expected_error", [
+        ({"description": "", "original_size": 10, "ratio": 0.5, "public": True}, ""),
+        ({"k" * 51: "valor"}, "Clave de metadata inválida"),
+        ({1: "valor"}, "Clave de metadata inválida"),
+        ({"tags": ["a", "b"]}, "Valor de metadata inválido para tags"),
+        (["no", "dict"], "Metadata debe ser un diccionario")
+    ])
+    def test_document_metadata(self, metadata, expected_error):
+        """Prueba la validación de claves y valores de metadata"""
+        # Act
+        is_valid, error = DocumentValidator.validate_document_metadata(metadata)
+
+        # Assert
+        assert is_valid is (expected_error == "")
+        assert error.startswith(expected_error)
@@ -12,6 +12,7 @@ import { EditAgentModal } from '@/components/agents/EditAgentModal';
 import { ConfirmDialog } from '@/components/ui/ConfirmDialog';
 import { useUpdateAgentMutation } from '@/hooks/useAgents';
 import { formatFileSize } from '@/lib/utils';
+import { apiService } from '@/services/apiAxios';
 
 export default function AgentDetailPage() {
   const params = useParams();
@@ -70,6 +71,27 @@ export default function AgentDetailPage() {
     refetchAgent();
   };
 
+  const handleDownloadDocument = async (documentId: string) => {
+    // Abrir la pestaña antes del await para que el navegador no la bloquee como popup
+    const downloadWindow = window.open('', '_blank');
+    try {
+      const url = await apiService.getDocumentDownloadUrl(documentId);
+      if (downloadWindow) {
+        downloadWindow.location.href = url;
+      } else {
+        window.open(url, '_blank');
+      }
+    } catch {
+      // Fallback: el endpoint redirige a la URL presignada
+      const fallbackUrl = `${process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000/api/v1'}/documents/${documentId}/download`;
+      if (downloadWindow) {
+        downloadWindow.location.href = fallbackUrl;
+      } else {
+        window.open(fallbackUrl, '_blank');
+      }
+    }
+  };
+
   const handleDeleteDocument = (documentId: string) => {
     setDeleteDocumentId(documentId);
   };
@@ -229,7 +251,7 @@ export default function AgentDetailPage() {
                     <Button
                       variant="ghost"
                       size="sm"
-                      onClick={() => window.open(`${process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000/api/v1'}/documents/${document.id}/download`, '_blank')}
+                      onClick={() => handleDownloadDocument(document.id)}
                       className="text-gray-600 hover:text-blue-600"
                     >
                       <svg className="w-4 h-4" fill="none" stroke="currentColor" viewBox="0 0 24 24">
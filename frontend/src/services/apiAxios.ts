@@ -426,6 +426,24 @@ class ApiService {
     }
   }
 
+  // Obtener la URL presignada de descarga (el archivo se descarga directo de S3, sin redirección)
+  async getDocumentDownloadUrl(id: string): Promise<string> {
+    try {
+      const response = await this.client.get(`/documents/${id}/download`, {
+        params: { redirect: false }
+      });
+
+      if (response.data.success && response.data.data && response.data.data.url) {
+        return response.data.data.url;
+      }
+
+      throw new Error('Formato de respuesta inesperado para la descarga');
+    } catch (error) {
+      console.error(`Error getting download URL for document ${id}:`, error);
+      throw error;
+    }
+  }
+
   // Eliminar un documento
   async deleteDocument(id: string): Promise<void> {
     try {